@@ -0,0 +1,141 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from .models import Subsystem
+from .observability import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS, ADMISSION_WAIT_SECONDS
+
+# Lower values are admitted first: hazard warnings must not wait behind lore.
+SUBSYSTEM_PRIORITIES: dict[Subsystem, int] = {
+    Subsystem.AEGIS: 0,
+    Subsystem.ENFORCER: 1,
+    Subsystem.ECLIPSE: 2,
+    Subsystem.TERRA: 3,
+    Subsystem.HELIOS: 3,
+    Subsystem.REQUIEM: 4,
+}
+DEFAULT_PRIORITY = 3
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Raised when a request cannot be admitted; ``reason`` is ``queue_full`` or ``timeout``."""
+
+    def __init__(self, reason: str, retry_after_seconds: int):
+        super().__init__(f"backend is saturated ({reason}); retry after {retry_after_seconds}s")
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Bound concurrent backend calls, queueing the overflow by subsystem priority.
+
+    Up to ``max_in_flight`` callers hold a slot at once. Further callers wait in
+    a priority queue of at most ``max_queue`` entries (FIFO within a priority)
+    and give up after ``queue_timeout_seconds``. A released slot is handed
+    straight to the next waiter so late arrivals cannot overtake the queue.
+    """
+
+    def __init__(self, max_in_flight: int = 4, max_queue: int = 32, queue_timeout_seconds: float = 10.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._in_flight = 0
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._avg_hold_seconds = 1.0
+        self._publish()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+    def retry_after_seconds(self) -> int:
+        """Estimate how long until the current queue drains, from the recent average slot hold time."""
+        waves = (len(self._waiters) + 1) / self.max_in_flight
+        return max(1, math.ceil(self._avg_hold_seconds * waves))
+
+    def _reject(self, subsystem: Subsystem, reason: str) -> AdmissionRejectedError:
+        ADMISSION_REJECTIONS.labels(subsystem.value, reason).inc()
+        return AdmissionRejectedError(reason, self.retry_after_seconds())
+
+    async def acquire(self, subsystem: Subsystem, timeout_seconds: float | None = None) -> None:
+        """Take a slot, waiting at most ``queue_timeout_seconds`` (or ``timeout_seconds`` when shorter)."""
+        started = time.perf_counter()
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self._publish()
+            ADMISSION_WAIT_SECONDS.labels(subsystem.value).observe(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject(subsystem, "queue_full")
+
+        waiter = _Waiter(
+            SUBSYSTEM_PRIORITIES.get(subsystem, DEFAULT_PRIORITY),
+            next(self._sequence),
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._publish()
+        try:
+            wait_seconds = self.queue_timeout_seconds
+            if timeout_seconds is not None:
+                wait_seconds = min(wait_seconds, timeout_seconds)
+            await asyncio.wait_for(waiter.future, wait_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._publish()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise self._reject(subsystem, "timeout") from exc
+            raise
+        finally:
+            ADMISSION_WAIT_SECONDS.labels(subsystem.value).observe(time.perf_counter() - started)
+
+    def release(self, held_seconds: float | None = None) -> None:
+        if held_seconds is not None:
+            self._avg_hold_seconds = 0.8 * self._avg_hold_seconds + 0.2 * held_seconds
+
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                self._publish()
+                return
+
+        self._in_flight = max(0, self._in_flight - 1)
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self, subsystem: Subsystem, timeout_seconds: float | None = None) -> AsyncIterator[None]:
+        await self.acquire(subsystem, timeout_seconds)
+        acquired = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - acquired)
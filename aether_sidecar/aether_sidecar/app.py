@@ -1,11 +1,35 @@
+import asyncio
 import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-
-from fastapi import FastAPI, Header, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
-
-from .backends import BackendUnavailableError, OllamaBackend
-from .config import parse_ollama_fallback_urls, parse_subsystem_models, resolve_model_name, settings
+from typing import Literal, TypeVar
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
+
+from .admission import AdmissionController, AdmissionRejectedError
+from .backends import (
+    BackendAttemptSummary,
+    BackendDeadlineExceededError,
+    BackendUnavailableError,
+    BaseBackend,
+    StreamChunk,
+)
+from .cache import ResponseCache
+from .cascade import ModelCascade, estimate_complexity
+from .classifier import SubsystemClassifier
+from .coalescing import SingleFlight, normalize_message, request_fingerprint
+from .deadline import deadline_scope, remaining_seconds
+from .config import (
+    parse_cache_context_fields,
+    parse_model_cascade,
+    parse_subsystem_cascades,
+    parse_subsystem_models,
+    parse_subsystem_ttls,
+    resolve_model_name,
+    settings,
+)
 from .memory import SessionLearning, SessionMemory
 from .models import (
     DevPlaygroundAuthRequest,
@@ -18,6 +42,7 @@ from .models import (
     ModLifecycleHookRequest,
     ModLifecycleHookResponse,
     ModelStatusResponse,
+    RouteBatchRequest,
     StatusResponse,
     Subsystem,
     TeachRequest,
@@ -25,9 +50,30 @@ from .models import (
     VersionResponse,
     WarmupResponse,
 )
-from .observability import GENERATE_FALLBACK_HOPS, GENERATE_REQUESTS, metrics_middleware, metrics_response
-from .router import detect_subsystem_alerts, is_minecraft_related, pick_subsystem, subsystem_teaching_context
-from .safety import evaluate_message, safe_refusal
+from .observability import (
+    DEADLINE_EXCEEDED,
+    GENERATE_CANCELLED,
+    GENERATE_COALESCED,
+    GENERATE_FALLBACK_HOPS,
+    GENERATE_PREFILL_SECONDS,
+    GENERATE_REQUESTS,
+    GENERATE_TIME_TO_FIRST_TOKEN_SECONDS,
+    PROMPT_TOKENS,
+    PROMPT_TRIMMED,
+    ROUTER_AUTO_DECISIONS,
+    ROUTE_BATCH_MESSAGES,
+    SEMANTIC_CACHE_EMBED_SECONDS,
+    metrics_middleware,
+    metrics_response,
+)
+from .registry import create_backend
+from .prompting import PromptLayout, build_prompt, resolve_token_counter
+from .router import MessageAnalysis, analyze_message, configure_vocabulary
+from .safety import SafetyResult, evaluate_message, safe_refusal
+from .semantic_cache import SemanticCache
+from .serialization import FastJSONResponse, FastJSONRoute, dumps_text, use_json_library
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -47,28 +93,82 @@ class ActivationRegistry:
         return sorted(self.active_instances)
 
 
-app = FastAPI(title="A.E.T.H.E.R Sidecar", version=settings.app_version)
-app.middleware("http")(metrics_middleware)
-
+json_library = use_json_library(settings.json_library)
+keyword_matcher = configure_vocabulary(settings.router_vocabulary_path)
+subsystem_classifier = (
+    SubsystemClassifier.load(settings.router_classifier_path) if settings.router_classifier_path else None
+)
 memory = SessionMemory(turn_limit=settings.memory_turn_limit)
 learning = SessionLearning(lesson_limit=settings.learning_lesson_limit, log_path=settings.learning_log_path)
 activation_registry = ActivationRegistry()
+generate_flights: SingleFlight[tuple[str, str, BackendAttemptSummary]] = SingleFlight()
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    max_bytes=settings.response_cache_max_bytes,
+    default_ttl_seconds=settings.response_cache_ttl_seconds,
+    subsystem_ttls=parse_subsystem_ttls(settings.response_cache_subsystem_ttls),
+)
+cache_context_fields = parse_cache_context_fields(settings.response_cache_context_fields)
+semantic_cache = (
+    SemanticCache(
+        threshold=settings.semantic_cache_threshold,
+        capacity_per_tier=settings.semantic_cache_capacity,
+        max_entries=settings.semantic_cache_max_entries,
+    )
+    if settings.semantic_cache_enabled
+    else None
+)
+count_prompt_tokens = resolve_token_counter(settings.prompt_tokenizer)
+model_cascade = (
+    ModelCascade(
+        parse_model_cascade(settings.model_cascade),
+        parse_subsystem_cascades(settings.model_cascade_subsystems),
+        min_confidence=settings.model_cascade_min_confidence,
+    )
+    if settings.model_cascade_enabled
+    else None
+)
 subsystem_models = parse_subsystem_models(settings.subsystem_models)
-fallback_urls = parse_ollama_fallback_urls(settings.ollama_fallback_urls)
 resolved_model_name = resolve_model_name(settings)
-if settings.model_backend.lower() != "ollama":
-    raise RuntimeError("Unsupported model backend. Set AETHER_MODEL_BACKEND=ollama.")
-
-backend = OllamaBackend(
-    settings.ollama_url,
-    resolved_model_name,
-    settings.request_timeout_seconds,
-    subsystem_models=subsystem_models,
-    keep_alive=settings.ollama_keep_alive,
-    fallback_urls=fallback_urls,
+backend = create_backend(settings, resolved_model_name)
+
+
+def _configured_url_count() -> int:
+    get_urls = getattr(backend, "configured_urls", None)
+    if not callable(get_urls):
+        return 1
+
+    urls = get_urls()
+    return max(1, len(urls)) if isinstance(urls, list) else 1
+
+
+# The global queue admits each configured URL's share; the backend enforces the per-URL cap when it picks a URL.
+admission = AdmissionController(
+    max_in_flight=settings.admission_max_in_flight_per_url * _configured_url_count(),
+    max_queue=settings.admission_max_queue,
+    queue_timeout_seconds=settings.admission_queue_timeout_seconds,
 )
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await backend.startup()
+    try:
+        yield
+    finally:
+        await backend.aclose()
+
+
+app = FastAPI(
+    title="A.E.T.H.E.R Sidecar",
+    version=settings.app_version,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+app.router.route_class = FastJSONRoute
+app.middleware("http")(metrics_middleware)
+
+
 started_at = time.monotonic()
 
 
@@ -106,27 +206,77 @@ def _backend_attempt_chain() -> list[str]:
     return chain if isinstance(chain, list) else []
 
 
-@app.get("/status", response_model=StatusResponse)
-async def status() -> StatusResponse:
+def _backend_circuit_breakers() -> dict[str, str]:
+    get_states = getattr(backend, "circuit_breaker_states", None)
+    if not callable(get_states):
+        return {}
+
+    states = get_states()
+    return states if isinstance(states, dict) else {}
+
+
+def _backend_model_placement() -> dict[str, list[str]]:
+    get_placement = getattr(backend, "model_placement", None)
+    if not callable(get_placement):
+        return {}
+
+    placement = get_placement()
+    return placement if isinstance(placement, dict) else {}
+
+
+async def _warmup_model_status(attempt_chain: list[str]) -> ModelStatusResponse:
     status_start = time.perf_counter()
-    attempt_chain = _backend_attempt_chain()
     try:
         checked_model = await backend.warmup(Subsystem.AEGIS)
-        model_status = ModelStatusResponse(
+        return ModelStatusResponse(
             status="online",
             checked_model=checked_model,
             latency_ms=int((time.perf_counter() - status_start) * 1000),
             attempted_urls=attempt_chain,
+            circuit_breakers=_backend_circuit_breakers(),
+            model_placement=_backend_model_placement(),
         )
     except BackendUnavailableError as exc:
-        model_status = ModelStatusResponse(
+        return ModelStatusResponse(
             status="offline",
             detail=str(exc),
             checked_model=resolved_model_name,
             latency_ms=int((time.perf_counter() - status_start) * 1000),
             attempted_urls=attempt_chain,
+            circuit_breakers=_backend_circuit_breakers(),
+            model_placement=_backend_model_placement(),
         )
 
+
+async def _model_status(attempt_chain: list[str]) -> ModelStatusResponse:
+    """
+    Report backend health from the cached probe snapshot when the backend keeps one.
+
+    Backends without probing fall back to a warmup generation; an explicit
+    warmup is always available through ``POST /backend/warmup``.
+    """
+    get_snapshot = getattr(backend, "health_snapshot", None)
+    if not callable(get_snapshot):
+        return await _warmup_model_status(attempt_chain)
+
+    snapshot = await get_snapshot()
+    return ModelStatusResponse(
+        status="online" if snapshot.online else "offline",
+        detail=snapshot.detail,
+        checked_model=resolved_model_name,
+        latency_ms=snapshot.latency_ms,
+        attempted_urls=attempt_chain,
+        circuit_breakers=_backend_circuit_breakers(),
+        model_placement=_backend_model_placement(),
+        loaded_models=snapshot.loaded_models,
+        checked_at=snapshot.checked_at,
+    )
+
+
+@app.get("/status", response_model=StatusResponse)
+async def status() -> StatusResponse:
+    model_status = await _model_status(_backend_attempt_chain())
+
     return StatusResponse(
         model_backend=settings.model_backend,
         model_name=resolved_model_name,
@@ -251,6 +401,10 @@ async def status_page() -> HTMLResponse:
         <div class="label">Keep Alive</div>
         <div id="keepAlive" class="value">—</div>
       </article>
+      <article class="card">
+        <div class="label">Loaded Models</div>
+        <div id="loadedModels" class="value mono">—</div>
+      </article>
     </section>
 
     <h2 class="section-title">Latest Events</h2>
@@ -307,6 +461,8 @@ async def status_page() -> HTMLResponse:
         document.getElementById('latency').textContent = `${data.model.latency_ms} ms`;
         document.getElementById('uptime').textContent = formatUptime(data.uptime_seconds);
         document.getElementById('keepAlive').textContent = data.keep_alive || 'default';
+        const loadedModels = Array.isArray(data.model.loaded_models) ? data.model.loaded_models : [];
+        document.getElementById('loadedModels').textContent = loadedModels.length ? loadedModels.join(', ') : 'none';
 
         const online = data.model.status === 'online';
         const headline = document.getElementById('headline');
@@ -638,12 +794,87 @@ async def learning_status(session_id: str, authorization: str | None = Header(de
     return LearningStatusResponse(session_id=session_id, lessons=learning.lessons(session_id))
 
 
-@app.post("/generate", response_model=GenerateResponse)
-async def generate(
+@dataclass
+class PreparedGeneration:
+    session_id: str
+    message: str
+    subsystem: Subsystem
+    alerts: dict[Subsystem, list[str]]
+    safety: SafetyResult | None
+    learned_context: list[str]
+    player_context: dict
+    world_context: dict
+    history: list[dict[str, str]]
+    layout: PromptLayout
+    started: float
+    embedding: list[float] | None = None
+    complexity: float = 0.0
+    deadline_seconds: float | None = None
+
+    @property
+    def full_prompt(self) -> str:
+        return self.layout.text()
+
+    def response(
+        self,
+        text: str,
+        model_used: str,
+        safety_flags: list[str],
+        cached: bool = False,
+        prefill_ms: int | None = None,
+    ) -> GenerateResponse:
+        latency_ms = int((time.perf_counter() - self.started) * 1000)
+        return GenerateResponse(
+            text=text,
+            subsystem_used=self.subsystem,
+            model_used=model_used,
+            subsystem_alerts={k.value: v for k, v in self.alerts.items()},
+            safety_flags=safety_flags,
+            learned_context=self.learned_context,
+            latency_ms=latency_ms,
+            cached=cached,
+            prefill_ms=prefill_ms,
+            deadline_ms=int(self.deadline_seconds * 1000) if self.deadline_seconds else None,
+            deadline_used_ms=latency_ms if self.deadline_seconds else None,
+        )
+
+
+def _deadline_seconds(payload: GenerateRequest, x_aether_deadline_ms: int | None) -> float | None:
+    """Resolve the request's budget: ``X-Aether-Deadline-Ms``, then ``deadline_ms``, then the configured default."""
+    deadline_ms = x_aether_deadline_ms or payload.deadline_ms
+    if deadline_ms:
+        return deadline_ms / 1000
+    return settings.generate_deadline_seconds or None
+
+
+def _classifier_picks(messages: list[str]) -> list[tuple[Subsystem, float] | None]:
+    """Score ``messages`` in one batch; ``None`` marks those the classifier is not confident about."""
+    if subsystem_classifier is None:
+        return [None] * len(messages)
+
+    return [
+        pick if pick[1] >= settings.router_classifier_min_confidence else None
+        for pick in subsystem_classifier.predict(messages)
+    ]
+
+
+def _auto_subsystem(message: str, analysis: MessageAnalysis) -> Subsystem:
+    """Route ``Subsystem.AUTO`` with the trained classifier when it is confident, else by keyword majority."""
+    pick = _classifier_picks([message])[0]
+    if pick is not None:
+        ROUTER_AUTO_DECISIONS.labels("classifier", pick[0].value).inc()
+        return pick[0]
+
+    ROUTER_AUTO_DECISIONS.labels("keywords", analysis.subsystem.value).inc()
+    return analysis.subsystem
+
+
+def _prepare_generation(
     payload: GenerateRequest,
-    authorization: str | None = Header(default=None),
-    x_aether_dev_playground: str | None = Header(default=None),
-) -> GenerateResponse:
+    authorization: str | None,
+    x_aether_dev_playground: str | None,
+    x_aether_deadline_ms: int | None = None,
+) -> PreparedGeneration:
     _validate_dev_playground_token(authorization)
     started = time.perf_counter()
     dev_playground_bypass = settings.dev_playground_enabled and (x_aether_dev_playground or "").strip().lower() == "true"
@@ -659,57 +890,523 @@ async def generate(
         raise HTTPException(status_code=400, detail=f"message exceeds {settings.max_message_chars} chars")
 
     safety = evaluate_message(message) if settings.safety_enabled else None
-    alerts = detect_subsystem_alerts(message)
-    subsystem = payload.subsystem if payload.subsystem != Subsystem.AUTO else pick_subsystem(message)
+    analysis = analyze_message(message)
+    alerts = analysis.alerts
+    subsystem = payload.subsystem if payload.subsystem != Subsystem.AUTO else _auto_subsystem(message, analysis)
     learned_context = learning.lessons(payload.session_id)
-    non_minecraft_request = not is_minecraft_related(message)
+    history = memory.history(payload.session_id)[-6:]
+    layout = build_prompt(
+        session_id=payload.session_id,
+        message=message,
+        subsystem=subsystem,
+        alerts=alerts,
+        learned_context=learned_context,
+        player_context=payload.player_context,
+        world_context=payload.world_context,
+        history=history,
+        general_conversation=not analysis.minecraft_related,
+        token_budget=settings.prompt_token_budget,
+        count_tokens=count_prompt_tokens,
+        context_max_keys=settings.prompt_context_max_keys,
+    )
+    PROMPT_TOKENS.labels(subsystem.value).observe(layout.token_count)
+    for section, count in layout.trimmed.items():
+        PROMPT_TRIMMED.labels(section).inc(count)
+
+    return PreparedGeneration(
+        session_id=payload.session_id,
+        message=message,
+        subsystem=subsystem,
+        alerts=alerts,
+        safety=safety,
+        learned_context=learned_context,
+        player_context=payload.player_context,
+        world_context=payload.world_context,
+        history=history,
+        layout=layout,
+        started=started,
+        complexity=estimate_complexity(message, alerts, len(history), payload.complexity_hint),
+        deadline_seconds=_deadline_seconds(payload, x_aether_deadline_ms),
+    )
+
+
+def _model_for(subsystem: Subsystem) -> str:
+    return subsystem_models.get(subsystem) or resolved_model_name
+
+
+def _blocked_response(prepared: PreparedGeneration) -> GenerateResponse | None:
+    if not (prepared.safety and prepared.safety.blocked):
+        return None
+
+    GENERATE_REQUESTS.labels(prepared.subsystem.value, "true").inc()
+    return prepared.response(safe_refusal(), _model_for(prepared.subsystem), prepared.safety.flags)
+
+
+def _coalescing_key(prepared: PreparedGeneration) -> str:
+    return request_fingerprint(
+        message=normalize_message(prepared.message),
+        subsystem=prepared.subsystem.value,
+        model=_model_for(prepared.subsystem),
+        player_context=prepared.player_context,
+        world_context=prepared.world_context,
+        lessons=prepared.learned_context,
+        history=None if settings.generate_coalesce_exclude_history else prepared.history,
+    )
+
+
+def _deadline_error(exc: BackendDeadlineExceededError) -> HTTPException:
+    return HTTPException(status_code=504, detail=str(exc))
+
+
+def _admission_error(exc: AdmissionRejectedError) -> HTTPException:
+    if exc.reason == "timeout" and remaining_seconds() == 0:
+        DEADLINE_EXCEEDED.labels("admission").inc()
+        return _deadline_error(BackendDeadlineExceededError("Deadline expired while queued for a backend slot"))
+    return HTTPException(
+        status_code=429 if exc.reason == "queue_full" else 503,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
+
+def _chat_kwargs(prepared: PreparedGeneration) -> dict:
+    """Pass structured chat messages only to backends running a chat-style API."""
+    if getattr(backend, "api_mode", None) != "chat":
+        return {}
+    return {"messages": prepared.layout.chat_messages()}
+
+
+def _cascade_tiers(prepared: PreparedGeneration) -> list[str]:
+    return model_cascade.tiers_for(prepared.subsystem) if model_cascade is not None else []
 
-    if safety and safety.blocked:
-        GENERATE_REQUESTS.labels(subsystem.value, "true").inc()
-        return GenerateResponse(
-            text=safe_refusal(),
-            subsystem_used=subsystem,
-            model_used=(subsystem_models.get(subsystem) or resolved_model_name),
-            subsystem_alerts={k.value: v for k, v in alerts.items()},
-            safety_flags=safety.flags,
-            learned_context=learned_context,
-            latency_ms=int((time.perf_counter() - started) * 1000),
-        )
 
-    history_text = "\n".join(f"{x['role']}: {x['text']}" for x in memory.history(payload.session_id)[-6:])
-    lesson_text = "\n".join(f"- {lesson}" for lesson in learned_context)
-    subsystem_training = subsystem_teaching_context(subsystem)
-    request_scope = "general-conversation" if non_minecraft_request else "minecraft-subsystem"
-    full_prompt = (
-        f"Session: {payload.session_id}\n"
-        f"Request scope: {request_scope}\n"
-        f"Subsystem: {subsystem.value}\n"
-        f"Subsystem teaching profile: {subsystem_training}\n"
-        f"Detected keyword alerts: { {k.value: v for k, v in alerts.items()} }\n"
-        f"Player context: {payload.player_context}\n"
-        f"World context: {payload.world_context}\n"
-        f"Learned preferences/facts:\n{lesson_text}\n"
-        f"History:\n{history_text}\n\n"
-        f"Player: {message}\n"
-        "Assistant guidance: If the request is not Minecraft-related, respond naturally as A.E.T.H.E.R without refusing."
+async def _cascaded_generate(prepared: PreparedGeneration) -> tuple[str, str, BackendAttemptSummary]:
+    if not _cascade_tiers(prepared):
+        return await backend.generate(prepared.full_prompt, prepared.subsystem, **_chat_kwargs(prepared))
+
+    return await model_cascade.generate(
+        lambda model_name: backend.generate(
+            prepared.full_prompt, prepared.subsystem, model_name=model_name, **_chat_kwargs(prepared)
+        ),
+        prepared.subsystem,
+        prepared.complexity,
     )
 
+
+async def _admitted_generate(prepared: PreparedGeneration) -> tuple[str, str, BackendAttemptSummary]:
+    if not settings.admission_enabled:
+        return await _cascaded_generate(prepared)
+
+    async with admission.slot(prepared.subsystem, remaining_seconds()):
+        return await _cascaded_generate(prepared)
+
+
+async def _backend_generate(prepared: PreparedGeneration) -> tuple[str, str, BackendAttemptSummary]:
+    """
+    Run the backend call for ``prepared``, sharing it with identical in-flight requests when enabled.
+
+    With coalescing on, concurrent requests that agree on message, subsystem,
+    model and context reuse the leader's generation; each caller still appends
+    the answer to its own session memory.
+    """
+    if not settings.generate_coalesce_enabled:
+        return await _admitted_generate(prepared)
+
+    # The shared call runs under the leader's deadline, so each waiter also bounds its own wait.
+    flight = generate_flights.run(_coalescing_key(prepared), lambda: _admitted_generate(prepared))
     try:
-        text, model_used, attempt_summary = await backend.generate(full_prompt, subsystem)
-    except BackendUnavailableError as exc:
-        raise HTTPException(status_code=503, detail=str(exc)) from exc
+        result, is_leader = await asyncio.wait_for(flight, remaining_seconds())
+    except asyncio.TimeoutError as exc:
+        DEADLINE_EXCEEDED.labels("in_flight").inc()
+        raise BackendDeadlineExceededError("Deadline expired waiting for a coalesced generation") from exc
+    GENERATE_COALESCED.labels("leader" if is_leader else "follower").inc()
+    return result
 
-    memory.append(payload.session_id, "player", message)
-    memory.append(payload.session_id, "assistant", text)
-    GENERATE_REQUESTS.labels(subsystem.value, "false").inc()
-    GENERATE_FALLBACK_HOPS.observe(attempt_summary.fallback_hops)
-
-    return GenerateResponse(
-        text=text,
-        subsystem_used=subsystem,
-        model_used=model_used,
-        subsystem_alerts={k.value: v for k, v in alerts.items()},
-        safety_flags=(safety.flags if safety else []),
-        learned_context=learned_context,
-        latency_ms=int((time.perf_counter() - started) * 1000),
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _unless_disconnected(
+    request: Request, prepared: PreparedGeneration, work: Awaitable[T], endpoint: str = "generate"
+) -> T | None:
+    """
+    Await ``work`` but abandon it (returning ``None``) if the client disconnects first.
+
+    Cancelling the task aborts the upstream HTTP request, which frees the model
+    server slot (and any admission slot or queue entry), and skips the memory
+    write for an answer nobody will read. Coalesced flights keep running while
+    other callers still wait on them.
+    """
+    work_task = asyncio.ensure_future(work)
+    disconnect_task = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({work_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work_task.cancel()
+        raise
+    finally:
+        disconnect_task.cancel()
+
+    if work_task.done():
+        return work_task.result()
+
+    work_task.cancel()
+    await asyncio.gather(work_task, return_exceptions=True)
+    GENERATE_CANCELLED.labels(prepared.subsystem.value, endpoint).inc()
+    return None
+
+
+def _response_cache_scope(prepared: PreparedGeneration) -> dict:
+    return {
+        "player": {key: prepared.player_context.get(key) for key in cache_context_fields["player"]},
+        "world": {key: prepared.world_context.get(key) for key in cache_context_fields["world"]},
+    }
+
+
+def _response_cache_key(prepared: PreparedGeneration) -> str:
+    return request_fingerprint(
+        message=normalize_message(prepared.message),
+        subsystem=prepared.subsystem.value,
+        model=_model_for(prepared.subsystem),
+        **_response_cache_scope(prepared),
     )
+
+
+def _cache_bypassed(x_aether_cache: str | None) -> bool:
+    return (x_aether_cache or "").strip().lower() == "bypass"
+
+
+def _cached_generation(prepared: PreparedGeneration, bypass: bool) -> GenerateResponse | None:
+    """Serve ``prepared`` from the response cache, skipping the backend entirely on a hit."""
+    if not settings.response_cache_enabled or bypass:
+        return None
+
+    cached = response_cache.get(_response_cache_key(prepared), prepared.subsystem)
+    if cached is None:
+        return None
+
+    return _complete_generation(prepared, cached.text, cached.model_used, None, cached=True)
+
+
+async def _semantic_cached_generation(prepared: PreparedGeneration, bypass: bool) -> GenerateResponse | None:
+    """
+    Serve a stored answer for a paraphrase of an earlier question.
+
+    The message embedding is kept on ``prepared`` so a miss can be stored
+    without embedding twice. Embedding failures only disable the lookup.
+    """
+    embed = getattr(backend, "embed", None)
+    if semantic_cache is None or bypass or not callable(embed):
+        return None
+
+    embed_started = time.perf_counter()
+    try:
+        prepared.embedding = await embed(normalize_message(prepared.message))
+    except (BackendUnavailableError, NotImplementedError):
+        return None
+    finally:
+        SEMANTIC_CACHE_EMBED_SECONDS.observe(time.perf_counter() - embed_started)
+
+    hit = semantic_cache.lookup(
+        prepared.subsystem,
+        _model_for(prepared.subsystem),
+        request_fingerprint(**_response_cache_scope(prepared)),
+        prepared.embedding,
+    )
+    if hit is None:
+        return None
+
+    return _complete_generation(prepared, hit.text, hit.model_used, None, cached=True)
+
+
+def _store_generation(prepared: PreparedGeneration, text: str, model_used: str) -> None:
+    if settings.response_cache_enabled:
+        response_cache.put(_response_cache_key(prepared), prepared.subsystem, text, model_used)
+
+    if semantic_cache is not None and prepared.embedding is not None:
+        semantic_cache.store(
+            prepared.subsystem,
+            _model_for(prepared.subsystem),
+            request_fingerprint(**_response_cache_scope(prepared)),
+            prepared.embedding,
+            text,
+            model_used,
+        )
+
+
+def _complete_generation(
+    prepared: PreparedGeneration,
+    text: str,
+    model_used: str,
+    attempt_summary: BackendAttemptSummary | None,
+    cached: bool = False,
+) -> GenerateResponse:
+    memory.append(prepared.session_id, "player", prepared.message)
+    memory.append(prepared.session_id, "assistant", text)
+    GENERATE_REQUESTS.labels(prepared.subsystem.value, "false").inc()
+    prefill_ms = None
+    if attempt_summary is not None:
+        GENERATE_FALLBACK_HOPS.observe(attempt_summary.fallback_hops)
+        prefill_ms = attempt_summary.prefill_ms
+        if prefill_ms is not None:
+            GENERATE_PREFILL_SECONDS.labels(prepared.subsystem.value).observe(prefill_ms / 1000)
+    return prepared.response(
+        text, model_used, prepared.safety.flags if prepared.safety else [], cached=cached, prefill_ms=prefill_ms
+    )
+
+
+def _server_timing(prepared: PreparedGeneration, backend_seconds: float | None, cached: bool = False) -> str:
+    """
+    Build a ``Server-Timing`` header so load tests can split latency into sidecar and backend time.
+
+    ``backend`` covers admission, coalescing and every backend attempt;
+    ``total`` is measured from request preparation.
+    """
+    entries = [f"total;dur={(time.perf_counter() - prepared.started) * 1000:.1f}"]
+    if backend_seconds is not None:
+        entries.insert(0, f"backend;dur={backend_seconds * 1000:.1f}")
+    if cached:
+        entries.append('cache;desc="hit"')
+    return ", ".join(entries)
+
+
+def _generate_response(result: GenerateResponse, server_timing: str) -> FastJSONResponse:
+    """
+    Render a response we built ourselves straight to JSON.
+
+    Returning the response object skips FastAPI's ``response_model``
+    re-validation of a model that was already validated on construction.
+    """
+    return FastJSONResponse(result.model_dump(), headers={"Server-Timing": server_timing})
+
+
+@app.post("/generate", response_model=GenerateResponse)
+async def generate(
+    payload: GenerateRequest,
+    request: Request,
+    authorization: str | None = Header(default=None),
+    x_aether_dev_playground: str | None = Header(default=None),
+    x_aether_cache: str | None = Header(default=None),
+    x_aether_deadline_ms: int | None = Header(default=None, gt=0),
+) -> Response:
+    prepared = _prepare_generation(payload, authorization, x_aether_dev_playground, x_aether_deadline_ms)
+    blocked = _blocked_response(prepared)
+    if blocked:
+        return _generate_response(blocked, _server_timing(prepared, None))
+
+    bypass_cache = _cache_bypassed(x_aether_cache)
+    with deadline_scope(prepared.deadline_seconds):
+        cached = _cached_generation(prepared, bypass_cache)
+        if cached is None:
+            # The semantic lookup calls the backend to embed, so it shares the deadline and the disconnect race.
+            lookup = asyncio.ensure_future(_semantic_cached_generation(prepared, bypass_cache))
+            cached = await _unless_disconnected(request, prepared, lookup)
+            if lookup.cancelled():
+                return Response(status_code=499)
+        if cached:
+            return _generate_response(cached, _server_timing(prepared, None, cached=True))
+
+        backend_started = time.perf_counter()
+        try:
+            generated = await _unless_disconnected(request, prepared, _backend_generate(prepared))
+        except AdmissionRejectedError as exc:
+            raise _admission_error(exc) from exc
+        except BackendDeadlineExceededError as exc:
+            raise _deadline_error(exc) from exc
+        except BackendUnavailableError as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+    if generated is None:
+        # Nobody is listening; 499 only shows up in access logs and request metrics.
+        return Response(status_code=499)
+
+    text, model_used, attempt_summary = generated
+    backend_seconds = time.perf_counter() - backend_started
+
+    _store_generation(prepared, text, model_used)
+    result = _complete_generation(prepared, text, model_used, attempt_summary)
+    return _generate_response(result, _server_timing(prepared, backend_seconds))
+
+
+def _encode_stream_event(event: str, data: dict, stream_format: str) -> str:
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {dumps_text(data)}\n\n"
+    return dumps_text({"event": event, **data}) + "\n"
+
+
+def _backend_stream(prepared: PreparedGeneration) -> AsyncIterator[StreamChunk]:
+    """Stream from the backend; with a model cascade only the starting tier is used, as tokens cannot be retracted."""
+    options = _chat_kwargs(prepared)
+    if _cascade_tiers(prepared):
+        options["model_name"] = model_cascade.starting_model(prepared.subsystem, prepared.complexity)
+
+    stream = getattr(backend, "generate_stream", None)
+    if callable(stream):
+        return stream(prepared.full_prompt, prepared.subsystem, **options)
+
+    return BaseBackend.generate_stream(backend, prepared.full_prompt, prepared.subsystem, **options)
+
+
+@app.post("/generate/stream")
+async def generate_stream(
+    payload: GenerateRequest,
+    request: Request,
+    stream_format: Literal["sse", "ndjson"] | None = Query(default=None, alias="format"),
+    accept: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+    x_aether_dev_playground: str | None = Header(default=None),
+    x_aether_cache: str | None = Header(default=None),
+    x_aether_deadline_ms: int | None = Header(default=None, gt=0),
+) -> Response:
+    """
+    Stream generated tokens as Server-Sent Events or NDJSON.
+
+    Each token is sent as a ``token`` event; a final ``done`` event carries the
+    same payload as ``POST /generate``. Memory and request metrics are only
+    recorded once the stream completes, and an admission slot (when enabled)
+    is held until then. A client disconnect cancels the upstream stream.
+    """
+    prepared = _prepare_generation(payload, authorization, x_aether_dev_playground, x_aether_deadline_ms)
+    resolved_format = stream_format or ("sse" if "text/event-stream" in (accept or "") else "ndjson")
+    media_type = "text/event-stream" if resolved_format == "sse" else "application/x-ndjson"
+
+    blocked = _blocked_response(prepared)
+    if blocked:
+        done_event = _encode_stream_event("done", blocked.model_dump(mode="json"), resolved_format)
+        return StreamingResponse(iter([done_event]), media_type=media_type)
+
+    bypass_cache = _cache_bypassed(x_aether_cache)
+    admitted_at: float | None = None
+
+    def release_admission() -> None:
+        if admitted_at is not None:
+            admission.release(time.perf_counter() - admitted_at)
+
+    # Fallback hops only happen before the first token, so the deadline ends once the first chunk arrives.
+    with deadline_scope(prepared.deadline_seconds):
+        cached = _cached_generation(prepared, bypass_cache)
+        if cached is None:
+            lookup = asyncio.ensure_future(_semantic_cached_generation(prepared, bypass_cache))
+            cached = await _unless_disconnected(request, prepared, lookup, "generate_stream")
+            if lookup.cancelled():
+                return Response(status_code=499)
+        if cached:
+            events = [
+                _encode_stream_event("token", {"text": cached.text}, resolved_format),
+                _encode_stream_event("done", cached.model_dump(mode="json"), resolved_format),
+            ]
+            return StreamingResponse(iter(events), media_type=media_type)
+
+        chunks = _backend_stream(prepared)
+        if settings.admission_enabled:
+            try:
+                await admission.acquire(prepared.subsystem, remaining_seconds())
+            except AdmissionRejectedError as exc:
+                raise _admission_error(exc) from exc
+            admitted_at = time.perf_counter()
+
+        first_chunk = None
+        try:
+            first_chunk = await _unless_disconnected(request, prepared, anext(chunks), "generate_stream")
+        except BackendDeadlineExceededError as exc:
+            raise _deadline_error(exc) from exc
+        except BackendUnavailableError as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+        finally:
+            # Only a first chunk hands the slot to the response; every other exit gives it back here.
+            if first_chunk is None:
+                release_admission()
+    if first_chunk is None:
+        return Response(status_code=499)
+
+    async def events() -> AsyncIterator[str]:
+        GENERATE_TIME_TO_FIRST_TOKEN_SECONDS.labels(prepared.subsystem.value).observe(time.perf_counter() - prepared.started)
+        parts: list[str] = []
+        chunk = first_chunk
+        try:
+            while True:
+                if chunk.done:
+                    text = "".join(parts).strip()
+                    _store_generation(prepared, text, chunk.model_name)
+                    response = _complete_generation(
+                        prepared, text, chunk.model_name, chunk.attempt_summary or BackendAttemptSummary()
+                    )
+                    yield _encode_stream_event("done", response.model_dump(mode="json"), resolved_format)
+                    return
+
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield _encode_stream_event("token", {"text": chunk.text}, resolved_format)
+                chunk = await anext(chunks)
+        except BackendUnavailableError as exc:
+            yield _encode_stream_event("error", {"detail": str(exc)}, resolved_format)
+        except asyncio.CancelledError:
+            # The response task is cancelled when the client disconnects; closing the chunks aborts the upstream stream.
+            GENERATE_CANCELLED.labels(prepared.subsystem.value, "generate_stream").inc()
+            raise
+        finally:
+            release_admission()
+            await chunks.aclose()
+
+    return StreamingResponse(events(), media_type=media_type)
+
+
+ROUTE_BATCH_CHUNK_SIZE = 512
+
+
+def _route_batch_rows(messages: list[str], offset: int) -> list[dict]:
+    """Route, alert-tag and safety-check one chunk; the classifier scores the whole chunk at once."""
+    rows: list[dict | None] = [None] * len(messages)
+    accepted: list[int] = []
+    for position, message in enumerate(messages):
+        if len(message.strip()) > settings.max_message_chars:
+            rows[position] = {"index": offset + position, "error": f"message exceeds {settings.max_message_chars} chars"}
+        else:
+            accepted.append(position)
+
+    texts = [messages[position].strip() for position in accepted]
+    for position, text, pick in zip(accepted, texts, _classifier_picks(texts)):
+        analysis = analyze_message(text)
+        safety = evaluate_message(text) if settings.safety_enabled else None
+        if pick is not None:
+            (subsystem, confidence), routed_by = pick, "classifier"
+        else:
+            subsystem, confidence, routed_by = analysis.subsystem, None, "keywords"
+        rows[position] = {
+            "index": offset + position,
+            "subsystem": subsystem.value,
+            "routed_by": routed_by,
+            "confidence": confidence,
+            "subsystem_alerts": {key.value: value for key, value in analysis.alerts.items()},
+            "minecraft_related": analysis.minecraft_related,
+            "blocked": bool(safety and safety.blocked),
+            "safety_flags": safety.flags if safety else [],
+        }
+
+    for row in rows:
+        ROUTE_BATCH_MESSAGES.labels(row.get("routed_by", "rejected")).inc()
+    return rows
+
+
+@app.post("/route/batch")
+async def route_batch(payload: RouteBatchRequest, authorization: str | None = Header(default=None)) -> StreamingResponse:
+    """
+    Classify many messages without calling the model and stream one NDJSON line per message.
+
+    Each line carries the routed subsystem and what decided it, keyword alerts,
+    Minecraft relevance and safety flags, in request order. Messages are scored
+    in chunks, yielding to the event loop between them.
+    """
+    _validate_dev_playground_token(authorization)
+    if len(payload.messages) > settings.route_batch_max_messages:
+        raise HTTPException(status_code=400, detail=f"batch exceeds {settings.route_batch_max_messages} messages")
+
+    async def lines() -> AsyncIterator[str]:
+        for offset in range(0, len(payload.messages), ROUTE_BATCH_CHUNK_SIZE):
+            rows = _route_batch_rows(payload.messages[offset : offset + ROUTE_BATCH_CHUNK_SIZE], offset)
+            yield "".join(dumps_text(row) + "\n" for row in rows)
+            await asyncio.sleep(0)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
@@ -1,16 +1,40 @@
 from urllib.parse import urlparse, urlunparse
 
+import asyncio
+import hashlib
 import os
+import random
 import socket
 import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
 from dataclasses import dataclass
 from ipaddress import IPv4Address
 from ipaddress import ip_address
+from typing import TypeVar
 
 import httpx
 
+from .circuit import BreakerPolicy, CircuitBreaker
+from .deadline import remaining_seconds
+from .discovery import CandidateResolver
 from .models import Subsystem
-from .observability import BACKEND_ATTEMPT_LATENCY_SECONDS, BACKEND_ATTEMPTS
+from .observability import (
+    BACKEND_ATTEMPT_LATENCY_SECONDS,
+    BACKEND_ATTEMPTS,
+    BACKEND_COLD_LOADS,
+    BACKEND_HEDGE_WINS,
+    BACKEND_HEDGES,
+    BACKEND_IN_FLIGHT,
+    BACKEND_POOL_CONNECTIONS,
+    BACKEND_PROBES,
+    DEADLINE_EXCEEDED,
+)
+from .retry import RetryBudget, RetryPolicy
+from .serialization import JSON_HEADERS, dumps, loads
+
+T = TypeVar("T")
 
 SYSTEM_PROMPTS = {
     Subsystem.AEGIS: "You are Aegis, focused on safety and hazard prevention in Minecraft.",
@@ -27,21 +51,145 @@ class BackendAttemptSummary:
     attempts: int = 0
     failed_attempts: int = 0
     fallback_hops: int = 0
+    prefill_ms: int | None = None
+
+
+@dataclass
+class StreamChunk:
+    text: str
+    model_name: str
+    done: bool = False
+    attempt_summary: BackendAttemptSummary | None = None
+
+
+@dataclass
+class HealthSnapshot:
+    online: bool
+    checked_at: float
+    latency_ms: int
+    reachable_urls: list[str]
+    loaded_models: list[str]
+    detail: str | None = None
 
 
 class BaseBackend:
+    async def startup(self) -> None:
+        """Acquire long-lived resources (connection pools, background tasks)."""
+
+    async def aclose(self) -> None:
+        """Release resources acquired by :meth:`startup`."""
+
     async def warmup(self, subsystem: Subsystem = Subsystem.AEGIS) -> str:
         raise NotImplementedError
 
-    async def generate(self, prompt: str, subsystem: Subsystem) -> tuple[str, str, BackendAttemptSummary]:
+    async def generate(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        messages: list[dict[str, str]] | None = None,
+        model_name: str | None = None,
+    ) -> tuple[str, str, BackendAttemptSummary]:
         raise NotImplementedError
 
+    async def embed(self, text: str) -> list[float]:
+        raise NotImplementedError
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        messages: list[dict[str, str]] | None = None,
+        model_name: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Yield generated text incrementally, finishing with a ``done`` chunk.
+
+        Backends without native streaming emit the whole answer as one chunk.
+        Optional arguments are only forwarded when set, so minimal backends can
+        implement ``generate(prompt, subsystem)`` alone.
+        """
+        options = {key: value for key, value in (("messages", messages), ("model_name", model_name)) if value is not None}
+        text, model_name, attempt_summary = await self.generate(prompt, subsystem, **options)
+        yield StreamChunk(text=text, model_name=model_name)
+        yield StreamChunk(text="", model_name=model_name, done=True, attempt_summary=attempt_summary)
+
 
 class BackendUnavailableError(RuntimeError):
     """Raised when the configured model backend cannot be reached."""
 
 
+class BackendDeadlineExceededError(BackendUnavailableError):
+    """Raised when the request's deadline budget runs out before the backend answers."""
+
+
+class EchoBackend(BaseBackend):
+    """
+    Deterministic in-process backend for load tests and local development.
+
+    Answers echo the player's message after an optional fixed delay, so runs
+    measure the sidecar's own overhead without a model server.
+    """
+
+    def __init__(self, model_name: str = "echo", delay_seconds: float = 0.0, embedding_dimensions: int = 64):
+        self.model_name = model_name
+        self.delay_seconds = max(0.0, delay_seconds)
+        self.embedding_dimensions = max(1, embedding_dimensions)
+
+    @staticmethod
+    def _player_message(prompt: str) -> str:
+        for line in reversed(prompt.splitlines()):
+            if line.startswith("Player: "):
+                return line[len("Player: ") :]
+        return prompt.strip()
+
+    async def warmup(self, subsystem: Subsystem = Subsystem.AEGIS) -> str:
+        return self.model_name
+
+    async def generate(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        messages: list[dict[str, str]] | None = None,
+        model_name: str | None = None,
+    ) -> tuple[str, str, BackendAttemptSummary]:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        text = f"[{subsystem.value}] echo: {self._player_message(prompt)}"
+        return text, model_name or self.model_name, BackendAttemptSummary(attempts=1)
+
+    async def embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.embedding_dimensions
+        for word in text.lower().split():
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest()
+            vector[int.from_bytes(digest, "big") % self.embedding_dimensions] += 1.0
+        return vector
+
+
+ROUTING_MODES = ("failover", "least_outstanding", "ewma")
+
+
 class OllamaBackend(BaseBackend):
+    """
+    Ollama HTTP backend with candidate discovery, failover, pooling and health probing.
+
+    Wire-format details live in small hook methods (payloads, endpoints and
+    response parsing) so servers with other APIs can reuse the transport.
+    """
+
+    PROBE_PATH = "/api/ps"
+    EMBED_PATH = "/api/embed"
+    PROBE_TIMEOUT_SECONDS = 3.0
+    HEALTH_SNAPSHOT_TTL_SECONDS = 10.0
+    LATENCY_EWMA_ALPHA = 0.3
+    HEDGE_DEFAULT_DELAY_SECONDS = 2.0
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_LATENCY_WINDOW = 200
+    COLD_LOAD_THRESHOLD_SECONDS = 1.0
+    # Environment variables and compose service names that may point at more hosts of this server type.
+    DISCOVERY_ENV_KEYS = ("AETHER_OLLAMA_URL", "OLLAMA_URL", "OLLAMA_HOST")
+    DISCOVERY_FALLBACK_ENV_KEY = "AETHER_OLLAMA_FALLBACK_URLS"
+    SERVICE_ALIASES = ("ollama", "aether-ollama")
+
     def __init__(
         self,
         base_url: str,
@@ -51,6 +199,21 @@ class OllamaBackend(BaseBackend):
         keep_alive: str = "15m",
         fallback_urls: list[str] | None = None,
         failure_backoff_seconds: float = 30.0,
+        candidate_cache_ttl_seconds: float = 60.0,
+        pool_max_connections: int = 20,
+        pool_max_keepalive_connections: int = 10,
+        pool_keepalive_expiry_seconds: float = 60.0,
+        hedge_enabled: bool = False,
+        hedge_delay_seconds: float = 0.0,
+        breaker_policy: BreakerPolicy | None = None,
+        probe_interval_seconds: float = 10.0,
+        embedding_model: str = "nomic-embed-text",
+        routing_mode: str = "failover",
+        routing_weights: dict[str, float] | None = None,
+        api_mode: str = "generate",
+        retry_policy: RetryPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
+        max_in_flight_per_url: int = 0,
     ):
         self.base_url = base_url
         self.model_name = model_name
@@ -61,6 +224,31 @@ class OllamaBackend(BaseBackend):
         self.failure_backoff_seconds = max(0.0, failure_backoff_seconds)
         self._preferred_url: str | None = None
         self._url_backoff_until: dict[str, float] = {}
+        self._candidate_resolver = CandidateResolver(lambda: self.candidate_urls(), candidate_cache_ttl_seconds)
+        self.pool_max_connections = max(1, pool_max_connections)
+        self.pool_max_keepalive_connections = max(0, pool_max_keepalive_connections)
+        self.pool_keepalive_expiry_seconds = max(0.0, pool_keepalive_expiry_seconds)
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._in_flight: dict[str, int] = {}
+        self.max_in_flight_per_url = max(0, max_in_flight_per_url)
+        self._url_slots: dict[str, asyncio.Semaphore] = {}
+        self.hedge_enabled = hedge_enabled
+        self.hedge_delay_seconds = max(0.0, hedge_delay_seconds)
+        self._recent_generate_latencies: deque[float] = deque(maxlen=self.HEDGE_LATENCY_WINDOW)
+        self.breaker_policy = breaker_policy or BreakerPolicy()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.probe_interval_seconds = max(0.0, probe_interval_seconds)
+        self._probe_task: asyncio.Task | None = None
+        self._health_snapshot: HealthSnapshot | None = None
+        self._health_snapshot_at = 0.0
+        self.embedding_model = embedding_model
+        self.routing_mode = routing_mode if routing_mode in ROUTING_MODES else "failover"
+        self.routing_weights = routing_weights or {}
+        self._latency_ewma: dict[str, float] = {}
+        self.api_mode = "chat" if api_mode == "chat" else "generate"
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = retry_budget or RetryBudget()
+        self._placement: dict[str, set[str]] = {}
 
     def _client_timeout(self) -> httpx.Timeout:
         """
@@ -72,6 +260,210 @@ class OllamaBackend(BaseBackend):
         """
         return httpx.Timeout(connect=3.0, read=self.timeout_seconds, write=10.0, pool=10.0)
 
+    def _client_headers(self) -> dict[str, str]:
+        return {}
+
+    def _pool_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.pool_max_connections,
+            max_keepalive_connections=self.pool_max_keepalive_connections,
+            keepalive_expiry=self.pool_keepalive_expiry_seconds,
+        )
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        """
+        Return the pooled client for ``url``, creating it on first use.
+
+        Clients are kept for the backend's lifetime so keep-alive connections
+        are reused across requests instead of paying TCP setup per attempt.
+        """
+        client = self._clients.get(url)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self._client_timeout(), limits=self._pool_limits(), headers=self._client_headers()
+            )
+            self._clients[url] = client
+        return client
+
+    async def startup(self) -> None:
+        for url in await self._candidate_resolver.refresh():
+            self._client_for(url)
+
+        if self.probe_interval_seconds > 0 and self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def aclose(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
+        await self._candidate_resolver.aclose()
+        clients = list(self._clients.items())
+        self._clients.clear()
+        for url, client in clients:
+            await client.aclose()
+            for state in ("idle", "in_use", "waiting"):
+                BACKEND_POOL_CONNECTIONS.labels(url, state).set(0)
+
+    @staticmethod
+    def _idle_pool_connections(client: httpx.AsyncClient | None) -> int | None:
+        """Count idle connections in httpx's private pool, or return ``None`` if its internals have changed."""
+        try:
+            return sum(1 for connection in client._transport._pool.connections if connection.is_idle())
+        except Exception:
+            return None
+
+    def _record_pool_metrics(self, url: str) -> None:
+        """
+        Publish the pool gauges for ``url`` from the :meth:`_track_in_flight` count.
+
+        Attempts beyond ``pool_max_connections`` queue inside httpx for a
+        connection, so in-use and waiting follow from that limit. Only the idle
+        count reads httpx internals, and it is skipped if they ever fail.
+        """
+        in_flight = self._in_flight.get(url, 0)
+        BACKEND_POOL_CONNECTIONS.labels(url, "in_use").set(min(in_flight, self.pool_max_connections))
+        BACKEND_POOL_CONNECTIONS.labels(url, "waiting").set(max(0, in_flight - self.pool_max_connections))
+        idle = self._idle_pool_connections(self._clients.get(url))
+        if idle is not None:
+            BACKEND_POOL_CONNECTIONS.labels(url, "idle").set(idle)
+
+    def _url_slot(self, url: str) -> asyncio.Semaphore | nullcontext:
+        if self.max_in_flight_per_url <= 0:
+            return nullcontext()
+
+        slot = self._url_slots.get(url)
+        if slot is None:
+            slot = self._url_slots[url] = asyncio.Semaphore(self.max_in_flight_per_url)
+        return slot
+
+    def _saturated(self, url: str) -> bool:
+        return 0 < self.max_in_flight_per_url <= self._in_flight.get(url, 0)
+
+    def _unsaturated_first(self, candidates: list[str]) -> list[str]:
+        """Move URLs already at ``max_in_flight_per_url`` behind the rest, keeping each group's order."""
+        saturated = [url for url in candidates if self._saturated(url)]
+        if not saturated or len(saturated) == len(candidates):
+            return candidates
+        return [*(url for url in candidates if url not in saturated), *saturated]
+
+    @asynccontextmanager
+    async def _track_in_flight(self, url: str):
+        """
+        Count a request to ``url`` for routing and metrics while it runs.
+
+        Every request sent to ``url`` passes through here, so this is where a
+        half-open trial is claimed and where ``max_in_flight_per_url`` makes
+        callers queue for one of the URL's slots.
+        """
+        self._breaker_for(url).record_attempt()
+        self._in_flight[url] = self._in_flight.get(url, 0) + 1
+        BACKEND_IN_FLIGHT.labels(url).set(self._in_flight[url])
+        self._record_pool_metrics(url)
+        try:
+            async with self._url_slot(url):
+                yield
+        finally:
+            self._in_flight[url] -= 1
+            BACKEND_IN_FLIGHT.labels(url).set(self._in_flight[url])
+            self._record_pool_metrics(url)
+
+    @staticmethod
+    def _api_url(url: str, path: str) -> str:
+        """Return ``url`` with its path replaced, e.g. ``/api/generate`` -> ``/api/ps``."""
+        return urlunparse(urlparse(url)._replace(path=path, params="", query="", fragment=""))
+
+    async def _probe_url(self, url: str) -> dict | None:
+        """
+        Check ``url`` with a cheap metadata endpoint (Ollama's ``/api/ps``).
+
+        Failed probes count toward the circuit breaker's window like failed
+        requests, so outages are found here rather than by player requests
+        without one dropped probe evicting a host. A host that answers again is
+        moved to half-open, so a single real request decides whether it closes.
+        """
+        breaker = self._breaker_for(url)
+        try:
+            resp = await self._client_for(url).get(self._api_url(url, self.PROBE_PATH), timeout=self.PROBE_TIMEOUT_SECONDS)
+            resp.raise_for_status()
+            data = loads(resp.content)
+        except (httpx.HTTPError, ValueError):
+            BACKEND_PROBES.labels(url, "failure").inc()
+            breaker.record_failure()
+            return None
+
+        BACKEND_PROBES.labels(url, "success").inc()
+        breaker.probe_succeeded()
+        self._url_backoff_until.pop(url, None)
+        if isinstance(data, dict):
+            self._placement[url] = {self._model_key(name) for name in self._loaded_models(data)}
+        return data
+
+    async def probe_candidates(self) -> dict[str, dict | None]:
+        started = time.perf_counter()
+        urls = self._cached_candidate_urls()
+        results = dict(zip(urls, await asyncio.gather(*(self._probe_url(url) for url in urls))))
+        self._store_health_snapshot(results, time.perf_counter() - started)
+        return results
+
+    def _store_health_snapshot(self, results: dict[str, dict | None], elapsed_seconds: float) -> None:
+        reachable = [url for url, data in results.items() if data is not None]
+        loaded_models: list[str] = []
+        for data in results.values():
+            for name in self._loaded_models(data or {}):
+                if name not in loaded_models:
+                    loaded_models.append(name)
+
+        self._health_snapshot = HealthSnapshot(
+            online=bool(reachable),
+            checked_at=time.time(),
+            latency_ms=int(elapsed_seconds * 1000),
+            reachable_urls=reachable,
+            loaded_models=loaded_models,
+            detail=None if reachable else f"No model backend answered {self.PROBE_PATH}. Tried: {', '.join(results) or self.base_url}",
+        )
+        self._health_snapshot_at = time.monotonic()
+
+    @staticmethod
+    def _loaded_models(probe_data: dict) -> list[str]:
+        names = (model.get("name") or model.get("model") for model in probe_data.get("models") or [])
+        return [name for name in names if name]
+
+    async def health_snapshot(self) -> HealthSnapshot:
+        """
+        Return the last probe snapshot, probing inline only when it is missing or stale.
+
+        The background probe loop normally keeps this fresh, so status checks
+        never cost an inference call.
+        """
+        max_age = self.probe_interval_seconds * 2 if self.probe_interval_seconds > 0 else self.HEALTH_SNAPSHOT_TTL_SECONDS
+        if self._health_snapshot is None or time.monotonic() - self._health_snapshot_at > max_age:
+            await self.probe_candidates()
+        return self._health_snapshot
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await self.probe_candidates()
+            await asyncio.sleep(self.probe_interval_seconds)
+
+    async def _post(self, url: str, payload: dict, endpoint: str | None = None) -> httpx.Response:
+        """POST ``payload`` through the pool for ``url``, optionally to another API ``endpoint`` on that host."""
+        client = self._client_for(url)
+        target = self._api_url(url, endpoint) if endpoint else url
+        async with self._track_in_flight(url):
+            resp = await client.post(target, content=dumps(payload), headers=JSON_HEADERS)
+        self._raise_for_status(url, resp)
+        return resp
+
+    def _raise_for_status(self, url: str, resp: httpx.Response) -> None:
+        """Raise for an HTTP error status; retryable server errors also count against ``url``'s breaker."""
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code >= 500 and self.retry_policy.is_retryable(exc):
+                self._breaker_for(url).record_failure()
+            raise
+
     @staticmethod
     def _is_containerized_runtime() -> bool:
         """Best-effort check for containerized runtime contexts."""
@@ -170,13 +562,13 @@ class OllamaBackend(BaseBackend):
 
     def _env_discovered_candidates(self, parsed_base) -> list[str]:
         discovered: list[str] = []
-        for env_key in ("AETHER_OLLAMA_URL", "OLLAMA_URL", "OLLAMA_HOST"):
+        for env_key in self.DISCOVERY_ENV_KEYS:
             raw = os.getenv(env_key, "")
             candidate = self._candidate_from_host_token(raw, parsed_base)
             if candidate:
                 discovered.append(candidate)
 
-        fallback_env = os.getenv("AETHER_OLLAMA_FALLBACK_URLS", "")
+        fallback_env = os.getenv(self.DISCOVERY_FALLBACK_ENV_KEY, "") if self.DISCOVERY_FALLBACK_ENV_KEY else ""
         if fallback_env:
             for token in fallback_env.split(","):
                 candidate = self._candidate_from_host_token(token, parsed_base)
@@ -223,8 +615,7 @@ class OllamaBackend(BaseBackend):
             "host.docker.internal",
             "gateway.docker.internal",
             "host.containers.internal",
-            "ollama",
-            "aether-ollama",
+            *self.SERVICE_ALIASES,
             "172.17.0.1",
             "192.168.65.1",
         }
@@ -232,8 +623,7 @@ class OllamaBackend(BaseBackend):
             return self._dedupe_urls(candidates)
 
         hostnames = [
-            "ollama",
-            "aether-ollama",
+            *self.SERVICE_ALIASES,
             "host.docker.internal",
             "gateway.docker.internal",
             "host.containers.internal",
@@ -306,20 +696,136 @@ class OllamaBackend(BaseBackend):
         return self._dedupe_urls(candidates)
 
 
-    def _mark_url_failure(self, url: str) -> None:
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = CircuitBreaker(url, self.breaker_policy)
+            self._breakers[url] = breaker
+        return breaker
+
+    def circuit_breaker_states(self) -> dict[str, str]:
+        return {url: breaker.state.value for url, breaker in self._breakers.items()}
+
+    def _mark_url_failure(self, url: str, error: httpx.RequestError | None = None) -> None:
+        self._breaker_for(url).record_failure()
+        if isinstance(error, httpx.ConnectError):
+            self._candidate_resolver.invalidate()
+
         if self.failure_backoff_seconds <= 0:
             return
 
         self._url_backoff_until[url] = time.monotonic() + self.failure_backoff_seconds
 
     def _mark_url_success(self, url: str) -> None:
+        self._breaker_for(url).record_success()
         self._url_backoff_until.pop(url, None)
 
+    def _cached_candidate_urls(self) -> list[str]:
+        """Return discovered candidate URLs from cache, preferring the last successful one."""
+        candidates = self._candidate_resolver.get()
+        if self._preferred_url:
+            return self._dedupe_urls([self._preferred_url, *candidates])
+        return candidates
+
     def _eligible_candidate_urls(self) -> list[str]:
-        candidates = self.candidate_urls()
+        candidates = self._cached_candidate_urls()
         now = time.monotonic()
-        eligible = [url for url in candidates if self._url_backoff_until.get(url, 0.0) <= now]
-        return eligible or candidates
+        eligible = [
+            url
+            for url in candidates
+            if self._url_backoff_until.get(url, 0.0) <= now
+            and (url not in self._breakers or self._breakers[url].allows_requests())
+        ]
+        if not eligible:
+            return candidates
+        if self.routing_mode == "failover":
+            return self._unsaturated_first(eligible)
+        return self._unsaturated_first(self._balanced_order(eligible))
+
+    def _observe_url_latency(self, url: str, elapsed_seconds: float) -> None:
+        previous = self._latency_ewma.get(url)
+        self._latency_ewma[url] = (
+            elapsed_seconds
+            if previous is None
+            else self.LATENCY_EWMA_ALPHA * elapsed_seconds + (1 - self.LATENCY_EWMA_ALPHA) * previous
+        )
+
+    def _routing_cost(self, url: str) -> float:
+        outstanding = self._in_flight.get(url, 0)
+        weight = max(self.routing_weights.get(url, 1.0), 1e-6)
+        if self.routing_mode == "ewma":
+            # Unmeasured hosts cost nothing so each one gets sampled early on.
+            return self._latency_ewma.get(url, 0.0) * (outstanding + 1) / weight
+        return outstanding / weight
+
+    def _balanced_order(self, eligible: list[str]) -> list[str]:
+        """
+        Put a power-of-two-choices pick from the configured hosts first.
+
+        Two distinct hosts are sampled in proportion to their weights and the
+        cheaper one (by outstanding requests, or EWMA latency scaled by load)
+        is tried first. Discovered aliases of those hosts are not balanced over;
+        they, and the other hosts, remain as failover candidates behind it.
+        """
+        configured = set(self.configured_urls())
+        pool = [url for url in eligible if url in configured]
+        if len(pool) < 2:
+            return eligible
+
+        weights = [max(self.routing_weights.get(url, 1.0), 0.0) for url in pool]
+        if not any(weights):
+            weights = [1.0] * len(pool)
+        first = random.choices(range(len(pool)), weights=weights)[0]
+        remaining = [index for index in range(len(pool)) if index != first]
+        remaining_weights = [weights[index] for index in remaining]
+        if not any(remaining_weights):
+            remaining_weights = [1.0] * len(remaining)
+        second = random.choices(remaining, weights=remaining_weights)[0]
+        choice = min((pool[first], pool[second]), key=self._routing_cost)
+        return [choice, *(url for url in eligible if url != choice)]
+
+    @staticmethod
+    def _model_key(model_name: str) -> str:
+        """Normalize a model name the way Ollama does, so ``llama3`` and ``llama3:latest`` match."""
+        name = model_name.strip()
+        return name if ":" in name.rsplit("/", 1)[-1] else f"{name}:latest"
+
+    def model_placement(self) -> dict[str, list[str]]:
+        """Return which models are believed resident on each probed or used URL."""
+        return {url: sorted(models) for url, models in self._placement.items()}
+
+    def _placement_order(self, candidates: list[str], model_name: str) -> list[str]:
+        """
+        Move the hosts where ``model_name`` is already loaded to the front.
+
+        The partition is stable, so the failover or balanced order still
+        decides between warm hosts and between cold ones. When no host is
+        known to hold the model the order is left alone. Hosts at their
+        in-flight cap still go last, warm or not.
+        """
+        key = self._model_key(model_name)
+        warm = [url for url in candidates if key in self._placement.get(url, ())]
+        if warm and len(warm) < len(candidates):
+            candidates = [*warm, *(url for url in candidates if url not in warm)]
+        return self._unsaturated_first(candidates)
+
+    @staticmethod
+    def _load_seconds(data: dict) -> float | None:
+        """Return Ollama's model load time (reported in nanoseconds) in seconds."""
+        duration = data.get("load_duration")
+        return duration / 1_000_000_000 if isinstance(duration, (int, float)) else None
+
+    def _observe_placement(self, url: str, model_name: str, data: dict) -> None:
+        """Record that ``url`` now holds ``model_name``, counting a cold load when the reply spent time loading it."""
+        key = self._model_key(model_name)
+        self._placement.setdefault(url, set()).add(key)
+        load_seconds = self._load_seconds(data)
+        if load_seconds is not None and load_seconds >= self.COLD_LOAD_THRESHOLD_SECONDS:
+            BACKEND_COLD_LOADS.labels(url, key).inc()
+
+    def configured_urls(self) -> list[str]:
+        """Return the explicitly configured base and fallback URLs, without discovered aliases."""
+        return self._dedupe_urls([self.base_url, *self.fallback_urls])
 
     def model_for_subsystem(self, subsystem: Subsystem) -> str:
         return self.subsystem_models.get(subsystem, self.model_name)
@@ -340,85 +846,510 @@ class OllamaBackend(BaseBackend):
         BACKEND_ATTEMPTS.labels(operation, url, outcome).inc()
         BACKEND_ATTEMPT_LATENCY_SECONDS.labels(operation, url, outcome).observe(max(0.0, elapsed_seconds))
 
+    def _generate_payload(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        model_name: str,
+        stream: bool = False,
+        messages: list[dict[str, str]] | None = None,
+    ) -> dict:
+        system_prompt = SYSTEM_PROMPTS.get(subsystem, SYSTEM_PROMPTS[Subsystem.AEGIS])
+        if self.api_mode == "chat":
+            chat = list(messages or [{"role": "user", "content": prompt}])
+            if chat[0]["role"] == "system":
+                chat[0] = {"role": "system", "content": f"{system_prompt}\n\n{chat[0]['content']}"}
+            else:
+                chat.insert(0, {"role": "system", "content": system_prompt})
+            return {"model": model_name, "messages": chat, "stream": stream, "keep_alive": self.keep_alive}
+
+        return {
+            "model": model_name,
+            "prompt": f"{system_prompt}\n\nUser request:\n{prompt}",
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+        }
+
+    def _generate_endpoint(self) -> str | None:
+        return "/api/chat" if self.api_mode == "chat" else None
+
+    def _response_text(self, data: dict) -> str:
+        if self.api_mode == "chat":
+            return (data.get("message") or {}).get("content") or ""
+        return data.get("response") or ""
+
+    @staticmethod
+    def _prefill_ms(data: dict) -> int | None:
+        """Return Ollama's prompt evaluation time (reported in nanoseconds) in milliseconds."""
+        duration = data.get("prompt_eval_duration")
+        return int(duration / 1_000_000) if isinstance(duration, (int, float)) else None
+
+    @staticmethod
+    def _parse_stream_line(line: str) -> dict | None:
+        """Decode one line of a streamed response; ``None`` skips keep-alive blank lines."""
+        return loads(line) if line.strip() else None
+
+    @staticmethod
+    def _stream_done(data: dict) -> bool:
+        return bool(data.get("done"))
+
+    def _warmup_request(self, model_name: str) -> tuple[dict, str | None]:
+        """Return the warmup ``(payload, endpoint)``; ``None`` posts to the candidate URL itself."""
+        return {
+            "model": model_name,
+            "prompt": "Warmup request. Reply with: ready.",
+            "stream": False,
+            "keep_alive": self.keep_alive,
+        }, None
+
+    def _embed_payload(self, text: str) -> dict:
+        return {"model": self.embedding_model, "input": text, "keep_alive": self.keep_alive}
+
+    @staticmethod
+    def _embedding_from(data: dict) -> list[float]:
+        embeddings = data.get("embeddings") or []
+        return embeddings[0] if embeddings else []
+
+    async def _warmup_attempt(self, url: str, model_name: str) -> str:
+        attempt_started = time.perf_counter()
+        payload, endpoint = self._warmup_request(model_name)
+        try:
+            resp = await self._post(url, payload, endpoint=endpoint)
+        except httpx.RequestError as exc:
+            self._mark_url_failure(url, exc)
+            self._record_attempt_metric("warmup", url, "request_error", time.perf_counter() - attempt_started)
+            raise
+
+        self._preferred_url = url
+        self._mark_url_success(url)
+        try:
+            self._observe_placement(url, model_name, loads(resp.content))
+        except ValueError:
+            self._observe_placement(url, model_name, {})
+        self._record_attempt_metric("warmup", url, "success", time.perf_counter() - attempt_started)
+        return model_name
+
     async def warmup(self, subsystem: Subsystem = Subsystem.AEGIS) -> str:
         model_name = self.model_for_subsystem(subsystem)
+        self.retry_budget.record_request()
+        return await self._run_with_retries(
+            self._placement_order(self._eligible_candidate_urls(), model_name),
+            lambda url: self._warmup_attempt(url, model_name),
+            BackendAttemptSummary(),
+            "warmup",
+        )
+
+    def _observe_generate_latency(self, elapsed_seconds: float) -> None:
+        self._recent_generate_latencies.append(elapsed_seconds)
+
+    def hedge_delay(self) -> float:
+        """
+        Return how long to wait on an attempt before hedging to the next URL.
+
+        A configured delay wins; otherwise the observed p95 of recent successful
+        generations is used once enough samples exist.
+        """
+        if self.hedge_delay_seconds > 0:
+            return self.hedge_delay_seconds
+
+        samples = sorted(self._recent_generate_latencies)
+        if len(samples) < self.HEDGE_MIN_SAMPLES:
+            return self.HEDGE_DEFAULT_DELAY_SECONDS
+
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    @staticmethod
+    def _check_deadline(url: str) -> float | None:
+        """Return the remaining deadline budget, refusing to start a hop at ``url`` once it is spent."""
+        remaining = remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            DEADLINE_EXCEEDED.labels("before_hop").inc()
+            raise BackendDeadlineExceededError(f"Deadline expired before trying model backend at {url}")
+        return remaining
+
+    async def _within_deadline(self, work: Awaitable[T], operation: str, url: str, attempt_started: float) -> T:
+        """Await ``work`` for at most what is left of the request's deadline."""
+        try:
+            return await asyncio.wait_for(work, remaining_seconds())
+        except asyncio.TimeoutError as exc:
+            self._record_attempt_metric(operation, url, "deadline", time.perf_counter() - attempt_started)
+            DEADLINE_EXCEEDED.labels("in_flight").inc()
+            raise BackendDeadlineExceededError(f"Deadline expired waiting for model backend at {url}") from exc
+
+    async def _generate_attempt(self, url: str, payload: dict, model_name: str) -> tuple[str, int | None]:
+        """
+        Run one generation against ``url`` and return ``(text, prefill_ms)``.
+
+        The attempt only gets what is left of the request's deadline; running
+        out is not the host's fault, so it does not count against its breaker.
+        """
+        self._check_deadline(url)
+        attempt_started = time.perf_counter()
+        try:
+            resp = await self._within_deadline(
+                self._post(url, payload, endpoint=self._generate_endpoint()), "generate", url, attempt_started
+            )
+        except httpx.RequestError as exc:
+            self._mark_url_failure(url, exc)
+            self._record_attempt_metric("generate", url, "request_error", time.perf_counter() - attempt_started)
+            raise
+        except asyncio.CancelledError:
+            self._record_attempt_metric("generate", url, "cancelled", time.perf_counter() - attempt_started)
+            raise
+
+        data = loads(resp.content)
+        text = self._response_text(data).strip()
+        elapsed = time.perf_counter() - attempt_started
+        if not text:
+            self._record_attempt_metric("generate", url, "empty", elapsed)
+            raise BackendUnavailableError(f"Model backend at {url} returned an empty response for model {model_name}.")
+
+        self._preferred_url = url
+        self._mark_url_success(url)
+        self._observe_placement(url, model_name, data)
+        self._observe_generate_latency(elapsed)
+        self._observe_url_latency(url, elapsed)
+        self._record_attempt_metric("generate", url, "success", elapsed)
+        return text, self._prefill_ms(data)
+
+    @staticmethod
+    def _status_error(url: str, exc: httpx.HTTPStatusError) -> BackendUnavailableError:
+        return BackendUnavailableError(f"Model backend at {url} returned {exc.response.status_code}: {exc.response.text}")
+
+    def _record_status_failure(self, operation: str, url: str, retrying: bool, attempt_started: float) -> None:
+        """Record an HTTP error attempt once the caller knows whether another attempt follows it."""
+        outcome = "retry" if retrying else "http_error"
+        self._record_attempt_metric(operation, url, outcome, time.perf_counter() - attempt_started)
+
+    def _may_retry(self, exc: httpx.HTTPStatusError) -> bool:
+        return self.retry_policy.is_retryable(exc) and self.retry_budget.try_spend()
+
+    async def _retry_backoff(self, retry: int) -> None:
+        delay = self.retry_policy.backoff_seconds(retry)
+        remaining = remaining_seconds()
+        await asyncio.sleep(delay if remaining is None else min(delay, remaining))
+
+    async def _run_with_retries(
+        self,
+        candidates: list[str],
+        attempt: Callable[[str], Awaitable[T]],
+        attempt_summary: BackendAttemptSummary,
+        operation: str,
+    ) -> T:
+        """
+        Run ``attempt`` against the candidates in order until one succeeds.
+
+        Connection errors fail over to the next candidate. Retryable HTTP
+        errors (see :class:`RetryPolicy`) do too while the retry budget allows;
+        once no untried candidate is left, the failing one is retried after a
+        jittered backoff up to ``max_retries`` times. Fatal HTTP errors raise
+        immediately. HTTP errors are recorded under ``operation`` here, since
+        only this loop knows whether another attempt follows.
+        """
+        request_failures: list[tuple[str, httpx.RequestError]] = []
+        queue = list(candidates)
+        retries = 0
+        index = 0
+        while index < len(queue):
+            candidate_url = queue[index]
+            index += 1
+            attempt_summary.attempts += 1
+            attempt_started = time.perf_counter()
+            try:
+                result = await attempt(candidate_url)
+            except httpx.HTTPStatusError as exc:
+                attempt_summary.failed_attempts += 1
+                retry_same = index == len(queue)
+                retrying = not (retry_same and retries >= self.retry_policy.max_retries) and self._may_retry(exc)
+                self._record_status_failure(operation, candidate_url, retrying, attempt_started)
+                if not retrying:
+                    raise self._status_error(candidate_url, exc) from exc
+                if retry_same:
+                    retries += 1
+                    await self._retry_backoff(retries)
+                    queue.append(candidate_url)
+                continue
+            except httpx.RequestError as exc:
+                request_failures.append((candidate_url, exc))
+                attempt_summary.failed_attempts += 1
+                continue
+
+            attempt_summary.fallback_hops = index - 1
+            return result
+
+        if request_failures:
+            raise BackendUnavailableError(self._format_request_failures(request_failures)) from request_failures[-1][1]
+
+        raise BackendUnavailableError(f"Failed to contact model backend at {self.base_url}")
+
+    async def _generate_sequential(
+        self, candidates: list[str], payload: dict, model_name: str, attempt_summary: BackendAttemptSummary
+    ) -> str:
+        text, attempt_summary.prefill_ms = await self._run_with_retries(
+            candidates, lambda url: self._generate_attempt(url, payload, model_name), attempt_summary, "generate"
+        )
+        return text
+
+    def _hedge_target(self, candidates: list[str], tried: set[int], busy_urls: list[str]) -> int | None:
+        """
+        Return the index of the first untried configured candidate on a host no attempt is using.
+
+        Discovered aliases (``localhost`` for ``127.0.0.1``) usually reach the
+        same server, so hedging to one would only add load to the slow host.
+        """
+        configured = set(self.configured_urls())
+        busy_hosts = {urlparse(url).netloc.lower() for url in busy_urls}
+        for index, url in enumerate(candidates):
+            if index not in tried and url in configured and urlparse(url).netloc.lower() not in busy_hosts:
+                return index
+        return None
+
+    async def _generate_hedged(
+        self, candidates: list[str], payload: dict, model_name: str, attempt_summary: BackendAttemptSummary
+    ) -> str:
+        """
+        Race the current candidate against one duplicate on another configured host.
+
+        The duplicate is only sent if the first attempt has not answered within
+        :meth:`hedge_delay`, and only to a host found by :meth:`_hedge_target`.
+        Failed attempts still fall through to the next candidate in order; the
+        first successful answer wins and the other is cancelled.
+        """
+        request_failures: list[tuple[str, httpx.RequestError]] = []
+        status_failure: tuple[str, httpx.HTTPStatusError] | None = None
+        pending: dict[asyncio.Task, int] = {}
+        started: dict[asyncio.Task, float] = {}
+        tried: set[int] = set()
+        hedge_task: asyncio.Task | None = None
+
+        def launch(index: int) -> asyncio.Task:
+            task = asyncio.create_task(self._generate_attempt(candidates[index], payload, model_name))
+            pending[task] = index
+            started[task] = time.perf_counter()
+            tried.add(index)
+            attempt_summary.attempts += 1
+            return task
+
+        def next_untried() -> int | None:
+            return next((index for index in range(len(candidates)) if index not in tried), None)
+
+        launch(0)
+        try:
+            while pending:
+                hedge_index = None
+                if hedge_task is None and remaining_seconds() != 0:
+                    hedge_index = self._hedge_target(candidates, tried, [candidates[index] for index in pending.values()])
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay() if hedge_index is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedge_task = launch(hedge_index)
+                    BACKEND_HEDGES.labels("generate").inc()
+                    continue
+
+                for task in done:
+                    attempt_index = pending.pop(task)
+                    candidate_url = candidates[attempt_index]
+                    try:
+                        text, attempt_summary.prefill_ms = task.result()
+                    except httpx.HTTPStatusError as exc:
+                        retrying = (pending or next_untried() is not None) and self._may_retry(exc)
+                        self._record_status_failure("generate", candidate_url, retrying, started[task])
+                        if not retrying:
+                            raise self._status_error(candidate_url, exc) from exc
+                        status_failure = (candidate_url, exc)
+                        attempt_summary.failed_attempts += 1
+                        continue
+                    except httpx.RequestError as exc:
+                        request_failures.append((candidate_url, exc))
+                        attempt_summary.failed_attempts += 1
+                        continue
+
+                    if hedge_task is not None:
+                        BACKEND_HEDGE_WINS.labels("generate", "hedge" if task is hedge_task else "primary").inc()
+                    attempt_summary.fallback_hops = attempt_index
+                    return text
+
+                if not pending and next_untried() is not None:
+                    launch(next_untried())
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if request_failures:
+            raise BackendUnavailableError(self._format_request_failures(request_failures)) from request_failures[-1][1]
+
+        if status_failure is not None:
+            raise self._status_error(*status_failure) from status_failure[1]
+
+        raise BackendUnavailableError(f"Failed to contact model backend at {self.base_url}")
+
+    async def generate(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        messages: list[dict[str, str]] | None = None,
+        model_name: str | None = None,
+    ) -> tuple[str, str, BackendAttemptSummary]:
+        model_name = model_name or self.model_for_subsystem(subsystem)
+        payload = self._generate_payload(prompt, subsystem, model_name, messages=messages)
+        candidates = self._placement_order(self._eligible_candidate_urls(), model_name)
+        attempt_summary = BackendAttemptSummary()
+        self.retry_budget.record_request()
+        if self.hedge_enabled and self._hedge_target(candidates, {0}, candidates[:1]) is not None:
+            text = await self._generate_hedged(candidates, payload, model_name, attempt_summary)
+        else:
+            text = await self._generate_sequential(candidates, payload, model_name, attempt_summary)
+        return text, model_name, attempt_summary
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Embed ``text`` with the server's embedding endpoint using :attr:`embedding_model`.
+
+        Like a generation attempt, each candidate only gets what is left of
+        the request's deadline.
+        """
         request_failures: list[tuple[str, httpx.RequestError]] = []
         for candidate_url in self._eligible_candidate_urls():
+            self._check_deadline(candidate_url)
             attempt_started = time.perf_counter()
             try:
-                async with httpx.AsyncClient(timeout=self._client_timeout()) as client:
-                    resp = await client.post(
-                        candidate_url,
-                        json={
-                            "model": model_name,
-                            "prompt": "Warmup request. Reply with: ready.",
-                            "stream": False,
-                            "keep_alive": self.keep_alive,
-                        },
-                    )
-                    resp.raise_for_status()
-                self._preferred_url = candidate_url
-                self._mark_url_success(candidate_url)
-                self._record_attempt_metric("warmup", candidate_url, "success", time.perf_counter() - attempt_started)
-                return model_name
+                resp = await self._within_deadline(
+                    self._post(candidate_url, self._embed_payload(text), endpoint=self.EMBED_PATH),
+                    "embed",
+                    candidate_url,
+                    attempt_started,
+                )
             except httpx.HTTPStatusError as exc:
-                self._record_attempt_metric("warmup", candidate_url, "http_error", time.perf_counter() - attempt_started)
-                raise BackendUnavailableError(
-                    f"Model backend at {candidate_url} returned {exc.response.status_code}: {exc.response.text}"
-                ) from exc
+                self._record_attempt_metric("embed", candidate_url, "http_error", time.perf_counter() - attempt_started)
+                raise self._status_error(candidate_url, exc) from exc
             except httpx.RequestError as exc:
-                self._mark_url_failure(candidate_url)
+                self._mark_url_failure(candidate_url, exc)
                 request_failures.append((candidate_url, exc))
-                self._record_attempt_metric("warmup", candidate_url, "request_error", time.perf_counter() - attempt_started)
+                self._record_attempt_metric("embed", candidate_url, "request_error", time.perf_counter() - attempt_started)
+                continue
+
+            embedding = self._embedding_from(loads(resp.content))
+            if not embedding:
+                self._record_attempt_metric("embed", candidate_url, "empty", time.perf_counter() - attempt_started)
+                raise BackendUnavailableError(
+                    f"Model backend at {candidate_url} returned no embedding for model {self.embedding_model}."
+                )
+
+            self._mark_url_success(candidate_url)
+            self._record_attempt_metric("embed", candidate_url, "success", time.perf_counter() - attempt_started)
+            return embedding
 
         if request_failures:
             raise BackendUnavailableError(self._format_request_failures(request_failures)) from request_failures[-1][1]
 
         raise BackendUnavailableError(f"Failed to contact model backend at {self.base_url}")
 
-    async def generate(self, prompt: str, subsystem: Subsystem) -> tuple[str, str, BackendAttemptSummary]:
-        model_name = self.model_for_subsystem(subsystem)
+    async def generate_stream(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        messages: list[dict[str, str]] | None = None,
+        model_name: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream tokens from Ollama as they are produced.
+
+        Fallback to the next candidate URL only happens before the first token
+        is emitted; once text has reached the caller a broken stream is fatal.
+        Until then, connecting and each read are bounded by the remaining
+        deadline, like a non-streaming attempt.
+        """
+        model_name = model_name or self.model_for_subsystem(subsystem)
+        payload = self._generate_payload(prompt, subsystem, model_name, stream=True, messages=messages)
+        endpoint = self._generate_endpoint()
         request_failures: list[tuple[str, httpx.RequestError]] = []
+        status_failure: tuple[str, httpx.HTTPStatusError] | None = None
         attempt_summary = BackendAttemptSummary()
-        for attempt_index, candidate_url in enumerate(self._eligible_candidate_urls()):
+        self.retry_budget.record_request()
+        candidates = self._placement_order(self._eligible_candidate_urls(), model_name)
+        for attempt_index, candidate_url in enumerate(candidates):
+            self._check_deadline(candidate_url)
             attempt_summary.attempts += 1
             attempt_started = time.perf_counter()
+            emitted = False
             try:
-                async with httpx.AsyncClient(timeout=self._client_timeout()) as client:
-                    resp = await client.post(
+                client = self._client_for(candidate_url)
+                async with AsyncExitStack() as stack:
+                    await self._within_deadline(
+                        stack.enter_async_context(self._track_in_flight(candidate_url)),
+                        "generate_stream",
                         candidate_url,
-                        json={
-                            "model": model_name,
-                            "prompt": f"{SYSTEM_PROMPTS.get(subsystem, SYSTEM_PROMPTS[Subsystem.AEGIS])}\n\nUser request:\n{prompt}",
-                            "stream": False,
-                            "keep_alive": self.keep_alive,
-                        },
+                        attempt_started,
                     )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    text = (data.get("response") or "").strip()
-                    if not text:
-                        self._record_attempt_metric("generate", candidate_url, "empty", time.perf_counter() - attempt_started)
-                        raise BackendUnavailableError(
-                            f"Model backend at {candidate_url} returned an empty response for model {model_name}."
-                        )
-                    self._preferred_url = candidate_url
-                    self._mark_url_success(candidate_url)
-                    attempt_summary.fallback_hops = attempt_index
-                    self._record_attempt_metric("generate", candidate_url, "success", time.perf_counter() - attempt_started)
-                    return text, model_name, attempt_summary
+                    target = self._api_url(candidate_url, endpoint) if endpoint else candidate_url
+                    request = client.stream("POST", target, content=dumps(payload), headers=JSON_HEADERS)
+                    resp = await self._within_deadline(
+                        stack.enter_async_context(request), "generate_stream", candidate_url, attempt_started
+                    )
+                    if resp.status_code >= 400:
+                        await resp.aread()
+                    self._raise_for_status(candidate_url, resp)
+                    lines = resp.aiter_lines()
+                    while True:
+                        try:
+                            if emitted:
+                                line = await anext(lines)
+                            else:
+                                line = await self._within_deadline(
+                                    anext(lines), "generate_stream", candidate_url, attempt_started
+                                )
+                        except StopAsyncIteration:
+                            break
+                        data = self._parse_stream_line(line)
+                        if data is None:
+                            continue
+                        if data.get("error"):
+                            raise BackendUnavailableError(f"Model backend at {candidate_url} failed mid-stream: {data['error']}")
+                        token = self._response_text(data)
+                        if token:
+                            emitted = True
+                            yield StreamChunk(text=token, model_name=model_name)
+                        if self._stream_done(data):
+                            attempt_summary.prefill_ms = self._prefill_ms(data)
+                            self._observe_placement(candidate_url, model_name, data)
+                            break
+                if not emitted:
+                    self._record_attempt_metric("generate_stream", candidate_url, "empty", time.perf_counter() - attempt_started)
+                    raise BackendUnavailableError(
+                        f"Model backend at {candidate_url} returned an empty response for model {model_name}."
+                    )
+                self._preferred_url = candidate_url
+                self._mark_url_success(candidate_url)
+                self._observe_url_latency(candidate_url, time.perf_counter() - attempt_started)
+                attempt_summary.fallback_hops = attempt_index
+                self._record_attempt_metric("generate_stream", candidate_url, "success", time.perf_counter() - attempt_started)
+                yield StreamChunk(text="", model_name=model_name, done=True, attempt_summary=attempt_summary)
+                return
             except httpx.HTTPStatusError as exc:
-                self._record_attempt_metric("generate", candidate_url, "http_error", time.perf_counter() - attempt_started)
-                raise BackendUnavailableError(
-                    f"Model backend at {candidate_url} returned {exc.response.status_code}: {exc.response.text}"
-                ) from exc
+                # A status error always arrives before the first token, so failing over is still safe.
+                retrying = attempt_index + 1 < len(candidates) and self._may_retry(exc)
+                self._record_status_failure("generate_stream", candidate_url, retrying, attempt_started)
+                if not retrying:
+                    raise self._status_error(candidate_url, exc) from exc
+                status_failure = (candidate_url, exc)
+                attempt_summary.failed_attempts += 1
             except httpx.RequestError as exc:
-                self._mark_url_failure(candidate_url)
+                self._mark_url_failure(candidate_url, exc)
+                self._record_attempt_metric("generate_stream", candidate_url, "request_error", time.perf_counter() - attempt_started)
+                if emitted:
+                    raise BackendUnavailableError(f"Model backend at {candidate_url} dropped the stream: {exc}") from exc
                 request_failures.append((candidate_url, exc))
                 attempt_summary.failed_attempts += 1
-                self._record_attempt_metric("generate", candidate_url, "request_error", time.perf_counter() - attempt_started)
 
         if request_failures:
             raise BackendUnavailableError(self._format_request_failures(request_failures)) from request_failures[-1][1]
 
+        if status_failure is not None:
+            raise self._status_error(*status_failure) from status_failure[1]
+
         raise BackendUnavailableError(f"Failed to contact model backend at {self.base_url}")
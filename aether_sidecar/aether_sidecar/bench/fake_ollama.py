@@ -0,0 +1,172 @@
+"""Local stand-in for an Ollama server with configurable latency, token rate and error rate."""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """
+    Prefill latency model in seconds.
+
+    ``fixed`` always returns ``mean``; ``uniform`` spans ``mean ± spread``;
+    ``exponential`` has the given ``mean``; ``lognormal`` has median ``mean``
+    and shape ``spread`` (sigma), which gives the long tail real servers show.
+    """
+
+    kind: str = "fixed"
+    mean: float = 0.05
+    spread: float = 0.0
+
+    @classmethod
+    def parse(cls, raw: str) -> "LatencyDistribution":
+        """Parse ``kind[:mean[:spread]]``, e.g. ``lognormal:0.2:0.5``."""
+        kind, _, rest = raw.partition(":")
+        mean, _, spread = rest.partition(":")
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"latency distribution must be one of {', '.join(DISTRIBUTIONS)}")
+        return cls(kind=kind, mean=float(mean or 0.05), spread=float(spread or 0.0))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return max(0.0, rng.uniform(self.mean - self.spread, self.mean + self.spread))
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        if self.kind == "lognormal":
+            return rng.lognormvariate(0.0, self.spread) * self.mean if self.mean > 0 else 0.0
+        return self.mean
+
+
+@dataclass(frozen=True)
+class FakeOllamaProfile:
+    latency: LatencyDistribution = LatencyDistribution()
+    tokens: int = 32
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    model_name: str = "fake-model"
+    embedding_dimensions: int = 64
+    seed: int | None = None
+
+
+def create_fake_ollama_app(profile: FakeOllamaProfile | None = None) -> FastAPI:
+    """
+    Build an app serving the Ollama endpoints the sidecar uses.
+
+    ``/api/generate`` and ``/api/chat`` wait for a sampled prefill latency and
+    then emit ``profile.tokens`` tokens at ``tokens_per_second`` (instantly
+    when ``0``), streaming NDJSON when asked. ``error_rate`` of requests fail
+    with HTTP 500.
+    """
+    profile = profile or FakeOllamaProfile()
+    rng = random.Random(profile.seed)
+    app = FastAPI(title="Fake Ollama")
+
+    def token_delay() -> float:
+        return 1 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+
+    def final_fields(prefill: float, elapsed: float) -> dict:
+        return {
+            "done": True,
+            "prompt_eval_count": 64,
+            "prompt_eval_duration": int(prefill * 1_000_000_000),
+            "eval_count": profile.tokens,
+            "total_duration": int(elapsed * 1_000_000_000),
+        }
+
+    async def completion(request: Request, chat: bool):
+        started = time.perf_counter()
+        body = await request.json()
+        if rng.random() < profile.error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+
+        model = body.get("model") or profile.model_name
+        prefill = profile.latency.sample(rng)
+        await asyncio.sleep(prefill)
+
+        def piece(token: str) -> dict:
+            if chat:
+                return {"model": model, "message": {"role": "assistant", "content": token}, "done": False}
+            return {"model": model, "response": token, "done": False}
+
+        tokens = [f"tok{index} " for index in range(profile.tokens)]
+        if not body.get("stream", True):
+            await asyncio.sleep(token_delay() * len(tokens))
+            result = piece("".join(tokens).strip())
+            result.update(final_fields(prefill, time.perf_counter() - started))
+            return JSONResponse(result)
+
+        async def lines() -> AsyncIterator[str]:
+            for token in tokens:
+                await asyncio.sleep(token_delay())
+                yield json.dumps(piece(token)) + "\n"
+            final = piece("")
+            final.update(final_fields(prefill, time.perf_counter() - started))
+            yield json.dumps(final) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        return await completion(request, chat=False)
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        return await completion(request, chat=True)
+
+    @app.post("/api/embed")
+    async def embed(request: Request):
+        body = await request.json()
+        text = str(body.get("input") or "")
+        vector = [0.0] * profile.embedding_dimensions
+        for word in text.lower().split():
+            vector[sum(word.encode("utf-8")) % profile.embedding_dimensions] += 1.0
+        return {"model": body.get("model"), "embeddings": [vector]}
+
+    @app.get("/api/ps")
+    async def ps():
+        return {"models": [{"name": profile.model_name, "model": profile.model_name}]}
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": profile.model_name, "model": profile.model_name}]}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server for sidecar load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", default="fixed:0.05", help="kind[:mean[:spread]] with kind in " + ", ".join(DISTRIBUTIONS))
+    parser.add_argument("--tokens", type=int, default=32, help="tokens generated per answer")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="decode rate; 0 emits tokens instantly")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of generations failing with HTTP 500")
+    parser.add_argument("--model", default="fake-model")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    profile = FakeOllamaProfile(
+        latency=LatencyDistribution.parse(args.latency),
+        tokens=args.tokens,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        model_name=args.model,
+        seed=args.seed,
+    )
+    uvicorn.run(create_fake_ollama_app(profile), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
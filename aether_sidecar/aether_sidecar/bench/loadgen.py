@@ -0,0 +1,169 @@
+"""Drive ``POST /generate`` at a fixed concurrency or request rate and report latency percentiles."""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+DEFAULT_MESSAGES = (
+    "is it safe to mine at night",
+    "where should I build my base",
+    "how do I power my reactor",
+    "tell me the lore of the old archive",
+    "a rift anomaly opened near spawn",
+)
+
+
+@dataclass
+class RequestSample:
+    total_ms: float
+    backend_ms: float | None
+    status_code: int
+
+
+@dataclass
+class LoadReport:
+    duration_seconds: float
+    samples: list[RequestSample] = field(default_factory=list)
+    transport_errors: int = 0
+
+    def summary(self) -> dict:
+        ok = [sample for sample in self.samples if sample.status_code == 200]
+        totals = [sample.total_ms for sample in ok]
+        backends = [sample.backend_ms for sample in ok if sample.backend_ms is not None]
+        sidecar = [sample.total_ms - sample.backend_ms for sample in ok if sample.backend_ms is not None]
+        status_counts: dict[str, int] = {}
+        for sample in self.samples:
+            status_counts[str(sample.status_code)] = status_counts.get(str(sample.status_code), 0) + 1
+        return {
+            "requests": len(self.samples) + self.transport_errors,
+            "succeeded": len(ok),
+            "transport_errors": self.transport_errors,
+            "status_codes": status_counts,
+            "throughput_rps": round(len(ok) / self.duration_seconds, 2) if self.duration_seconds > 0 else 0.0,
+            "total_ms": percentiles(totals),
+            "backend_ms": percentiles(backends),
+            "sidecar_ms": percentiles(sidecar),
+        }
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    """Nearest-rank p50/p95/p99 of ``values`` (``None`` when empty)."""
+    ordered = sorted(values)
+
+    def rank(p: float) -> float | None:
+        if not ordered:
+            return None
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 2)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99)}
+
+
+def parse_server_timing(header: str | None, metric: str = "backend") -> float | None:
+    """Return ``dur`` (milliseconds) of ``metric`` from a ``Server-Timing`` header."""
+    for entry in (header or "").split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        if name != metric:
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key == "dur":
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+    return None
+
+
+class LoadGenerator:
+    """
+    Send ``/generate`` requests either closed-loop (``concurrency`` workers back to back)
+    or open-loop (``rps`` arrivals per second regardless of completions).
+    """
+
+    def __init__(self, client: httpx.AsyncClient, messages: tuple[str, ...] = DEFAULT_MESSAGES, subsystem: str = "Auto"):
+        self.client = client
+        self.messages = messages
+        self.subsystem = subsystem
+        self._sent = 0
+
+    async def _one(self, report: LoadReport) -> None:
+        index = self._sent
+        self._sent += 1
+        payload = {
+            "message": self.messages[index % len(self.messages)],
+            "subsystem": self.subsystem,
+            "session_id": f"loadgen-{index}",
+        }
+        started = time.perf_counter()
+        try:
+            resp = await self.client.post("/generate", json=payload)
+        except httpx.HTTPError:
+            report.transport_errors += 1
+            return
+        report.samples.append(
+            RequestSample(
+                total_ms=(time.perf_counter() - started) * 1000,
+                backend_ms=parse_server_timing(resp.headers.get("server-timing")),
+                status_code=resp.status_code,
+            )
+        )
+
+    async def run_concurrency(self, concurrency: int, duration_seconds: float) -> LoadReport:
+        report = LoadReport(duration_seconds=duration_seconds)
+        deadline = time.perf_counter() + duration_seconds
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                await self._one(report)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        report.duration_seconds = time.perf_counter() - started
+        return report
+
+    async def run_rate(self, rps: float, duration_seconds: float) -> LoadReport:
+        report = LoadReport(duration_seconds=duration_seconds)
+        interval = 1 / rps
+        tasks: list[asyncio.Task] = []
+        started = time.perf_counter()
+        next_send = started
+        while next_send < started + duration_seconds:
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+            tasks.append(asyncio.create_task(self._one(report)))
+            next_send += interval
+        await asyncio.gather(*tasks)
+        report.duration_seconds = time.perf_counter() - started
+        return report
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=max(args.concurrency, int(args.rps or 0) * 4, 10))
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        generator = LoadGenerator(client, subsystem=args.subsystem)
+        if args.rps:
+            report = await generator.run_rate(args.rps, args.duration)
+        else:
+            report = await generator.run_concurrency(args.concurrency, args.duration)
+    return report.summary()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the A.E.T.H.E.R sidecar /generate endpoint")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="sidecar base URL")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed-loop workers (ignored with --rps)")
+    parser.add_argument("--rps", type=float, default=0.0, help="open-loop arrival rate in requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to generate load")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--subsystem", default="Auto")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Microbenchmarks for sidecar hot paths with JSON baselines and regression checks."""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..backends import OllamaBackend
+from ..classifier import SubsystemClassifier
+from ..memory import SessionMemory
+from ..models import GenerateResponse, Subsystem
+from ..prompting import build_prompt
+from ..router import (
+    KEYWORDS,
+    KeywordMatcher,
+    analyze_message,
+    detect_subsystem_alerts,
+    is_minecraft_related,
+    pick_subsystem,
+)
+from ..safety import evaluate_message
+from ..serialization import FastJSONResponse, dumps, loads
+
+SHORT_MESSAGE = "a rift anomaly opened near my base, is it safe?"
+LONG_MESSAGE = ("the old archive records a storm over the northern biome and the generator is failing " * 10)[:800]
+NO_MATCH_MESSAGE = ("zq " * 400)[:800]
+OVERSIZED_MESSAGE = "x" * 20_000
+LARGE_CONTEXT = {f"key_{index}": f"value {index} " * 4 for index in range(200)}
+SESSION_COUNT = 5_000
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A named hot-path call; ``setup`` builds state once and returns the zero-argument callable to time."""
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+
+
+def _populated_memory() -> SessionMemory:
+    memory = SessionMemory(turn_limit=6)
+    for index in range(SESSION_COUNT):
+        for turn in range(12):
+            memory.append(f"session-{index}", "player" if turn % 2 == 0 else "assistant", LONG_MESSAGE[:120])
+    return memory
+
+
+def _memory_append() -> Callable[[], object]:
+    memory = _populated_memory()
+    return lambda: memory.append("session-2500", "player", SHORT_MESSAGE)
+
+
+def _memory_history() -> Callable[[], object]:
+    memory = _populated_memory()
+    return lambda: memory.history("session-2500")
+
+
+def _large_vocabulary_analyze() -> Callable[[], object]:
+    keywords = {
+        subsystem: [*words, *(f"{subsystem.value.lower()}term{index}" for index in range(1_000))]
+        for subsystem, words in KEYWORDS.items()
+    }
+    matcher = KeywordMatcher(keywords, [f"craftterm{index}" for index in range(2_000)])
+    return lambda: matcher.analyze(LONG_MESSAGE)
+
+
+def _trained_classifier() -> SubsystemClassifier:
+    texts = [f"{word} {LONG_MESSAGE[:80]}" for words in KEYWORDS.values() for word in words]
+    labels = [subsystem for subsystem, words in KEYWORDS.items() for _ in words]
+    return SubsystemClassifier.train(texts, labels)
+
+
+def _classify(message: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        classifier = _trained_classifier()
+        return lambda: classifier.classify(message)
+
+    return setup
+
+
+def _classify_batch() -> Callable[[], object]:
+    classifier = _trained_classifier()
+    batch = [SHORT_MESSAGE] * 64
+    return lambda: classifier.predict(batch)
+
+
+def _candidate_urls() -> Callable[[], object]:
+    backend = OllamaBackend(
+        "http://gpu-a:11434/api/generate",
+        "llama3.1:8b",
+        fallback_urls=[f"http://gpu-{index}:11434/api/generate" for index in range(8)],
+    )
+    return backend.candidate_urls
+
+
+def _build_prompt(message: str, context: dict, token_budget: int) -> Callable[[], Callable[[], object]]:
+    history = [{"role": "player" if turn % 2 == 0 else "assistant", "text": LONG_MESSAGE[:200]} for turn in range(6)]
+    lessons = [f"lesson {index}: prefer copper over iron" for index in range(16)]
+
+    def setup() -> Callable[[], object]:
+        alerts = detect_subsystem_alerts(message)
+        return lambda: build_prompt(
+            session_id="bench",
+            message=message,
+            subsystem=Subsystem.ECLIPSE,
+            alerts=alerts,
+            learned_context=lessons,
+            player_context=context,
+            world_context=context,
+            history=history,
+            general_conversation=False,
+            token_budget=token_budget,
+        )
+
+    return setup
+
+
+def _sample_response() -> GenerateResponse:
+    return GenerateResponse(
+        text=LONG_MESSAGE,
+        subsystem_used=Subsystem.ECLIPSE,
+        model_used="llama3.1:8b",
+        subsystem_alerts={"Eclipse": ["rift", "anomaly"], "Helios": ["generator"]},
+        safety_flags=[],
+        learned_context=[f"lesson {index}" for index in range(16)],
+        latency_ms=120,
+    )
+
+
+def _response_validated() -> Callable[[], object]:
+    """The pre-fast-JSON path: FastAPI re-validates the returned model, then encodes it with the stdlib."""
+    result = _sample_response()
+    return lambda: json.dumps(
+        GenerateResponse.model_validate(result.model_dump()).model_dump(mode="json"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def _response_direct() -> Callable[[], object]:
+    result = _sample_response()
+    return lambda: FastJSONResponse(result.model_dump()).body
+
+
+def _encode_payload(encode: Callable[[dict], object]) -> Callable[[], Callable[[], object]]:
+    payload = {"model": "llama3.1:8b", "prompt": LONG_MESSAGE * 4, "stream": False, "keep_alive": "15m", "options": {}}
+    return lambda: lambda: encode(payload)
+
+
+def _decode_reply(decode: Callable[[bytes], object]) -> Callable[[], Callable[[], object]]:
+    reply = {"model": "llama3.1:8b", "response": LONG_MESSAGE, "done": True, "context": list(range(2048))}
+    body = json.dumps(reply).encode("utf-8")
+    return lambda: lambda: decode(body)
+
+
+BENCHMARKS = [
+    Benchmark("router.detect_subsystem_alerts/short", lambda: lambda: detect_subsystem_alerts(SHORT_MESSAGE)),
+    Benchmark("router.detect_subsystem_alerts/long", lambda: lambda: detect_subsystem_alerts(LONG_MESSAGE)),
+    Benchmark("router.detect_subsystem_alerts/oversized", lambda: lambda: detect_subsystem_alerts(OVERSIZED_MESSAGE)),
+    Benchmark("router.pick_subsystem/long", lambda: lambda: pick_subsystem(LONG_MESSAGE)),
+    Benchmark("router.is_minecraft_related/short", lambda: lambda: is_minecraft_related(SHORT_MESSAGE)),
+    Benchmark("router.is_minecraft_related/no_match", lambda: lambda: is_minecraft_related(NO_MATCH_MESSAGE)),
+    Benchmark("router.analyze_message/long", lambda: lambda: analyze_message(LONG_MESSAGE)),
+    Benchmark("router.analyze_message/large_vocabulary", _large_vocabulary_analyze),
+    Benchmark("classifier.classify/short", _classify(SHORT_MESSAGE)),
+    Benchmark("classifier.classify/long", _classify(LONG_MESSAGE)),
+    Benchmark("classifier.predict/batch_64", _classify_batch),
+    Benchmark("safety.evaluate_message/long", lambda: lambda: evaluate_message(LONG_MESSAGE)),
+    Benchmark("safety.evaluate_message/oversized", lambda: lambda: evaluate_message(OVERSIZED_MESSAGE)),
+    Benchmark("memory.append/5k_sessions", _memory_append),
+    Benchmark("memory.history/5k_sessions", _memory_history),
+    Benchmark("backend.candidate_urls/remote_fallbacks", _candidate_urls),
+    Benchmark("prompting.build_prompt/short", _build_prompt(SHORT_MESSAGE, {"health": 20}, 0)),
+    Benchmark("prompting.build_prompt/large_context", _build_prompt(LONG_MESSAGE, LARGE_CONTEXT, 0)),
+    Benchmark("prompting.build_prompt/large_context_budget", _build_prompt(LONG_MESSAGE, LARGE_CONTEXT, 1024)),
+    Benchmark("serialization.generate_response/validated_stdlib", _response_validated),
+    Benchmark("serialization.generate_response/direct", _response_direct),
+    Benchmark("serialization.backend_payload/stdlib", _encode_payload(lambda payload: json.dumps(payload).encode("utf-8"))),
+    Benchmark("serialization.backend_payload/dumps", _encode_payload(dumps)),
+    Benchmark("serialization.backend_reply/stdlib", _decode_reply(json.loads)),
+    Benchmark("serialization.backend_reply/loads", _decode_reply(loads)),
+]
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int = 5, min_time: float = 0.2) -> dict[str, float]:
+    """
+    Time ``benchmark`` and return per-call ``median_ns`` and ``min_ns`` plus the calibrated ``loops``.
+
+    The loop count is calibrated so one repetition takes at least ``min_time``
+    seconds; the median over ``repeat`` repetitions is what baselines compare.
+    """
+    call = benchmark.setup()
+    timer = timeit.Timer(call)
+    loops = 1
+    while timer.timeit(loops) < min_time:
+        loops *= 2
+    per_call = [seconds / loops * 1e9 for seconds in timer.repeat(repeat=max(1, repeat), number=loops)]
+    return {"median_ns": round(statistics.median(per_call), 1), "min_ns": round(min(per_call), 1), "loops": loops}
+
+
+def run_suite(pattern: str = "", repeat: int = 5, min_time: float = 0.2) -> dict:
+    results = {
+        benchmark.name: run_benchmark(benchmark, repeat, min_time)
+        for benchmark in BENCHMARKS
+        if pattern in benchmark.name
+    }
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """
+    Return benchmarks whose median grew by more than ``threshold`` (``0.2`` = 20%) over the baseline.
+
+    Benchmarks missing from either run are ignored so the suite can grow
+    without invalidating stored baselines.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or previous["median_ns"] <= 0:
+            continue
+        ratio = result["median_ns"] / previous["median_ns"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline_ns": previous["median_ns"],
+                    "current_ns": result["median_ns"],
+                    "ratio": round(ratio, 3),
+                }
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run A.E.T.H.E.R sidecar hot-path microbenchmarks")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per repetition")
+    parser.add_argument("--save", type=Path, help="write results to this JSON baseline file")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.filter, args.repeat, args.min_time)
+    for name, result in current["results"].items():
+        print(f"{name:55} {result['median_ns']:>14,.1f} ns")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if not args.baseline:
+        return 0
+
+    regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['name']}: {regression['baseline_ns']:,.1f} ns -> "
+            f"{regression['current_ns']:,.1f} ns (x{regression['ratio']})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .models import Subsystem
+from .observability import RESPONSE_CACHE_BYTES, RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_EVICTIONS, RESPONSE_CACHE_LOOKUPS
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    model_used: str
+    expires_at: float
+    size_bytes: int
+
+
+class ResponseCache:
+    """
+    LRU cache of generated answers bounded by entry count and total bytes.
+
+    Entries expire after a per-subsystem TTL (falling back to
+    ``default_ttl_seconds``); a TTL of zero disables caching for that subsystem.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 8 * 1024 * 1024,
+        default_ttl_seconds: float = 300.0,
+        subsystem_ttls: dict[Subsystem, float] | None = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.default_ttl_seconds = default_ttl_seconds
+        self.subsystem_ttls = subsystem_ttls or {}
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def ttl_for(self, subsystem: Subsystem) -> float:
+        return self.subsystem_ttls.get(subsystem, self.default_ttl_seconds)
+
+    def _publish(self) -> None:
+        RESPONSE_CACHE_ENTRIES.set(len(self._entries))
+        RESPONSE_CACHE_BYTES.set(self._bytes)
+
+    def _remove(self, key: str, reason: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size_bytes
+        RESPONSE_CACHE_EVICTIONS.labels(reason).inc()
+
+    def get(self, key: str, subsystem: Subsystem) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key, "expired")
+            self._publish()
+            entry = None
+
+        if entry is None:
+            RESPONSE_CACHE_LOOKUPS.labels(subsystem.value, "miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        RESPONSE_CACHE_LOOKUPS.labels(subsystem.value, "hit").inc()
+        return entry
+
+    def put(self, key: str, subsystem: Subsystem, text: str, model_used: str) -> None:
+        ttl = self.ttl_for(subsystem)
+        size_bytes = len(text.encode("utf-8")) + len(key) + len(model_used)
+        if ttl <= 0 or size_bytes > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key, "replaced")
+
+        self._entries[key] = CachedResponse(
+            text=text, model_used=model_used, expires_at=time.monotonic() + ttl, size_bytes=size_bytes
+        )
+        self._bytes += size_bytes
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)), "capacity")
+        self._publish()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._publish()
@@ -0,0 +1,116 @@
+import re
+import time
+from collections.abc import Awaitable, Callable
+
+from .backends import BackendAttemptSummary, BackendDeadlineExceededError, BackendUnavailableError
+from .models import Subsystem
+from .observability import CASCADE_TIER_LATENCY_SECONDS, CASCADE_TIER_REQUESTS
+
+UNSURE_PATTERN = re.compile(
+    r"\b(i'?m not sure|i am not sure|i don'?t know|i do not know|cannot answer|can'?t answer|no idea|unsure)\b",
+    re.IGNORECASE,
+)
+COMPLEXITY_HINTS = {"low": 0.0, "high": 1.0}
+
+TierCall = Callable[[str], Awaitable[tuple[str, str, BackendAttemptSummary]]]
+
+
+def estimate_complexity(
+    message: str, alerts: dict[Subsystem, list[str]], history_depth: int, hint: str | None = None
+) -> float:
+    """
+    Score a request from 0 (trivial) to 1 (hard) without calling a model.
+
+    Long messages, many keyword alerts and deep conversations score higher. A
+    client ``hint`` of ``low`` or ``high`` overrides the estimate.
+    """
+    if hint in COMPLEXITY_HINTS:
+        return COMPLEXITY_HINTS[hint]
+
+    alert_count = sum(len(words) for words in alerts.values())
+    score = (
+        0.4 * min(len(message) / 400, 1.0)
+        + 0.3 * min(alert_count / 3, 1.0)
+        + 0.3 * min(history_depth / 6, 1.0)
+    )
+    return round(min(score, 1.0), 3)
+
+
+def answer_confidence(text: str) -> float:
+    """Cheap 0-1 confidence for an answer: hedging phrases and very short replies score low."""
+    stripped = text.strip()
+    if not stripped:
+        return 0.0
+    if UNSURE_PATTERN.search(stripped):
+        return 0.2
+    if len(stripped) < 12:
+        return 0.5
+    return 1.0
+
+
+class ModelCascade:
+    """
+    Try progressively larger models until one gives a confident answer.
+
+    Each subsystem has an ordered list of models, smallest first. The request's
+    complexity score picks the starting tier. The cascade escalates to the next
+    tier when a tier fails or its answer scores below ``min_confidence``. The
+    last tier's answer is always accepted. An expired deadline stops the
+    cascade, since no later tier could start either.
+    """
+
+    def __init__(
+        self,
+        default_tiers: list[str],
+        subsystem_tiers: dict[Subsystem, list[str]] | None = None,
+        min_confidence: float = 0.5,
+    ):
+        self.default_tiers = default_tiers
+        self.subsystem_tiers = subsystem_tiers or {}
+        self.min_confidence = min_confidence
+
+    def tiers_for(self, subsystem: Subsystem) -> list[str]:
+        return self.subsystem_tiers.get(subsystem) or self.default_tiers
+
+    def starting_tier(self, subsystem: Subsystem, complexity: float) -> int:
+        tiers = self.tiers_for(subsystem)
+        return min(int(complexity * len(tiers)), len(tiers) - 1)
+
+    def starting_model(self, subsystem: Subsystem, complexity: float) -> str:
+        return self.tiers_for(subsystem)[self.starting_tier(subsystem, complexity)]
+
+    async def generate(
+        self, call: TierCall, subsystem: Subsystem, complexity: float
+    ) -> tuple[str, str, BackendAttemptSummary]:
+        """Run ``call(model_name)`` tier by tier and return the accepted answer with attempts summed over tiers."""
+        tiers = self.tiers_for(subsystem)
+        total = BackendAttemptSummary()
+        last_index = len(tiers) - 1
+        for index in range(self.starting_tier(subsystem, complexity), len(tiers)):
+            model_name = tiers[index]
+            started = time.perf_counter()
+            try:
+                text, model_used, summary = await call(model_name)
+            except BackendDeadlineExceededError:
+                CASCADE_TIER_REQUESTS.labels(subsystem.value, model_name, "deadline").inc()
+                raise
+            except BackendUnavailableError:
+                CASCADE_TIER_REQUESTS.labels(subsystem.value, model_name, "failed").inc()
+                if index == last_index:
+                    raise
+                continue
+            finally:
+                CASCADE_TIER_LATENCY_SECONDS.labels(model_name).observe(time.perf_counter() - started)
+
+            total.attempts += summary.attempts
+            total.failed_attempts += summary.failed_attempts
+            total.fallback_hops = summary.fallback_hops
+            total.prefill_ms = summary.prefill_ms
+            if index < last_index and answer_confidence(text) < self.min_confidence:
+                CASCADE_TIER_REQUESTS.labels(subsystem.value, model_name, "escalated").inc()
+                continue
+
+            CASCADE_TIER_REQUESTS.labels(subsystem.value, model_name, "accepted").inc()
+            return text, model_used, total
+
+        raise BackendUnavailableError(f"No cascade tier produced an answer for {subsystem.value}")
@@ -0,0 +1,126 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+from .observability import BACKEND_CIRCUIT_STATE
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+_STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    window_size: int = 20
+    min_requests: int = 5
+    failure_rate_threshold: float = 0.5
+    open_seconds: float = 30.0
+
+
+class CircuitBreaker:
+    """
+    Per-URL circuit breaker over a sliding window of recent outcomes.
+
+    The breaker opens once at least ``min_requests`` outcomes are recorded and
+    the failure rate reaches the threshold. After ``open_seconds`` it moves to
+    half-open and admits a single trial request, whose outcome either closes
+    or re-opens it. A successful health probe moves an open breaker to
+    half-open early via :meth:`probe_succeeded`. :meth:`trip` and
+    :meth:`reset` force either transition immediately.
+    """
+
+    def __init__(self, name: str, policy: BreakerPolicy | None = None):
+        self.name = name
+        self.policy = policy or BreakerPolicy()
+        self._outcomes: deque[bool] = deque(maxlen=max(1, self.policy.window_size))
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._trial_started_at: float | None = None
+        self._publish()
+
+    def _publish(self) -> None:
+        BACKEND_CIRCUIT_STATE.labels(self.name).set(_STATE_GAUGE_VALUES[self._state])
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if state != CircuitState.HALF_OPEN:
+            self._outcomes.clear()
+        self._trial_started_at = None
+        self._state = state
+        self._publish()
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.policy.open_seconds:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _trial_pending(self) -> bool:
+        return self._trial_started_at is not None and time.monotonic() - self._trial_started_at < self.policy.open_seconds
+
+    def allows_requests(self) -> bool:
+        """
+        Return whether a request may be sent now, without claiming anything.
+
+        Half-open allows requests only until :meth:`record_attempt` claims its
+        single trial, so listing candidates never uses up the trial.
+        """
+        state = self.state
+        if state == CircuitState.HALF_OPEN:
+            return not self._trial_pending()
+        return state == CircuitState.CLOSED
+
+    def record_attempt(self) -> None:
+        """
+        Note that a request is being sent; while half-open this claims the trial.
+
+        A trial that never reports back is abandoned after ``open_seconds`` so
+        another can be admitted.
+        """
+        if self.state == CircuitState.HALF_OPEN and not self._trial_pending():
+            self._trial_started_at = time.monotonic()
+
+    def probe_succeeded(self) -> None:
+        """Move an open breaker to half-open, so the next request decides whether it closes."""
+        if self.state == CircuitState.OPEN:
+            self._transition(CircuitState.HALF_OPEN)
+
+    def record_success(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+            return
+
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        state = self.state
+        if state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+
+        if state == CircuitState.OPEN:
+            return
+
+        self._outcomes.append(False)
+        if len(self._outcomes) >= self.policy.min_requests and self.failure_rate() >= self.policy.failure_rate_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def trip(self) -> None:
+        if self._state != CircuitState.OPEN:
+            self._transition(CircuitState.OPEN)
+
+    def reset(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
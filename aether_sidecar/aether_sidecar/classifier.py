@@ -0,0 +1,130 @@
+import re
+import zlib
+from collections.abc import Sequence
+from itertools import chain
+from pathlib import Path
+
+from .models import Subsystem
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    np = None
+
+DEFAULT_DIMENSIONS = 1 << 16
+ARTIFACT_VERSION = 1
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def hashed_features(text: str, dimensions: int = DEFAULT_DIMENSIONS) -> list[int]:
+    """
+    Return the distinct hashed feature indices for ``text``.
+
+    Features are lowercased words, word bigrams and five-letter word stems,
+    hashed with CRC32 so indices are stable across processes and machines.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    features = [f"w:{token}" for token in tokens]
+    features.extend(f"p:{token[:5]}" for token in tokens if len(token) > 5)
+    features.extend(f"b:{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return sorted({zlib.crc32(feature.encode("utf-8")) % dimensions for feature in features})
+
+
+class SubsystemClassifier:
+    """
+    Naive Bayes subsystem classifier over hashed word n-grams, trained offline.
+
+    Each message counts a feature at most once (binarized multinomial NB), which
+    suits short player messages. Log probabilities are stored feature-major so
+    scoring a batch is one gather plus a scatter-add per message row.
+    """
+
+    def __init__(self, labels: Sequence[Subsystem], log_priors, feature_log_probs):
+        if np is None:
+            raise RuntimeError("The subsystem classifier requires numpy. Install aether-sidecar[semantic].")
+
+        self.labels = list(labels)
+        self.log_priors = np.asarray(log_priors, dtype=np.float32)
+        self.feature_log_probs = np.ascontiguousarray(feature_log_probs, dtype=np.float32)
+        if self.feature_log_probs.shape[1:] != (len(self.labels),) or self.log_priors.shape != (len(self.labels),):
+            raise ValueError("Classifier weights do not match its label count")
+
+    @property
+    def dimensions(self) -> int:
+        return self.feature_log_probs.shape[0]
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[Subsystem],
+        dimensions: int = DEFAULT_DIMENSIONS,
+        alpha: float = 1.0,
+    ) -> "SubsystemClassifier":
+        if np is None:
+            raise RuntimeError("The subsystem classifier requires numpy. Install aether-sidecar[semantic].")
+        if not texts or len(texts) != len(labels):
+            raise ValueError("Training needs one label per text and at least one example")
+
+        classes = [subsystem for subsystem in Subsystem if subsystem in set(labels)]
+        column_for = {subsystem: column for column, subsystem in enumerate(classes)}
+        counts = np.zeros((dimensions, len(classes)), dtype=np.float64)
+        documents = np.zeros(len(classes), dtype=np.float64)
+        for text, label in zip(texts, labels):
+            column = column_for[label]
+            counts[hashed_features(text, dimensions), column] += 1.0
+            documents[column] += 1.0
+
+        smoothed = counts + alpha
+        return cls(classes, np.log(documents / documents.sum()), np.log(smoothed / smoothed.sum(axis=0)))
+
+    def predict_proba(self, texts: Sequence[str]):
+        """Return an ``(len(texts), len(labels))`` array of class probabilities."""
+        features = [hashed_features(text, self.dimensions) for text in texts]
+        lengths = [len(indices) for indices in features]
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        columns = np.fromiter(chain.from_iterable(features), dtype=np.int64, count=sum(lengths))
+
+        scores = np.tile(self.log_priors.astype(np.float64), (len(texts), 1))
+        np.add.at(scores, rows, self.feature_log_probs[columns])
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: Sequence[str]) -> list[tuple[Subsystem, float]]:
+        """Return the most likely subsystem and its probability for each text."""
+        if not texts:
+            return []
+
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[column], float(probabilities[row, column])) for row, column in enumerate(best)]
+
+    def classify(self, text: str) -> tuple[Subsystem, float]:
+        return self.predict([text])[0]
+
+    def save(self, path: str | Path) -> None:
+        """Write a compressed ``.npz`` artifact; the path is used exactly as given."""
+        with Path(path).open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                version=np.array(ARTIFACT_VERSION),
+                labels=np.array([label.value for label in self.labels]),
+                log_priors=self.log_priors,
+                feature_log_probs=self.feature_log_probs,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SubsystemClassifier":
+        if np is None:
+            raise RuntimeError("The subsystem classifier requires numpy. Install aether-sidecar[semantic].")
+
+        with np.load(Path(path), allow_pickle=False) as artifact:
+            version = int(artifact["version"])
+            if version != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported subsystem classifier artifact version {version} in {path}")
+            return cls(
+                [Subsystem(label) for label in artifact["labels"].tolist()],
+                artifact["log_priors"],
+                artifact["feature_log_probs"],
+            )
@@ -0,0 +1,63 @@
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from .serialization import dumps
+
+T = TypeVar("T")
+
+
+def normalize_message(message: str) -> str:
+    return " ".join(message.lower().split())
+
+
+def request_fingerprint(**parts: Any) -> str:
+    """Return a stable digest of ``parts`` (dict keys sorted, non-JSON values stringified)."""
+    return hashlib.sha256(dumps(parts, sort_keys=True, default=str)).hexdigest()
+
+
+@dataclass
+class _Flight(Generic[T]):
+    task: asyncio.Future[T]
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    The first caller for a key becomes the leader and starts the call; callers
+    arriving before it finishes await the same result. A waiter that is
+    cancelled does not cancel the shared call unless it was the last waiter.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight[T]] = {}
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: str, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(result, is_leader)`` for the call identified by ``key``."""
+        flight = self._flights.get(key)
+        is_leader = flight is None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, flight=flight: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), is_leader
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
@@ -19,17 +19,88 @@ class Settings(BaseSettings):
     model_auto_ram_gb_mid: float = 12.0
     request_timeout_seconds: float = 20.0
     max_message_chars: int = 800
+    prompt_token_budget: int = 3072
+    prompt_tokenizer: str = "heuristic"
+    prompt_context_max_keys: int = 64
     memory_turn_limit: int = 6
     learning_lesson_limit: int = 16
     learning_log_path: str | None = None
     safety_enabled: bool = True
+    router_vocabulary_path: str | None = None
+    router_classifier_path: str | None = None
+    router_classifier_min_confidence: float = 0.6
+    route_batch_max_messages: int = 10_000
     ollama_url: str = "http://127.0.0.1:11434/api/generate"
     ollama_fallback_urls: str = ""
     ollama_keep_alive: str = "15m"
+    ollama_pool_max_connections: int = 20
+    ollama_pool_max_keepalive_connections: int = 10
+    ollama_pool_keepalive_expiry_seconds: float = 60.0
+    ollama_candidate_cache_ttl_seconds: float = 60.0
+    ollama_breaker_window_size: int = 20
+    ollama_breaker_min_requests: int = 5
+    ollama_breaker_failure_rate: float = 0.5
+    ollama_breaker_open_seconds: float = 30.0
+    ollama_probe_interval_seconds: float = 10.0
+    ollama_hedge_enabled: bool = False
+    ollama_hedge_delay_seconds: float = 0.0
+    ollama_retry_statuses: str = "408,425,429,500,502,503,504"
+    ollama_retry_max_retries: int = 2
+    ollama_retry_base_delay_seconds: float = 0.25
+    ollama_retry_max_delay_seconds: float = 2.0
+    ollama_retry_budget_ratio: float = 0.2
+    ollama_routing_mode: str = "failover"
+    ollama_routing_weights: str = ""
+    ollama_api_mode: str = "generate"
+    openai_url: str = "http://127.0.0.1:8080/v1/chat/completions"
+    openai_fallback_urls: str = ""
+    openai_api_key: str | None = None
+    openai_pool_max_connections: int = 20
+    openai_pool_max_keepalive_connections: int = 10
+    openai_pool_keepalive_expiry_seconds: float = 60.0
+    openai_candidate_cache_ttl_seconds: float = 60.0
+    openai_breaker_window_size: int = 20
+    openai_breaker_min_requests: int = 5
+    openai_breaker_failure_rate: float = 0.5
+    openai_breaker_open_seconds: float = 30.0
+    openai_probe_interval_seconds: float = 10.0
+    openai_hedge_enabled: bool = False
+    openai_hedge_delay_seconds: float = 0.0
+    openai_retry_statuses: str = "408,425,429,500,502,503,504"
+    openai_retry_max_retries: int = 2
+    openai_retry_base_delay_seconds: float = 0.25
+    openai_retry_max_delay_seconds: float = 2.0
+    openai_retry_budget_ratio: float = 0.2
+    openai_routing_mode: str = "failover"
+    openai_routing_weights: str = ""
+    echo_delay_seconds: float = 0.0
     app_version: str = Field(default="0.1.0")
     activation_hook_enabled: bool = False
     activation_hook_token: str | None = None
     subsystem_models: str = ""
+    model_cascade_enabled: bool = False
+    model_cascade: str = ""
+    model_cascade_subsystems: str = ""
+    model_cascade_min_confidence: float = 0.5
+    generate_coalesce_enabled: bool = False
+    generate_coalesce_exclude_history: bool = True
+    response_cache_enabled: bool = False
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 8 * 1024 * 1024
+    response_cache_ttl_seconds: float = 300.0
+    response_cache_subsystem_ttls: str = ""
+    response_cache_context_fields: str = ""
+    semantic_cache_enabled: bool = False
+    semantic_cache_embedding_model: str = "nomic-embed-text"
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_capacity: int = 512
+    semantic_cache_max_entries: int = 8192
+    admission_enabled: bool = False
+    admission_max_in_flight_per_url: int = 4
+    admission_max_queue: int = 32
+    admission_queue_timeout_seconds: float = 10.0
+    json_library: str = "auto"
+    generate_deadline_seconds: float = 60.0
     dev_playground_enabled: bool = False
     dev_playground_token: str | None = None
 
@@ -61,6 +132,77 @@ def parse_subsystem_models(raw: str) -> dict[Subsystem, str]:
     return mapping
 
 
+def parse_model_cascade(raw: str) -> list[str]:
+    """Parse a ``small|medium|large`` model list, smallest first."""
+    models: list[str] = []
+    for token in raw.split("|"):
+        model_name = token.strip()
+        if model_name and model_name not in models:
+            models.append(model_name)
+    return models
+
+
+def parse_subsystem_cascades(raw: str) -> dict[Subsystem, list[str]]:
+    mapping: dict[Subsystem, list[str]] = {}
+    if not raw.strip():
+        return mapping
+
+    by_name = {subsystem.value.lower(): subsystem for subsystem in Subsystem if subsystem != Subsystem.AUTO}
+    for token in raw.split(","):
+        entry = token.strip()
+        if not entry or ":" not in entry:
+            continue
+
+        subsystem_key, models = entry.split(":", 1)
+        subsystem = by_name.get(subsystem_key.strip().lower())
+        cascade = parse_model_cascade(models)
+        if subsystem and cascade:
+            mapping[subsystem] = cascade
+
+    return mapping
+
+
+def parse_subsystem_ttls(raw: str) -> dict[Subsystem, float]:
+    mapping: dict[Subsystem, float] = {}
+    if not raw.strip():
+        return mapping
+
+    by_name = {subsystem.value.lower(): subsystem for subsystem in Subsystem if subsystem != Subsystem.AUTO}
+    for token in raw.split(","):
+        entry = token.strip()
+        if not entry or ":" not in entry:
+            continue
+
+        subsystem_key, ttl = entry.split(":", 1)
+        subsystem = by_name.get(subsystem_key.strip().lower())
+        try:
+            seconds = float(ttl.strip())
+        except ValueError:
+            continue
+
+        if subsystem:
+            mapping[subsystem] = seconds
+
+    return mapping
+
+
+def parse_cache_context_fields(raw: str) -> dict[str, list[str]]:
+    """Parse ``player.<key>``/``world.<key>`` entries into keys to pick from each context dict."""
+    fields: dict[str, list[str]] = {"player": [], "world": []}
+    for token in raw.split(","):
+        entry = token.strip()
+        if "." not in entry:
+            continue
+
+        scope, key = entry.split(".", 1)
+        scope = scope.strip().lower()
+        key = key.strip()
+        if scope in fields and key and key not in fields[scope]:
+            fields[scope].append(key)
+
+    return fields
+
+
 def parse_ollama_fallback_urls(raw: str) -> list[str]:
     if not raw.strip():
         return []
@@ -74,6 +216,35 @@ def parse_ollama_fallback_urls(raw: str) -> list[str]:
     return deduped
 
 
+def parse_url_weights(raw: str) -> dict[str, float]:
+    """Parse ``<url>=<weight>`` entries; the last ``=`` separates the weight so URLs may contain one."""
+    weights: dict[str, float] = {}
+    for token in raw.split(","):
+        entry = token.strip()
+        if "=" not in entry:
+            continue
+
+        url, weight = entry.rsplit("=", 1)
+        try:
+            value = float(weight.strip())
+        except ValueError:
+            continue
+
+        if url.strip() and value >= 0:
+            weights[url.strip()] = value
+
+    return weights
+
+
+def parse_status_codes(raw: str) -> frozenset[int]:
+    codes = set()
+    for token in raw.split(","):
+        entry = token.strip()
+        if entry.isdigit() and 100 <= int(entry) <= 599:
+            codes.add(int(entry))
+    return frozenset(codes)
+
+
 def parse_model_auto_candidates(raw: str) -> dict[str, str]:
     if not raw.strip():
         return {}
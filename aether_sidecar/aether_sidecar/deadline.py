@@ -0,0 +1,28 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar("aether_request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(budget_seconds: float | None) -> Iterator[None]:
+    """
+    Bound backend work started inside the block to ``budget_seconds``.
+
+    The deadline lives in a context variable, so it follows the request into
+    cascade tiers, coalesced flights and hedge tasks without being threaded
+    through every backend signature. ``None`` or ``0`` means no deadline.
+    """
+    token = _deadline.set(time.monotonic() + budget_seconds if budget_seconds else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_seconds() -> float | None:
+    """Seconds left in the current deadline (never negative), or ``None`` without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
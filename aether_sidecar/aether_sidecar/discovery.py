@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+from .observability import CANDIDATE_REFRESH_SECONDS, CANDIDATE_REFRESHES
+
+
+class CandidateResolver:
+    """
+    Cache the backend candidate URL list and refresh it off the event loop.
+
+    Discovery reads ``/proc`` and ``/etc/resolv.conf`` and performs blocking DNS
+    lookups, so it must not run inline for every request. The list is computed
+    once, served from memory until ``ttl_seconds`` elapse, and then refreshed by
+    a background thread while callers keep using the stale copy.
+    """
+
+    def __init__(self, compute: Callable[[], list[str]], ttl_seconds: float = 60.0):
+        self._compute = compute
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self._urls: list[str] | None = None
+        self._expires_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+
+    def _timed_compute(self, mode: str) -> list[str] | None:
+        started = time.perf_counter()
+        try:
+            urls = self._compute()
+        except Exception:
+            CANDIDATE_REFRESHES.labels(mode, "error").inc()
+            return None
+        finally:
+            CANDIDATE_REFRESH_SECONDS.labels(mode).observe(time.perf_counter() - started)
+
+        CANDIDATE_REFRESHES.labels(mode, "success").inc()
+        return urls
+
+    def _store(self, urls: list[str] | None) -> None:
+        if urls is None:
+            return
+
+        self._urls = list(urls)
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def is_stale(self) -> bool:
+        return self._urls is None or time.monotonic() >= self._expires_at
+
+    def get(self) -> list[str]:
+        """
+        Return the cached URLs, scheduling a background refresh when stale.
+
+        Only the very first lookup (before :meth:`refresh` has primed the cache)
+        computes the list inline.
+        """
+        if self._urls is None:
+            self._store(self._timed_compute("inline"))
+            return list(self._urls or [])
+
+        if self.is_stale():
+            self.schedule_refresh()
+        return list(self._urls)
+
+    async def refresh(self) -> list[str]:
+        self._store(await asyncio.to_thread(self._timed_compute, "background"))
+        return list(self._urls or [])
+
+    def schedule_refresh(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._store(self._timed_compute("inline"))
+            return
+
+        self._refresh_task = loop.create_task(self.refresh())
+
+    def invalidate(self) -> None:
+        """Mark the cache stale so the next lookup triggers a background refresh."""
+        self._expires_at = 0.0
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+        self._refresh_task = None
@@ -1,8 +1,9 @@
-import json
 from collections import defaultdict
 from datetime import UTC, datetime
 from pathlib import Path
 
+from .serialization import dumps_text, loads
+
 
 class SessionMemory:
     def __init__(self, turn_limit: int = 6):
@@ -34,8 +35,8 @@ class SessionLearning:
                 continue
 
             try:
-                row = json.loads(line)
-            except json.JSONDecodeError:
+                row = loads(line)
+            except ValueError:
                 continue
 
             session_id = str(row.get("session_id") or "").strip()
@@ -59,7 +60,7 @@ class SessionLearning:
             "lesson": lesson,
         }
         with self._log_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.write(dumps_text(row) + "\n")
 
     def teach(self, session_id: str, lesson: str) -> None:
         self._append_lesson(session_id, lesson)
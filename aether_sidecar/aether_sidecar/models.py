@@ -58,6 +58,12 @@ class GenerateRequest(BaseModel):
     player_context: dict = Field(default_factory=dict)
     world_context: dict = Field(default_factory=dict)
     session_id: str = Field(min_length=1)
+    complexity_hint: Literal["low", "high"] | None = None
+    deadline_ms: int | None = Field(default=None, gt=0)
+
+
+class RouteBatchRequest(BaseModel):
+    messages: list[str] = Field(min_length=1)
 
 
 class GenerateResponse(BaseModel):
@@ -68,6 +74,10 @@ class GenerateResponse(BaseModel):
     safety_flags: list[str] = Field(default_factory=list)
     learned_context: list[str] = Field(default_factory=list)
     latency_ms: int
+    cached: bool = False
+    prefill_ms: int | None = None
+    deadline_ms: int | None = None
+    deadline_used_ms: int | None = None
 
 
 
@@ -93,6 +103,10 @@ class ModelStatusResponse(BaseModel):
     checked_model: str
     latency_ms: int | None = None
     attempted_urls: list[str] = Field(default_factory=list)
+    circuit_breakers: dict[str, str] = Field(default_factory=dict)
+    model_placement: dict[str, list[str]] = Field(default_factory=dict)
+    loaded_models: list[str] = Field(default_factory=list)
+    checked_at: float | None = None
 
 
 class StatusResponse(BaseModel):
@@ -1,7 +1,7 @@
 import time
 
 from fastapi import Request
-from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
 from starlette.responses import Response
 
 registry = CollectorRegistry()
@@ -41,6 +41,69 @@ BACKEND_ATTEMPT_LATENCY_SECONDS = Histogram(
     registry=registry,
 )
 
+BACKEND_HEDGES = Counter(
+    "aether_backend_hedges_total",
+    "Duplicate backend attempts sent because the first attempt exceeded the hedge delay",
+    ["operation"],
+    registry=registry,
+)
+
+BACKEND_HEDGE_WINS = Counter(
+    "aether_backend_hedge_wins_total",
+    "Which attempt answered first for hedged requests (primary or hedge)",
+    ["operation", "winner"],
+    registry=registry,
+)
+
+BACKEND_POOL_CONNECTIONS = Gauge(
+    "aether_backend_pool_connections",
+    "Pooled backend HTTP connections by candidate URL and state (idle, in_use, waiting)",
+    ["url", "state"],
+    registry=registry,
+)
+
+BACKEND_IN_FLIGHT = Gauge(
+    "aether_backend_in_flight",
+    "Backend requests currently outstanding per candidate URL",
+    ["url"],
+    registry=registry,
+)
+
+BACKEND_CIRCUIT_STATE = Gauge(
+    "aether_backend_circuit_state",
+    "Circuit breaker state per backend URL (0=closed, 1=half_open, 2=open)",
+    ["url"],
+    registry=registry,
+)
+
+BACKEND_COLD_LOADS = Counter(
+    "aether_backend_cold_loads_total",
+    "Generations that had to load their model before answering, by backend URL and model",
+    ["url", "model"],
+    registry=registry,
+)
+
+BACKEND_PROBES = Counter(
+    "aether_backend_probes_total",
+    "Background backend health probes by URL and outcome",
+    ["url", "outcome"],
+    registry=registry,
+)
+
+CANDIDATE_REFRESHES = Counter(
+    "aether_backend_candidate_refreshes_total",
+    "Backend candidate URL discovery runs by mode (inline, background) and outcome",
+    ["mode", "outcome"],
+    registry=registry,
+)
+
+CANDIDATE_REFRESH_SECONDS = Histogram(
+    "aether_backend_candidate_refresh_seconds",
+    "Time spent discovering backend candidate URLs (file reads and DNS lookups)",
+    ["mode"],
+    registry=registry,
+)
+
 GENERATE_FALLBACK_HOPS = Histogram(
     "aether_generate_fallback_hops",
     "How many fallback hops were required before a successful generate response",
@@ -48,6 +111,159 @@ GENERATE_FALLBACK_HOPS = Histogram(
     registry=registry,
 )
 
+GENERATE_COALESCED = Counter(
+    "aether_generate_coalesced_total",
+    "Coalesced /generate requests by role (leader ran the backend call, follower shared it)",
+    ["role"],
+    registry=registry,
+)
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "aether_response_cache_lookups_total",
+    "Response cache lookups by subsystem and result (hit, miss)",
+    ["subsystem", "result"],
+    registry=registry,
+)
+
+RESPONSE_CACHE_EVICTIONS = Counter(
+    "aether_response_cache_evictions_total",
+    "Response cache evictions by reason (capacity, expired, replaced)",
+    ["reason"],
+    registry=registry,
+)
+
+RESPONSE_CACHE_ENTRIES = Gauge(
+    "aether_response_cache_entries",
+    "Entries currently held in the response cache",
+    registry=registry,
+)
+
+RESPONSE_CACHE_BYTES = Gauge(
+    "aether_response_cache_bytes",
+    "Approximate bytes currently held in the response cache",
+    registry=registry,
+)
+
+SEMANTIC_CACHE_LOOKUPS = Counter(
+    "aether_semantic_cache_lookups_total",
+    "Semantic cache lookups by subsystem and result (hit, miss)",
+    ["subsystem", "result"],
+    registry=registry,
+)
+
+SEMANTIC_CACHE_SIMILARITY = Histogram(
+    "aether_semantic_cache_similarity",
+    "Best cosine similarity found per semantic cache lookup",
+    ["subsystem"],
+    buckets=(0.5, 0.6, 0.7, 0.8, 0.85, 0.88, 0.9, 0.92, 0.94, 0.96, 0.98, 1.0),
+    registry=registry,
+)
+
+SEMANTIC_CACHE_EMBED_SECONDS = Histogram(
+    "aether_semantic_cache_embed_seconds",
+    "Time spent embedding messages for semantic cache lookups",
+    registry=registry,
+)
+
+GENERATE_PREFILL_SECONDS = Histogram(
+    "aether_generate_prefill_seconds",
+    "Prompt evaluation (prefill) time reported by the model server per generation",
+    ["subsystem"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=registry,
+)
+
+PROMPT_TOKENS = Histogram(
+    "aether_prompt_tokens",
+    "Estimated prompt tokens per generation after budget trimming",
+    ["subsystem"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 3072, 4096, 8192),
+    registry=registry,
+)
+
+PROMPT_TRIMMED = Counter(
+    "aether_prompt_trimmed_total",
+    "Prompt entries dropped to fit the token budget by section (history, lessons, context)",
+    ["section"],
+    registry=registry,
+)
+
+CASCADE_TIER_REQUESTS = Counter(
+    "aether_cascade_tier_requests_total",
+    "Model cascade tier outcomes by subsystem and model (accepted, escalated, failed, deadline)",
+    ["subsystem", "model", "outcome"],
+    registry=registry,
+)
+
+CASCADE_TIER_LATENCY_SECONDS = Histogram(
+    "aether_cascade_tier_latency_seconds",
+    "Latency of each model cascade tier attempt",
+    ["model"],
+    registry=registry,
+)
+
+GENERATE_TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "aether_generate_time_to_first_token_seconds",
+    "Time from request start until the first streamed token is sent",
+    ["subsystem"],
+    registry=registry,
+)
+
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "aether_admission_queue_depth",
+    "Requests waiting for a backend slot in the admission queue",
+    registry=registry,
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "aether_admission_in_flight",
+    "Backend calls currently holding an admission slot",
+    registry=registry,
+)
+
+ADMISSION_WAIT_SECONDS = Histogram(
+    "aether_admission_wait_seconds",
+    "Time spent waiting for an admission slot by subsystem",
+    ["subsystem"],
+    registry=registry,
+)
+
+ADMISSION_REJECTIONS = Counter(
+    "aether_admission_rejections_total",
+    "Requests rejected by admission control by subsystem and reason (queue_full, timeout)",
+    ["subsystem", "reason"],
+    registry=registry,
+)
+
+DEADLINE_EXCEEDED = Counter(
+    "aether_deadline_exceeded_total",
+    "Requests whose deadline budget ran out, by stage (admission, before_hop, in_flight)",
+    ["stage"],
+    registry=registry,
+)
+
+GENERATE_CANCELLED = Counter(
+    "aether_generate_cancelled_total",
+    "Generations abandoned because the client disconnected, by subsystem and endpoint",
+    ["subsystem", "endpoint"],
+    registry=registry,
+)
+
+ROUTER_AUTO_DECISIONS = Counter(
+    "aether_router_auto_decisions_total",
+    "Subsystem.AUTO routing decisions by source (classifier, keywords) and chosen subsystem",
+    ["source", "subsystem"],
+    registry=registry,
+)
+
+ROUTE_BATCH_MESSAGES = Counter(
+    "aether_route_batch_messages_total",
+    "Messages classified through /route/batch by outcome (classifier, keywords, rejected)",
+    ["outcome"],
+    registry=registry,
+)
+
 
 async def metrics_middleware(request: Request, call_next):
     started = time.perf_counter()
@@ -0,0 +1,97 @@
+from .backends import SYSTEM_PROMPTS, OllamaBackend
+from .models import Subsystem
+from .serialization import loads
+
+
+class OpenAICompatibleBackend(OllamaBackend):
+    """
+    Backend for OpenAI-compatible local servers (llama.cpp server, vLLM, LM Studio).
+
+    Failover, hedging, circuit breakers, pooling and metrics are inherited
+    from :class:`OllamaBackend`; only the wire format differs. Candidates come
+    from ``AETHER_OPENAI_URL``, ``AETHER_OPENAI_FALLBACK_URLS`` and host aliases
+    of a loopback URL, never from the Ollama variables or service names, and
+    point at ``/v1/chat/completions``. Servers batch
+    concurrent requests themselves (continuous batching), so the pooled
+    connections are all the client side needs.
+    """
+
+    PROBE_PATH = "/v1/models"
+    EMBED_PATH = "/v1/embeddings"
+    # The configured URL and fallbacks already come from AETHER_OPENAI_*; no other variables are scanned.
+    DISCOVERY_ENV_KEYS = ()
+    DISCOVERY_FALLBACK_ENV_KEY = ""
+    SERVICE_ALIASES = ()
+
+    def __init__(self, base_url: str, model_name: str, api_key: str | None = None, **kwargs):
+        super().__init__(base_url, model_name, api_mode="chat", **kwargs)
+        self.api_key = api_key
+
+    def _client_headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def _generate_payload(
+        self,
+        prompt: str,
+        subsystem: Subsystem,
+        model_name: str,
+        stream: bool = False,
+        messages: list[dict[str, str]] | None = None,
+    ) -> dict:
+        system_prompt = SYSTEM_PROMPTS.get(subsystem, SYSTEM_PROMPTS[Subsystem.AEGIS])
+        chat = list(messages or [{"role": "user", "content": prompt}])
+        if chat[0]["role"] == "system":
+            chat[0] = {"role": "system", "content": f"{system_prompt}\n\n{chat[0]['content']}"}
+        else:
+            chat.insert(0, {"role": "system", "content": system_prompt})
+        return {"model": model_name, "messages": chat, "stream": stream}
+
+    def _generate_endpoint(self) -> str | None:
+        return None
+
+    def _response_text(self, data: dict) -> str:
+        choices = data.get("choices") or [{}]
+        message = choices[0].get("message") or choices[0].get("delta") or {}
+        return message.get("content") or ""
+
+    @staticmethod
+    def _prefill_ms(data: dict) -> int | None:
+        """llama.cpp reports ``timings.prompt_ms``; other servers omit prefill timings."""
+        prompt_ms = (data.get("timings") or {}).get("prompt_ms")
+        return int(prompt_ms) if isinstance(prompt_ms, (int, float)) else None
+
+    @staticmethod
+    def _parse_stream_line(line: str) -> dict | None:
+        """Decode a Server-Sent Events ``data:`` line; ``[DONE]`` ends the stream."""
+        line = line.strip()
+        if not line.startswith("data:"):
+            return None
+        body = line[len("data:") :].strip()
+        if body == "[DONE]":
+            return {"done": True}
+        return loads(body)
+
+    @staticmethod
+    def _stream_done(data: dict) -> bool:
+        choices = data.get("choices") or [{}]
+        return bool(data.get("done") or choices[0].get("finish_reason"))
+
+    def _warmup_request(self, model_name: str) -> tuple[dict, str | None]:
+        return {
+            "model": model_name,
+            "messages": [{"role": "user", "content": "Warmup request. Reply with: ready."}],
+            "max_tokens": 4,
+            "stream": False,
+        }, None
+
+    @staticmethod
+    def _loaded_models(probe_data: dict) -> list[str]:
+        return [model["id"] for model in probe_data.get("data") or [] if model.get("id")]
+
+    def _embed_payload(self, text: str) -> dict:
+        return {"model": self.embedding_model, "input": text}
+
+    @staticmethod
+    def _embedding_from(data: dict) -> list[float]:
+        items = data.get("data") or []
+        return items[0].get("embedding") or [] if items else []
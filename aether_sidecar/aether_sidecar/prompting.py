@@ -0,0 +1,181 @@
+import math
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .models import Subsystem
+from .router import subsystem_teaching_context
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    Tokenizer = None
+
+TokenCounter = Callable[[str], int]
+
+ASSISTANT_GUIDANCE = (
+    "Assistant guidance: If the request is not Minecraft-related, respond naturally as A.E.T.H.E.R without refusing."
+)
+CHAT_ROLES = {"player": "user", "assistant": "assistant"}
+
+
+@dataclass
+class PromptLayout:
+    """
+    A generation prompt split by how often each part changes.
+
+    ``stable`` (subsystem profile and lessons) is identical across a session's
+    turns and ``history`` only grows at the end, so both form a prefix the
+    model server can keep cached. Everything that varies per turn lives in
+    ``turn`` and is always placed last.
+    """
+
+    stable: str
+    history: list[dict[str, str]]
+    turn: str
+    token_count: int = 0
+    trimmed: dict[str, int] = field(default_factory=dict)
+
+    def text(self) -> str:
+        history_text = "\n".join(f"{entry['role']}: {entry['text']}" for entry in self.history)
+        return f"{self.stable}\nHistory:\n{history_text}\n\n{self.turn}"
+
+    def chat_messages(self) -> list[dict[str, str]]:
+        """Render the layout as ``/api/chat`` messages: stable system block, prior turns, then this turn."""
+        messages = [{"role": "system", "content": self.stable}]
+        messages.extend(
+            {"role": CHAT_ROLES.get(entry["role"], "user"), "content": entry["text"]} for entry in self.history
+        )
+        messages.append({"role": "user", "content": self.turn})
+        return messages
+
+
+def heuristic_token_count(text: str) -> int:
+    """Approximate token count at roughly four characters per token, which suits English prose."""
+    return math.ceil(len(text) / 4)
+
+
+def resolve_token_counter(name: str) -> TokenCounter:
+    """
+    Return the token counter named by ``AETHER_PROMPT_TOKENIZER``.
+
+    ``heuristic`` needs no dependencies; any other value is treated as the
+    path to a Hugging Face ``tokenizer.json`` for the served model.
+    """
+    if not name.strip() or name.strip().lower() == "heuristic":
+        return heuristic_token_count
+
+    if Tokenizer is None:
+        raise RuntimeError("A tokenizer file requires the 'tokenizer' extra: pip install -e '.[tokenizer]'")
+
+    tokenizer = Tokenizer.from_file(name.strip())
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def _render(
+    session_id: str,
+    message: str,
+    subsystem: Subsystem,
+    alerts: dict[Subsystem, list[str]],
+    learned_context: list[str],
+    player_context: dict,
+    world_context: dict,
+    history: list[dict[str, str]],
+    general_conversation: bool,
+) -> PromptLayout:
+    lesson_text = "\n".join(f"- {lesson}" for lesson in learned_context)
+    request_scope = "general-conversation" if general_conversation else "minecraft-subsystem"
+    stable = (
+        f"Subsystem: {subsystem.value}\n"
+        f"Subsystem teaching profile: {subsystem_teaching_context(subsystem)}\n"
+        f"Learned preferences/facts:\n{lesson_text}"
+    )
+    turn = (
+        f"Session: {session_id}\n"
+        f"Request scope: {request_scope}\n"
+        f"Detected keyword alerts: { {k.value: v for k, v in alerts.items()} }\n"
+        f"Player context: {player_context}\n"
+        f"World context: {world_context}\n"
+        f"Player: {message}\n"
+        f"{ASSISTANT_GUIDANCE}"
+    )
+    return PromptLayout(stable=stable, history=history, turn=turn)
+
+
+def build_prompt(
+    session_id: str,
+    message: str,
+    subsystem: Subsystem,
+    alerts: dict[Subsystem, list[str]],
+    learned_context: list[str],
+    player_context: dict,
+    world_context: dict,
+    history: list[dict[str, str]],
+    general_conversation: bool,
+    token_budget: int = 0,
+    count_tokens: TokenCounter = heuristic_token_count,
+    context_max_keys: int = 0,
+) -> PromptLayout:
+    """
+    Assemble the prompt, trimming it to ``token_budget`` tokens when one is set.
+
+    Player and world context are first cut to ``context_max_keys`` keys each
+    when that is set. The oldest history turns go first, then the oldest
+    lessons, then context keys (from whichever of player/world context is
+    larger). Each dropped entry is measured once and its size subtracted from
+    the excess, so the whole prompt is only re-counted to confirm the cut
+    rather than once per entry. The current message and subsystem profile are
+    never trimmed, so a prompt can still exceed a very small budget.
+    """
+    history = list(history)
+    lessons = list(learned_context)
+    contexts = (dict(player_context), dict(world_context))
+    trimmed = {"history": 0, "lessons": 0, "context": 0}
+
+    if context_max_keys > 0:
+        for context in contexts:
+            for key in list(context)[context_max_keys:]:
+                del context[key]
+                trimmed["context"] += 1
+
+    def render() -> tuple[PromptLayout, int]:
+        layout = _render(session_id, message, subsystem, alerts, lessons, *contexts, history, general_conversation)
+        return layout, count_tokens(layout.text())
+
+    context_chars: list[int] = []
+
+    def drop_next() -> int | None:
+        """Drop the next entry in trim order and return its estimated token size, or ``None`` when none is left."""
+        if history:
+            entry = history.pop(0)
+            trimmed["history"] += 1
+            return count_tokens(f"{entry['role']}: {entry['text']}\n")
+        if lessons:
+            trimmed["lessons"] += 1
+            return count_tokens(f"- {lessons.pop(0)}\n")
+        if not any(contexts):
+            return None
+
+        if not context_chars:
+            context_chars.extend(len(str(context)) for context in contexts)
+        index = 0 if context_chars[0] >= context_chars[1] else 1
+        context = contexts[index]
+        key, value = context.popitem()
+        item = f"{key!r}: {value!r}, "
+        context_chars[index] -= len(item)
+        trimmed["context"] += 1
+        return count_tokens(item)
+
+    layout, token_count = render()
+    while token_budget > 0 and token_count > token_budget:
+        excess = token_count - token_budget
+        dropped = False
+        while excess > 0 and (size := drop_next()) is not None:
+            excess -= size
+            dropped = True
+        if not dropped:
+            break
+        layout, token_count = render()
+
+    layout.token_count = token_count
+    layout.trimmed = {section: count for section, count in trimmed.items() if count}
+    return layout
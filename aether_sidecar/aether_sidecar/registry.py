@@ -0,0 +1,105 @@
+from collections.abc import Callable
+
+from .backends import BaseBackend, EchoBackend, OllamaBackend
+from .circuit import BreakerPolicy
+from .config import (
+    Settings,
+    parse_ollama_fallback_urls,
+    parse_status_codes,
+    parse_subsystem_models,
+    parse_url_weights,
+)
+from .openai_backend import OpenAICompatibleBackend
+from .retry import RetryBudget, RetryPolicy
+
+BackendFactory = Callable[[Settings, str], BaseBackend]
+
+_FACTORIES: dict[str, BackendFactory] = {}
+
+
+def register_backend(name: str) -> Callable[[BackendFactory], BackendFactory]:
+    """Register ``factory(settings, model_name)`` under the ``AETHER_MODEL_BACKEND`` value ``name``."""
+
+    def decorator(factory: BackendFactory) -> BackendFactory:
+        _FACTORIES[name.lower()] = factory
+        return factory
+
+    return decorator
+
+
+def available_backends() -> list[str]:
+    return sorted(_FACTORIES)
+
+
+def create_backend(settings: Settings, model_name: str) -> BaseBackend:
+    factory = _FACTORIES.get(settings.model_backend.strip().lower())
+    if factory is None:
+        raise RuntimeError(
+            f"Unsupported model backend {settings.model_backend!r}. "
+            f"Set AETHER_MODEL_BACKEND to one of: {', '.join(available_backends())}."
+        )
+    return factory(settings, model_name)
+
+
+def _http_backend_options(settings: Settings, prefix: str) -> dict:
+    """Transport options for an HTTP backend from its ``AETHER_<PREFIX>_*`` pool, breaker, retry and routing settings."""
+
+    def option(name: str):
+        return getattr(settings, f"{prefix}_{name}")
+
+    return {
+        "timeout_seconds": settings.request_timeout_seconds,
+        "subsystem_models": parse_subsystem_models(settings.subsystem_models),
+        "candidate_cache_ttl_seconds": option("candidate_cache_ttl_seconds"),
+        "pool_max_connections": option("pool_max_connections"),
+        "pool_max_keepalive_connections": option("pool_max_keepalive_connections"),
+        "pool_keepalive_expiry_seconds": option("pool_keepalive_expiry_seconds"),
+        "hedge_enabled": option("hedge_enabled"),
+        "hedge_delay_seconds": option("hedge_delay_seconds"),
+        "breaker_policy": BreakerPolicy(
+            window_size=option("breaker_window_size"),
+            min_requests=option("breaker_min_requests"),
+            failure_rate_threshold=option("breaker_failure_rate"),
+            open_seconds=option("breaker_open_seconds"),
+        ),
+        "retry_policy": RetryPolicy(
+            retryable_statuses=parse_status_codes(option("retry_statuses")),
+            max_retries=max(0, option("retry_max_retries")),
+            base_delay_seconds=max(0.0, option("retry_base_delay_seconds")),
+            max_delay_seconds=max(0.0, option("retry_max_delay_seconds")),
+        ),
+        "retry_budget": RetryBudget(ratio=option("retry_budget_ratio")),
+        "probe_interval_seconds": option("probe_interval_seconds"),
+        "embedding_model": settings.semantic_cache_embedding_model,
+        "routing_mode": option("routing_mode").strip().lower(),
+        "routing_weights": parse_url_weights(option("routing_weights")),
+        "max_in_flight_per_url": settings.admission_max_in_flight_per_url if settings.admission_enabled else 0,
+    }
+
+
+@register_backend("ollama")
+def _create_ollama(settings: Settings, model_name: str) -> BaseBackend:
+    return OllamaBackend(
+        settings.ollama_url,
+        model_name,
+        keep_alive=settings.ollama_keep_alive,
+        fallback_urls=parse_ollama_fallback_urls(settings.ollama_fallback_urls),
+        api_mode=settings.ollama_api_mode.strip().lower(),
+        **_http_backend_options(settings, "ollama"),
+    )
+
+
+@register_backend("openai")
+def _create_openai(settings: Settings, model_name: str) -> BaseBackend:
+    return OpenAICompatibleBackend(
+        settings.openai_url,
+        model_name,
+        api_key=settings.openai_api_key,
+        fallback_urls=parse_ollama_fallback_urls(settings.openai_fallback_urls),
+        **_http_backend_options(settings, "openai"),
+    )
+
+
+@register_backend("echo")
+def _create_echo(settings: Settings, model_name: str) -> BaseBackend:
+    return EchoBackend(model_name, delay_seconds=settings.echo_delay_seconds)
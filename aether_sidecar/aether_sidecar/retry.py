@@ -0,0 +1,65 @@
+import random
+import re
+from dataclasses import dataclass, field
+
+import httpx
+
+# Ollama answers 500/503 with these while it swaps, loads or restarts a model runner.
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r"loading model|model is loading|server busy|runner process has terminated|no slots? available",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Which backend HTTP errors are worth another attempt, and how long to wait between them.
+
+    Retryable responses move on to the next untried candidate immediately;
+    once every candidate has been tried, the last one is retried up to
+    ``max_retries`` times after a full-jitter exponential backoff.
+    """
+
+    retryable_statuses: frozenset[int] = field(default_factory=lambda: frozenset({408, 425, 429, 500, 502, 503, 504}))
+    max_retries: int = 2
+    base_delay_seconds: float = 0.25
+    max_delay_seconds: float = 2.0
+
+    def is_retryable(self, exc: httpx.HTTPStatusError) -> bool:
+        if exc.response.status_code in self.retryable_statuses:
+            return True
+        return bool(TRANSIENT_ERROR_PATTERN.search(exc.response.text or ""))
+
+    def backoff_seconds(self, retry: int, rng: random.Random | None = None) -> float:
+        """Full-jitter delay before the ``retry``-th (1-based) retry of the same candidate."""
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** max(0, retry - 1))
+        return (rng or random).uniform(0.0, ceiling)
+
+
+class RetryBudget:
+    """
+    Cap retry amplification with a token bucket shared by every request.
+
+    Each request deposits ``ratio`` tokens and each retry spends one, so in
+    steady state retries stay under ``ratio`` of traffic. ``capacity`` bounds
+    the burst available after a quiet period.
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10.0):
+        self.ratio = max(0.0, ratio)
+        self.capacity = max(0.0, capacity)
+        self._tokens = self.capacity
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def record_request(self) -> None:
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
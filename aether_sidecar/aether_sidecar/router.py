@@ -1,3 +1,8 @@
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
 from .models import Subsystem
 
 SUBSYSTEM_PROFILES = {
@@ -54,26 +59,153 @@ def subsystem_teaching_context(subsystem: Subsystem) -> str:
     )
 
 
+@dataclass(frozen=True)
+class MessageAnalysis:
+    alerts: dict[Subsystem, list[str]]
+    subsystem: Subsystem
+    minecraft_related: bool
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Render ``words`` as one regex shaped like a prefix trie.
+
+    Alternatives at each node start with distinct characters, so matching
+    cost follows the length of the text rather than the size of the lexicon,
+    and greedy optional tails make the longest keyword win at each position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """
+    Find subsystem alerts, the routing pick and Minecraft relevance in one pass over a message.
+
+    Keywords match case-insensitively at the start of a word, so ``heal`` still
+    matches "healing" but ``map`` no longer fires inside "bitmap". The scan is
+    a zero-width lookahead at every word start, which keeps multi-word keywords
+    overlapping later ones; the longest keyword found at a position is
+    expanded to every shorter keyword that is a prefix of it.
+    """
+
+    def __init__(self, subsystem_keywords: dict[Subsystem, list[str]], context_keywords: Iterable[str] = ()):
+        self._subsystems = list(subsystem_keywords)
+        self._owners: dict[str, list[tuple[Subsystem, int]]] = {}
+        for subsystem, words in subsystem_keywords.items():
+            for index, word in enumerate(words):
+                key = word.strip().lower()
+                if key and (subsystem, index) not in self._owners.get(key, []):
+                    self._owners.setdefault(key, []).append((subsystem, index))
+        self._context = {word.strip().lower() for word in context_keywords if word.strip()}
+
+        vocabulary = {*self._owners, *self._context}
+        self._expansions = {
+            word: tuple(word[:end] for end in range(1, len(word) + 1) if word[:end] in vocabulary) for word in vocabulary
+        }
+        self._pattern = (
+            re.compile(rf"(?<!\w)(?=({_trie_pattern(vocabulary)}))") if vocabulary else None
+        )
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._expansions)
+
+    def analyze(self, message: str) -> MessageAnalysis:
+        found: set[str] = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(message.lower()):
+                found.update(self._expansions[match.group(1)])
+
+        hits: dict[Subsystem, list[tuple[int, str]]] = {}
+        for word in found:
+            for subsystem, index in self._owners.get(word, ()):
+                hits.setdefault(subsystem, []).append((index, word))
+
+        # Keep alerts in profile order so they read the same as the configured keyword lists.
+        alerts = {
+            subsystem: [word for _, word in sorted(hits[subsystem])] for subsystem in self._subsystems if subsystem in hits
+        }
+        subsystem = max(alerts, key=lambda candidate: len(alerts[candidate])) if alerts else Subsystem.AEGIS
+        return MessageAnalysis(
+            alerts=alerts,
+            subsystem=subsystem,
+            minecraft_related=bool(alerts) or not self._context.isdisjoint(found),
+        )
+
+
+def load_vocabulary(path: str | Path) -> tuple[dict[Subsystem, list[str]], list[str]]:
+    """
+    Read a routing vocabulary file of ``<group>: keyword, keyword`` lines.
+
+    ``<group>`` is a subsystem name or ``minecraft`` for general Minecraft
+    context. Blank lines, ``#`` comments and unknown groups are skipped.
+    """
+    by_name = {subsystem.value.lower(): subsystem for subsystem in Subsystem if subsystem != Subsystem.AUTO}
+    subsystem_keywords: dict[Subsystem, list[str]] = {}
+    context_keywords: list[str] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        entry = line.split("#", 1)[0].strip()
+        if ":" not in entry:
+            continue
+
+        group, words = entry.split(":", 1)
+        group = group.strip().lower()
+        keywords = [word.strip().lower() for word in words.split(",") if word.strip()]
+        if group == "minecraft":
+            context_keywords.extend(keywords)
+        elif group in by_name:
+            subsystem_keywords.setdefault(by_name[group], []).extend(keywords)
+
+    return subsystem_keywords, context_keywords
+
+
+def build_matcher(vocabulary_path: str | Path | None = None) -> KeywordMatcher:
+    """Build a matcher from the built-in profiles, extended by ``vocabulary_path`` when given."""
+    subsystem_keywords = {subsystem: list(words) for subsystem, words in KEYWORDS.items()}
+    context_keywords = list(MINECRAFT_CONTEXT_KEYWORDS)
+    if vocabulary_path:
+        extra_keywords, extra_context = load_vocabulary(vocabulary_path)
+        for subsystem, words in extra_keywords.items():
+            subsystem_keywords.setdefault(subsystem, []).extend(words)
+        context_keywords.extend(extra_context)
+    return KeywordMatcher(subsystem_keywords, context_keywords)
+
+
+_matcher = build_matcher()
+
+
+def configure_vocabulary(vocabulary_path: str | Path | None) -> KeywordMatcher:
+    global _matcher
+
+    _matcher = build_matcher(vocabulary_path)
+    return _matcher
+
+
+def analyze_message(message: str) -> MessageAnalysis:
+    return _matcher.analyze(message)
+
+
 def detect_subsystem_alerts(message: str) -> dict[Subsystem, list[str]]:
-    lowered = message.lower()
-    alerts: dict[Subsystem, list[str]] = {}
-    for subsystem, words in KEYWORDS.items():
-        matches = [word for word in words if word in lowered]
-        if matches:
-            alerts[subsystem] = matches
-    return alerts
+    return analyze_message(message).alerts
 
 
 def pick_subsystem(message: str) -> Subsystem:
-    alerts = detect_subsystem_alerts(message)
-    if not alerts:
-        return Subsystem.AEGIS
-
-    winner = max(alerts, key=lambda subsystem: len(alerts[subsystem]))
-    return winner
+    return analyze_message(message).subsystem
 
 
 def is_minecraft_related(message: str) -> bool:
-    lowered = message.lower()
-    subsystem_keyword_match = any(word in lowered for words in KEYWORDS.values() for word in words)
-    return subsystem_keyword_match or any(keyword in lowered for keyword in MINECRAFT_CONTEXT_KEYWORDS)
+    return analyze_message(message).minecraft_related
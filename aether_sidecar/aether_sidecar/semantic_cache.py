@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from .models import Subsystem
+from .observability import SEMANTIC_CACHE_LOOKUPS, SEMANTIC_CACHE_SIMILARITY
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    np = None
+
+
+@dataclass
+class SemanticHit:
+    text: str
+    model_used: str
+    score: float
+
+
+class _SemanticTier:
+    """
+    Matrix of unit-normalized embeddings with least-recently-used eviction at ``capacity``.
+
+    Rows are allocated as entries arrive, doubling from ``INITIAL_ROWS``, so a
+    tier that only ever holds a few answers stays small.
+    """
+
+    INITIAL_ROWS = 16
+
+    def __init__(self, dimensions: int, capacity: int):
+        self.capacity = capacity
+        rows = min(capacity, self.INITIAL_ROWS)
+        self.matrix = np.zeros((rows, dimensions), dtype=np.float32)
+        self.last_used = np.zeros(rows, dtype=np.int64)
+        self.answers: list[tuple[str, str]] = []
+        self.size = 0
+
+    def best_match(self, vector) -> tuple[int, float] | None:
+        if self.size == 0:
+            return None
+
+        scores = self.matrix[: self.size] @ vector
+        index = int(np.argmax(scores))
+        return index, float(scores[index])
+
+    def _grow(self) -> None:
+        rows = min(self.capacity, 2 * len(self.matrix))
+        matrix = np.zeros((rows, self.matrix.shape[1]), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        last_used = np.zeros(rows, dtype=np.int64)
+        last_used[: self.size] = self.last_used[: self.size]
+        self.matrix, self.last_used = matrix, last_used
+
+    def slot_for_insert(self) -> int:
+        if self.size < self.capacity:
+            if self.size == len(self.matrix):
+                self._grow()
+            self.size += 1
+            self.answers.append(("", ""))
+            return self.size - 1
+
+        return int(np.argmin(self.last_used))
+
+
+class SemanticCache:
+    """
+    Serve stored answers for paraphrased questions via embedding similarity.
+
+    Embeddings are kept per ``(subsystem, model, scope)`` tier in a NumPy matrix;
+    a lookup is one matrix-vector product and an ``argmax``. A stored answer is
+    returned when cosine similarity reaches ``threshold``. Each tier holds at
+    most ``capacity_per_tier`` answers, and once all tiers together exceed
+    ``max_entries`` the least recently used tiers are dropped whole, so many
+    distinct scopes cannot grow memory without bound.
+    """
+
+    def __init__(self, threshold: float = 0.92, capacity_per_tier: int = 512, max_entries: int = 8192):
+        if np is None:
+            raise RuntimeError("The semantic cache requires numpy. Install aether-sidecar[semantic].")
+
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        self.capacity_per_tier = min(max(1, capacity_per_tier), self.max_entries)
+        self._tiers: OrderedDict[tuple[Subsystem, str, str], _SemanticTier] = OrderedDict()
+        self._size = 0
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def tier_count(self) -> int:
+        return len(self._tiers)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def lookup(self, subsystem: Subsystem, model_name: str, scope: str, embedding: Sequence[float]) -> SemanticHit | None:
+        key = (subsystem, model_name, scope)
+        tier = self._tiers.get(key)
+        if tier is not None:
+            self._tiers.move_to_end(key)
+        vector = self._normalize(embedding)
+        match = tier.best_match(vector) if tier is not None and tier.matrix.shape[1] == vector.shape[0] else None
+        if match is None:
+            SEMANTIC_CACHE_LOOKUPS.labels(subsystem.value, "miss").inc()
+            return None
+
+        index, score = match
+        SEMANTIC_CACHE_SIMILARITY.labels(subsystem.value).observe(score)
+        if score < self.threshold:
+            SEMANTIC_CACHE_LOOKUPS.labels(subsystem.value, "miss").inc()
+            return None
+
+        tier.last_used[index] = self._tick()
+        text, model_used = tier.answers[index]
+        SEMANTIC_CACHE_LOOKUPS.labels(subsystem.value, "hit").inc()
+        return SemanticHit(text=text, model_used=model_used, score=score)
+
+    def store(
+        self, subsystem: Subsystem, model_name: str, scope: str, embedding: Sequence[float], text: str, model_used: str
+    ) -> None:
+        vector = self._normalize(embedding)
+        key = (subsystem, model_name, scope)
+        tier = self._tiers.get(key)
+        if tier is None or tier.matrix.shape[1] != vector.shape[0]:
+            self._size -= tier.size if tier is not None else 0
+            tier = _SemanticTier(vector.shape[0], self.capacity_per_tier)
+            self._tiers[key] = tier
+        self._tiers.move_to_end(key)
+
+        size_before = tier.size
+        slot = tier.slot_for_insert()
+        self._size += tier.size - size_before
+        tier.matrix[slot] = vector
+        tier.answers[slot] = (text, model_used)
+        tier.last_used[slot] = self._tick()
+
+        while self._size > self.max_entries:
+            _, evicted = self._tiers.popitem(last=False)
+            self._size -= evicted.size
+
+    def clear(self) -> None:
+        self._tiers.clear()
+        self._size = 0
@@ -0,0 +1,80 @@
+import json
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    orjson = None
+
+JSON_LIBRARIES = ("auto", "orjson", "stdlib")
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+_use_orjson = orjson is not None
+
+
+def use_json_library(name: str) -> str:
+    """
+    Select the JSON implementation named by ``AETHER_JSON_LIBRARY`` and return the one in use.
+
+    ``auto`` picks orjson when the ``fast-json`` extra is installed and the
+    standard library otherwise; ``orjson`` requires the extra.
+    """
+    global _use_orjson
+
+    name = name.strip().lower() or "auto"
+    if name not in JSON_LIBRARIES:
+        raise RuntimeError(f"AETHER_JSON_LIBRARY must be one of {', '.join(JSON_LIBRARIES)}")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("AETHER_JSON_LIBRARY=orjson requires the 'fast-json' extra: pip install -e '.[fast-json]'")
+
+    _use_orjson = orjson is not None and name != "stdlib"
+    return "orjson" if _use_orjson else "stdlib"
+
+
+def dumps(obj: Any, sort_keys: bool = False, default: Any = None) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes."""
+    if _use_orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option, default=default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=default).encode(
+        "utf-8"
+    )
+
+
+def dumps_text(obj: Any, sort_keys: bool = False, default: Any = None) -> str:
+    return dumps(obj, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON; both implementations raise a ``ValueError`` subclass on malformed input."""
+    return orjson.loads(data) if _use_orjson else json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered through :func:`dumps`; pass ``model_dump()`` output to skip re-validation."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = loads(await self.body())
+        return self._json
+
+
+class FastJSONRoute(APIRoute):
+    """Route class that parses JSON request bodies through :func:`loads`."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def fast_json_handler(request: Request):
+            return await handler(FastJSONRequest(request.scope, request.receive))
+
+        return fast_json_handler
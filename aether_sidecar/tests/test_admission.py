@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from aether_sidecar.admission import AdmissionController, AdmissionRejectedError
+from aether_sidecar.models import Subsystem
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_admission_queues_beyond_max_in_flight_and_hands_slot_over_on_release():
+    admission = AdmissionController(max_in_flight=1, max_queue=4)
+    await admission.acquire(Subsystem.TERRA)
+
+    waiter = asyncio.create_task(admission.acquire(Subsystem.TERRA))
+    await asyncio.sleep(0)
+    assert admission.queue_depth == 1
+    assert not waiter.done()
+
+    admission.release()
+    await waiter
+
+    assert admission.in_flight == 1
+    assert admission.queue_depth == 0
+
+
+@pytest.mark.anyio
+async def test_admission_prefers_higher_priority_subsystems():
+    admission = AdmissionController(max_in_flight=1, max_queue=4)
+    await admission.acquire(Subsystem.TERRA)
+    order = []
+
+    async def wait(subsystem):
+        await admission.acquire(subsystem)
+        order.append(subsystem)
+
+    lore = asyncio.create_task(wait(Subsystem.REQUIEM))
+    await asyncio.sleep(0)
+    hazard = asyncio.create_task(wait(Subsystem.AEGIS))
+    await asyncio.sleep(0)
+
+    admission.release()
+    await hazard
+    admission.release()
+    await lore
+
+    assert order == [Subsystem.AEGIS, Subsystem.REQUIEM]
+
+
+@pytest.mark.anyio
+async def test_admission_rejects_when_queue_is_full():
+    admission = AdmissionController(max_in_flight=1, max_queue=0)
+    await admission.acquire(Subsystem.AEGIS)
+
+    with pytest.raises(AdmissionRejectedError) as excinfo:
+        await admission.acquire(Subsystem.AEGIS)
+
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.retry_after_seconds >= 1
+
+
+@pytest.mark.anyio
+async def test_admission_times_out_waiters_and_removes_them_from_the_queue():
+    admission = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout_seconds=0.01)
+    await admission.acquire(Subsystem.HELIOS)
+
+    with pytest.raises(AdmissionRejectedError) as excinfo:
+        await admission.acquire(Subsystem.HELIOS)
+
+    assert excinfo.value.reason == "timeout"
+    assert admission.queue_depth == 0
+
+    admission.release()
+    assert admission.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_admission_wait_is_capped_by_caller_timeout():
+    admission = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout_seconds=10.0)
+    await admission.acquire(Subsystem.HELIOS)
+
+    started = asyncio.get_running_loop().time()
+    with pytest.raises(AdmissionRejectedError) as excinfo:
+        await admission.acquire(Subsystem.HELIOS, timeout_seconds=0.01)
+
+    assert excinfo.value.reason == "timeout"
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert admission.queue_depth == 0
+
+
+@pytest.mark.anyio
+async def test_admission_slot_releases_on_error():
+    admission = AdmissionController(max_in_flight=1)
+
+    with pytest.raises(ValueError):
+        async with admission.slot(Subsystem.ECLIPSE):
+            raise ValueError("boom")
+
+    assert admission.in_flight == 0
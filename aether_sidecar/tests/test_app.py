@@ -1,8 +1,21 @@
+import asyncio
+import json
+
+import pytest
 from fastapi.testclient import TestClient
 
 from aether_sidecar import app as app_module
-from aether_sidecar.backends import BackendAttemptSummary, BackendUnavailableError
+from aether_sidecar.backends import (
+    BackendAttemptSummary,
+    BackendDeadlineExceededError,
+    BackendUnavailableError,
+    HealthSnapshot,
+    StreamChunk,
+)
 from aether_sidecar.config import settings
+from aether_sidecar.deadline import remaining_seconds
+from aether_sidecar.models import Subsystem
+from aether_sidecar.observability import registry
 
 activation_registry = app_module.activation_registry
 app = app_module.app
@@ -19,6 +32,9 @@ class FakeBackend:
     def connection_attempt_chain(self):
         return ["http://127.0.0.1:11434/api/generate", "http://localhost:11434/api/generate"]
 
+    def circuit_breaker_states(self):
+        return {"http://127.0.0.1:11434/api/generate": "open", "http://localhost:11434/api/generate": "closed"}
+
     async def generate(self, prompt: str, subsystem):
         scope = "general" if "Request scope: general-conversation" in prompt else "minecraft"
         return f"[{scope}] simulated model response", f"fake-{subsystem.value.lower()}", BackendAttemptSummary()
@@ -32,6 +48,17 @@ def setup_function() -> None:
     settings.dev_playground_enabled = False
     settings.dev_playground_token = None
     settings.ollama_keep_alive = "15m"
+    settings.generate_coalesce_enabled = False
+    settings.generate_coalesce_exclude_history = True
+    settings.response_cache_enabled = False
+    settings.admission_enabled = False
+    settings.generate_deadline_seconds = 60.0
+    app_module.response_cache.clear()
+    app_module.semantic_cache = None
+    app_module.model_cascade = None
+    app_module.subsystem_classifier = None
+    settings.router_classifier_min_confidence = 0.6
+    settings.route_batch_max_messages = 10_000
     app_module.backend = FakeBackend()
 
 
@@ -80,6 +107,7 @@ def test_metrics_endpoint_available():
     assert "aether_backend_attempts_total" in response.text
     assert "aether_backend_attempt_latency_seconds" in response.text
     assert "aether_generate_fallback_hops" in response.text
+    assert "aether_backend_pool_connections" in response.text
 
 
 def test_health_returns_keep_alive_setting():
@@ -102,6 +130,10 @@ def test_status_reports_model_online_with_runtime_details():
     assert body["model"]["status"] == "online"
     assert body["model"]["checked_model"] == "fake-aegis"
     assert body["model"]["attempted_urls"] == ["http://127.0.0.1:11434/api/generate", "http://localhost:11434/api/generate"]
+    assert body["model"]["circuit_breakers"] == {
+        "http://127.0.0.1:11434/api/generate": "open",
+        "http://localhost:11434/api/generate": "closed",
+    }
     assert body["uptime_seconds"] >= 0
 
 
@@ -122,6 +154,52 @@ def test_status_reports_model_offline_when_backend_unavailable():
 
 
 
+def test_status_serves_cached_health_snapshot_without_warmup():
+    class ProbedBackend(FakeBackend):
+        async def warmup(self, subsystem):
+            raise AssertionError("status must not run a warmup generation")
+
+        async def health_snapshot(self):
+            return HealthSnapshot(
+                online=True,
+                checked_at=1700000000.0,
+                latency_ms=3,
+                reachable_urls=["http://127.0.0.1:11434/api/generate"],
+                loaded_models=["llama3.1:8b"],
+            )
+
+    app_module.backend = ProbedBackend()
+
+    response = client.get("/status")
+
+    assert response.status_code == 200
+    model = response.json()["model"]
+    assert model["status"] == "online"
+    assert model["loaded_models"] == ["llama3.1:8b"]
+    assert model["latency_ms"] == 3
+    assert model["checked_at"] == 1700000000.0
+
+
+def test_status_does_not_use_up_a_half_open_breaker_trial(monkeypatch):
+    from aether_sidecar.backends import OllamaBackend
+
+    recovering_url = "http://127.0.0.1:11434/api/generate"
+    other_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(recovering_url, "llama3.1:8b", fallback_urls=[other_url])
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [recovering_url, other_url])
+    backend._store_health_snapshot({recovering_url: {"models": []}, other_url: {"models": []}}, 0.0)
+    breaker = backend._breaker_for(recovering_url)
+    breaker.trip()
+    breaker._opened_at -= breaker.policy.open_seconds
+    app_module.backend = backend
+
+    for _ in range(2):
+        response = client.get("/status")
+        assert response.json()["model"]["circuit_breakers"][recovering_url] == "half_open"
+
+    assert backend._eligible_candidate_urls() == [recovering_url, other_url]
+
+
 def test_status_handles_invalid_connection_attempt_chain_payload():
     class WeirdBackend:
         async def warmup(self, subsystem):
@@ -363,6 +441,69 @@ def test_generate_returns_503_when_model_backend_unavailable():
     assert response.json()["detail"] == "backend offline"
 
 
+def test_generate_propagates_deadline_budget_to_backend_and_reports_usage():
+    seen_budgets = []
+
+    class BudgetBackend:
+        async def generate(self, prompt: str, subsystem):
+            seen_budgets.append(remaining_seconds())
+            return "ok", "fake", BackendAttemptSummary()
+
+    app_module.backend = BudgetBackend()
+
+    from_header = client.post(
+        "/generate",
+        headers={"X-Aether-Deadline-Ms": "250"},
+        json={"message": "hello", "subsystem": "Aegis", "session_id": "deadline-header", "deadline_ms": 9000},
+    )
+    from_field = client.post(
+        "/generate", json={"message": "hello", "subsystem": "Aegis", "session_id": "deadline-field", "deadline_ms": 9000}
+    )
+    settings.generate_deadline_seconds = 0
+    unbounded = client.post("/generate", json={"message": "hello", "subsystem": "Aegis", "session_id": "deadline-off"})
+
+    assert from_header.json()["deadline_ms"] == 250
+    assert from_header.json()["deadline_used_ms"] <= 250
+    assert 0 < seen_budgets[0] <= 0.25
+    assert from_field.json()["deadline_ms"] == 9000
+    assert 8.5 < seen_budgets[1] <= 9.0
+    assert unbounded.json()["deadline_ms"] is None
+    assert seen_budgets[2] is None
+
+
+def test_generate_returns_504_when_deadline_expires():
+    class SlowBackend:
+        async def generate(self, prompt: str, subsystem):
+            raise BackendDeadlineExceededError("Deadline expired waiting for model backend")
+
+    app_module.backend = SlowBackend()
+
+    response = client.post(
+        "/generate",
+        headers={"X-Aether-Deadline-Ms": "50"},
+        json={"message": "hello", "subsystem": "Aegis", "session_id": "deadline-expired"},
+    )
+
+    assert response.status_code == 504
+    assert "Deadline expired" in response.json()["detail"]
+
+
+def test_generate_maps_admission_wait_past_deadline_to_504():
+    settings.admission_enabled = True
+    app_module.admission._in_flight = app_module.admission.max_in_flight
+    try:
+        response = client.post(
+            "/generate",
+            headers={"X-Aether-Deadline-Ms": "20"},
+            json={"message": "hello", "subsystem": "Aegis", "session_id": "deadline-queued"},
+        )
+    finally:
+        app_module.admission._in_flight = 0
+
+    assert response.status_code == 504
+    assert "queued" in response.json()["detail"]
+
+
 def test_warmup_returns_503_when_model_backend_unavailable():
     class DownBackend:
         async def warmup(self, subsystem):
@@ -384,3 +525,405 @@ def test_heath_redirects_to_status():
 
     assert response.status_code == 307
     assert response.headers["location"] == "/status"
+
+
+def test_generate_stream_emits_ndjson_tokens_and_done_event():
+    class StreamingBackend(FakeBackend):
+        async def generate_stream(self, prompt: str, subsystem):
+            for token in ["Stay ", "near ", "light."]:
+                yield StreamChunk(text=token, model_name="fake-stream")
+            yield StreamChunk(text="", model_name="fake-stream", done=True, attempt_summary=BackendAttemptSummary())
+
+    app_module.backend = StreamingBackend()
+
+    response = client.post(
+        "/generate/stream",
+        json={"message": "is it safe at night?", "subsystem": "Auto", "session_id": "stream-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["text"] for event in events[:-1]] == ["Stay ", "near ", "light."]
+    assert events[-1]["event"] == "done"
+    assert events[-1]["text"] == "Stay near light."
+    assert events[-1]["model_used"] == "fake-stream"
+    assert app_module.memory.history("stream-ndjson")[-1] == {"role": "assistant", "text": "Stay near light."}
+
+
+def test_generate_stream_supports_sse_for_non_streaming_backends():
+    response = client.post(
+        "/generate/stream",
+        headers={"Accept": "text/event-stream"},
+        json={"message": "rift anomaly near my machine", "subsystem": "Auto", "session_id": "stream-sse"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert blocks[0].startswith("event: token\ndata: ")
+    assert blocks[-1].startswith("event: done\ndata: ")
+    done = json.loads(blocks[-1].split("data: ", 1)[1])
+    assert done["subsystem_used"] == "Eclipse"
+    assert "[minecraft]" in done["text"]
+
+
+def test_generate_stream_returns_503_when_backend_fails_before_first_token():
+    class DownBackend:
+        async def generate(self, prompt: str, subsystem):
+            raise BackendUnavailableError("backend offline")
+
+    app_module.backend = DownBackend()
+
+    response = client.post(
+        "/generate/stream",
+        json={"message": "hello", "subsystem": "Auto", "session_id": "stream-down"},
+    )
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "backend offline"
+
+
+def test_generate_stream_releases_admission_slot_when_first_chunk_raises(monkeypatch):
+    from aether_sidecar.admission import AdmissionController
+
+    class BrokenStreamBackend(FakeBackend):
+        async def generate_stream(self, prompt: str, subsystem):
+            raise ValueError("malformed stream line")
+            yield
+
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    monkeypatch.setattr(app_module, "admission", controller)
+    settings.admission_enabled = True
+    app_module.backend = BrokenStreamBackend()
+
+    with pytest.raises(ValueError, match="malformed stream line"):
+        client.post("/generate/stream", json={"message": "hello", "subsystem": "Aegis", "session_id": "stream-broken"})
+
+    assert controller._in_flight == 0
+
+
+def test_generate_coalesces_identical_concurrent_requests_across_sessions():
+    calls = []
+
+    class SlowBackend(FakeBackend):
+        async def generate(self, prompt: str, subsystem):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return "shared answer", "fake-aegis", BackendAttemptSummary()
+
+    app_module.backend = SlowBackend()
+    settings.generate_coalesce_enabled = True
+    app_module.memory.append("coalesce-b", "player", "earlier turn only session b has")
+
+    def prepare(session_id):
+        payload = app_module.GenerateRequest(message="How do I stop taking damage at night?", session_id=session_id)
+        return app_module._prepare_generation(payload, None, None)
+
+    async def run_both():
+        return await asyncio.gather(
+            app_module._backend_generate(prepare("coalesce-a")),
+            app_module._backend_generate(prepare("coalesce-b")),
+        )
+
+    results = asyncio.run(run_both())
+
+    assert len(calls) == 1
+    assert [text for text, _, _ in results] == ["shared answer", "shared answer"]
+
+
+def test_coalesced_follower_is_bounded_by_its_own_deadline():
+    class SlowBackend(FakeBackend):
+        async def generate(self, prompt: str, subsystem):
+            await asyncio.sleep(0.2)
+            return "shared answer", "fake-aegis", BackendAttemptSummary()
+
+    app_module.backend = SlowBackend()
+    settings.generate_coalesce_enabled = True
+
+    def prepare(session_id):
+        payload = app_module.GenerateRequest(message="How do I stop taking damage at night?", session_id=session_id)
+        return app_module._prepare_generation(payload, None, None)
+
+    async def run(session_id, budget_seconds):
+        with app_module.deadline_scope(budget_seconds):
+            return await app_module._backend_generate(prepare(session_id))
+
+    async def run_both():
+        leader = asyncio.ensure_future(run("coalesce-leader", 5.0))
+        await asyncio.sleep(0)
+        started = asyncio.get_running_loop().time()
+        with pytest.raises(BackendDeadlineExceededError):
+            await run("coalesce-follower", 0.02)
+        follower_elapsed = asyncio.get_running_loop().time() - started
+        return await leader, follower_elapsed
+
+    (text, _, _), follower_elapsed = asyncio.run(run_both())
+
+    assert text == "shared answer"
+    assert follower_elapsed < 0.15
+
+
+def test_coalescing_key_includes_history_when_configured():
+    app_module.memory.append("coalesce-history", "player", "previous question")
+    payload = app_module.GenerateRequest(message="same question", session_id="coalesce-history")
+    with_history = app_module._prepare_generation(payload, None, None)
+    without_history = app_module._prepare_generation(
+        app_module.GenerateRequest(message="same question", session_id="coalesce-fresh"), None, None
+    )
+
+    assert app_module._coalescing_key(with_history) == app_module._coalescing_key(without_history)
+
+    settings.generate_coalesce_exclude_history = False
+    assert app_module._coalescing_key(with_history) != app_module._coalescing_key(without_history)
+
+
+def test_generate_serves_repeated_question_from_response_cache():
+    calls = []
+
+    class CountingBackend(FakeBackend):
+        async def generate(self, prompt: str, subsystem):
+            calls.append(prompt)
+            return "light up the area", "fake-aegis", BackendAttemptSummary()
+
+    app_module.backend = CountingBackend()
+    settings.response_cache_enabled = True
+    request = {"message": "How do I stop taking damage at night?", "subsystem": "Auto", "session_id": "cache-a"}
+
+    first = client.post("/generate", json=request)
+    second = client.post("/generate", json={**request, "message": "how do i stop  taking damage at night?", "session_id": "cache-b"})
+    bypassed = client.post("/generate", headers={"X-Aether-Cache": "bypass"}, json=request)
+
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+    assert second.json()["text"] == "light up the area"
+    assert bypassed.json()["cached"] is False
+    assert len(calls) == 2
+    assert app_module.memory.history("cache-b")[-1] == {"role": "assistant", "text": "light up the area"}
+
+
+def test_generate_serves_paraphrase_from_semantic_cache():
+    pytest.importorskip("numpy")
+    from aether_sidecar.semantic_cache import SemanticCache
+
+    calls = []
+
+    class EmbeddingBackend(FakeBackend):
+        async def embed(self, text: str):
+            words = set(text.split())
+            return [1.0 if "night" in words else 0.0, 1.0 if "village" in words else 0.0, 0.1]
+
+        async def generate(self, prompt: str, subsystem):
+            calls.append(prompt)
+            return "build walls and light them", "fake-enforcer", BackendAttemptSummary()
+
+    app_module.backend = EmbeddingBackend()
+    app_module.semantic_cache = SemanticCache(threshold=0.95)
+
+    first = client.post(
+        "/generate",
+        json={"message": "my base keeps getting attacked at night", "subsystem": "Enforcer", "session_id": "semantic-a"},
+    )
+    second = client.post(
+        "/generate",
+        json={"message": "mobs keep hitting my shelter after dark at night", "subsystem": "Enforcer", "session_id": "semantic-b"},
+    )
+
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+    assert second.json()["text"] == "build walls and light them"
+    assert len(calls) == 1
+
+
+def test_semantic_cache_lookup_runs_under_the_request_deadline():
+    pytest.importorskip("numpy")
+    from aether_sidecar.semantic_cache import SemanticCache
+
+    budgets = []
+
+    class EmbeddingBackend(FakeBackend):
+        async def embed(self, text: str):
+            budgets.append(remaining_seconds())
+            return [1.0, 0.0]
+
+    app_module.backend = EmbeddingBackend()
+    app_module.semantic_cache = SemanticCache(threshold=0.95)
+
+    for path in ("/generate", "/generate/stream"):
+        response = client.post(
+            path,
+            headers={"X-Aether-Deadline-Ms": "5000"},
+            json={"message": "where is the nearest village", "subsystem": "Terra", "session_id": "semantic-deadline"},
+        )
+        assert response.status_code == 200
+
+    assert len(budgets) == 2
+    assert all(budget is not None and 0 < budget <= 5.0 for budget in budgets)
+
+
+def test_auto_routing_uses_classifier_when_confident_and_keywords_otherwise():
+    pytest.importorskip("numpy")
+    from aether_sidecar.classifier import SubsystemClassifier
+
+    app_module.subsystem_classifier = SubsystemClassifier.train(
+        ["zombies keep breaking into my village", "the villagers need walls against raids", "my generator is out of fuel"],
+        [Subsystem.ENFORCER, Subsystem.ENFORCER, Subsystem.HELIOS],
+        dimensions=4096,
+    )
+    request = {"message": "zombies keep breaking into my village at night", "subsystem": "Auto", "session_id": "classifier-a"}
+
+    routed = client.post("/generate", json=request)
+    settings.router_classifier_min_confidence = 1.01
+    fallback = client.post("/generate", json={**request, "session_id": "classifier-b"})
+
+    assert routed.json()["subsystem_used"] == "Enforcer"
+    assert fallback.json()["subsystem_used"] == "Aegis"
+    assert registry.get_sample_value("aether_router_auto_decisions_total", {"source": "classifier", "subsystem": "Enforcer"}) >= 1
+
+
+def test_route_batch_streams_one_ndjson_line_per_message_without_calling_backend(monkeypatch):
+    class NoInferenceBackend(FakeBackend):
+        async def generate(self, prompt: str, subsystem):
+            raise AssertionError("route/batch must not call the model")
+
+    app_module.backend = NoInferenceBackend()
+    monkeypatch.setattr(app_module, "ROUTE_BATCH_CHUNK_SIZE", 2)
+    messages = ["a rift anomaly near my base", "kill yourself", "x" * (settings.max_message_chars + 1), "hello there"]
+
+    response = client.post("/route/batch", json={"messages": messages})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [row["index"] for row in rows] == [0, 1, 2, 3]
+    assert rows[0]["subsystem"] == "Eclipse"
+    assert rows[0]["routed_by"] == "keywords"
+    assert rows[0]["subsystem_alerts"] == {"Eclipse": ["rift", "anomaly"]}
+    assert rows[0]["minecraft_related"] is True
+    assert rows[1]["blocked"] is True
+    assert rows[1]["safety_flags"] == ["kill yourself"]
+    assert rows[2] == {"index": 2, "error": f"message exceeds {settings.max_message_chars} chars"}
+    assert rows[3]["minecraft_related"] is False
+
+
+def test_route_batch_uses_classifier_and_enforces_batch_limit():
+    pytest.importorskip("numpy")
+    from aether_sidecar.classifier import SubsystemClassifier
+
+    app_module.subsystem_classifier = SubsystemClassifier.train(
+        ["zombies keep breaking into my village", "my generator is out of fuel"],
+        [Subsystem.ENFORCER, Subsystem.HELIOS],
+        dimensions=4096,
+    )
+
+    rows = [
+        json.loads(line)
+        for line in client.post("/route/batch", json={"messages": ["zombies broke into my village again"]}).text.splitlines()
+    ]
+    settings.route_batch_max_messages = 1
+    too_many = client.post("/route/batch", json={"messages": ["one", "two"]})
+
+    assert rows[0]["subsystem"] == "Enforcer"
+    assert rows[0]["routed_by"] == "classifier"
+    assert 0.6 <= rows[0]["confidence"] <= 1.0
+    assert too_many.status_code == 400
+
+
+def test_generate_returns_429_with_retry_after_when_admission_queue_is_full(monkeypatch):
+    from aether_sidecar.admission import AdmissionController
+
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    controller._in_flight = 1
+    monkeypatch.setattr(app_module, "admission", controller)
+    settings.admission_enabled = True
+
+    response = client.post(
+        "/generate",
+        json={"message": "is it safe to mine here", "subsystem": "Aegis", "session_id": "admission-full"},
+    )
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_generate_reports_backend_prefill_time():
+    class PrefillBackend(FakeBackend):
+        async def generate(self, prompt: str, subsystem):
+            return "ok", "fake-terra", BackendAttemptSummary(attempts=1, prefill_ms=37)
+
+    app_module.backend = PrefillBackend()
+
+    response = client.post("/generate", json={"message": "where to dig", "subsystem": "Terra", "session_id": "prefill"})
+
+    assert response.status_code == 200
+    assert response.json()["prefill_ms"] == 37
+
+
+def test_generate_escalates_through_model_cascade():
+    from aether_sidecar.cascade import ModelCascade
+
+    class CascadeBackend(FakeBackend):
+        async def generate(self, prompt: str, subsystem, model_name=None):
+            if model_name == "small":
+                return "I'm not sure.", model_name, BackendAttemptSummary(attempts=1)
+            return "Build a beacon for Haste II.", model_name, BackendAttemptSummary(attempts=1)
+
+    app_module.backend = CascadeBackend()
+    app_module.model_cascade = ModelCascade(["small", "large"])
+
+    response = client.post(
+        "/generate",
+        json={"message": "how to mine faster", "subsystem": "Terra", "session_id": "cascade", "complexity_hint": "low"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["model_used"] == "large"
+    assert response.json()["text"] == "Build a beacon for Haste II."
+
+
+class _DisconnectingRequest:
+    def __init__(self, disconnect_after: float):
+        self.disconnect_after = disconnect_after
+
+    async def receive(self):
+        await asyncio.sleep(self.disconnect_after)
+        return {"type": "http.disconnect"}
+
+
+def test_client_disconnect_cancels_backend_work_and_is_counted():
+    prepared = app_module._prepare_generation(
+        app_module.GenerateRequest(message="hello", subsystem="Aegis", session_id="disconnect"), None, None
+    )
+    cancelled = []
+
+    async def slow_generation():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def cancelled_count():
+        return registry.get_sample_value(
+            "aether_generate_cancelled_total", {"subsystem": "Aegis", "endpoint": "generate"}
+        ) or 0.0
+
+    before = cancelled_count()
+    result = asyncio.run(app_module._unless_disconnected(_DisconnectingRequest(0.01), prepared, slow_generation()))
+
+    assert result is None
+    assert cancelled == [True]
+    assert cancelled_count() == before + 1
+
+
+def test_finished_backend_work_wins_over_a_later_disconnect():
+    prepared = app_module._prepare_generation(
+        app_module.GenerateRequest(message="hello", subsystem="Aegis", session_id="no-disconnect"), None, None
+    )
+
+    async def quick_generation():
+        return "done"
+
+    result = asyncio.run(app_module._unless_disconnected(_DisconnectingRequest(5), prepared, quick_generation()))
+
+    assert result == "done"
@@ -1,10 +1,21 @@
+import asyncio
+import json as json_module
 import socket
 from urllib.parse import urlparse
 import httpx
 import pytest
 
-from aether_sidecar.backends import BackendUnavailableError, OllamaBackend
+from aether_sidecar.backends import BackendDeadlineExceededError, BackendUnavailableError, OllamaBackend
+from aether_sidecar.circuit import BreakerPolicy
+from aether_sidecar.deadline import deadline_scope
 from aether_sidecar.models import Subsystem
+from aether_sidecar.observability import registry
+from aether_sidecar.retry import RetryBudget, RetryPolicy
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
 
 
 @pytest.fixture(autouse=True)
@@ -27,6 +38,10 @@ class _FakeResponse:
     def json(self) -> dict[str, str]:
         return self._data
 
+    @property
+    def content(self) -> bytes:
+        return json_module.dumps(self._data).encode("utf-8")
+
 
 class _FakeAsyncClient:
     def __init__(self, responses_by_url, calls):
@@ -39,13 +54,53 @@ class _FakeAsyncClient:
     async def __aexit__(self, exc_type, exc, tb):
         return False
 
-    async def post(self, url, json):
+    async def aclose(self):
+        self.closed = True
+
+    async def post(self, url, content, headers=None):
         self.calls.append(url)
         action = self.responses_by_url.get(url)
         if isinstance(action, Exception):
             raise action
         return action
 
+    async def get(self, url, timeout=None):
+        self.calls.append(url)
+        action = self.responses_by_url.get(url)
+        if isinstance(action, Exception):
+            raise action
+        return action
+
+    def stream(self, method, url, content, headers=None):
+        self.calls.append(url)
+        return _FakeStream(self.responses_by_url.get(url))
+
+
+class _FakeStream:
+    def __init__(self, action):
+        self.action = action
+
+    async def __aenter__(self):
+        if isinstance(self.action, Exception):
+            raise self.action
+        return self.action
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _FakeStreamResponse(_FakeResponse):
+    def __init__(self, lines: list[dict], status_code: int = 200):
+        super().__init__({}, status_code)
+        self._lines = lines
+
+    async def aread(self) -> bytes:
+        return b""
+
+    async def aiter_lines(self):
+        for line in self._lines:
+            yield json_module.dumps(line)
+
 
 @pytest.mark.anyio
 async def test_candidate_urls_for_localhost_use_docker_host_fallbacks(monkeypatch):
@@ -496,3 +551,876 @@ def test_connection_attempt_chain_matches_eligible_candidate_urls(monkeypatch):
     monkeypatch.setattr(backend, "_eligible_candidate_urls", lambda: ["a", "b"])
 
     assert backend.connection_attempt_chain() == ["a", "b"]
+
+
+@pytest.mark.anyio
+async def test_generate_reuses_pooled_client_per_url(monkeypatch):
+    local_url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(local_url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [local_url])
+
+    calls = []
+    created = []
+
+    def fake_client_factory(*args, **kwargs):
+        client = _FakeAsyncClient({local_url: _FakeResponse({"response": "ok"})}, calls)
+        created.append((client, kwargs))
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", fake_client_factory)
+
+    await backend.generate("hello", Subsystem.AEGIS)
+    await backend.generate("hello again", Subsystem.AEGIS)
+
+    assert calls == [local_url, local_url]
+    assert len(created) == 1
+    assert created[0][1]["limits"].max_connections == backend.pool_max_connections
+
+    await backend.aclose()
+
+    assert created[0][0].closed is True
+    assert backend._clients == {}
+
+
+@pytest.mark.anyio
+async def test_failover_skips_a_url_at_its_in_flight_cap(monkeypatch):
+    busy_url = "http://127.0.0.1:11434/api/generate"
+    spare_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(busy_url, "llama3.1:8b", fallback_urls=[spare_url], max_in_flight_per_url=1)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [busy_url, spare_url])
+    calls = []
+    responses_by_url = {busy_url: _FakeResponse({"response": "busy"}), spare_url: _FakeResponse({"response": "spare"})}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+
+    async with backend._track_in_flight(busy_url):
+        assert backend.connection_attempt_chain() == [spare_url, busy_url]
+        text, _, _ = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "spare"
+    assert calls == [spare_url]
+
+
+@pytest.mark.anyio
+async def test_requests_queue_for_a_slot_on_a_saturated_url():
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", max_in_flight_per_url=1)
+    running = []
+
+    async def hold():
+        async with backend._track_in_flight(url):
+            running.append(url)
+            await asyncio.sleep(0.02)
+            running.remove(url)
+
+    async def watch():
+        peak = 0
+        for _ in range(10):
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.005)
+        return peak
+
+    *_, peak = await asyncio.gather(hold(), hold(), watch())
+
+    assert peak == 1
+
+
+@pytest.mark.anyio
+async def test_pool_metrics_follow_in_flight_count_without_httpx_internals():
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", pool_max_connections=1)
+    backend._clients[url] = object()
+
+    def pool_connections(state):
+        return registry.get_sample_value("aether_backend_pool_connections", {"url": url, "state": state})
+
+    async with backend._track_in_flight(url), backend._track_in_flight(url), backend._track_in_flight(url):
+        assert pool_connections("in_use") == 1
+        assert pool_connections("waiting") == 2
+
+    assert pool_connections("in_use") == 0
+    assert pool_connections("waiting") == 0
+
+
+@pytest.mark.anyio
+async def test_startup_creates_pools_for_candidate_urls(monkeypatch):
+    backend = OllamaBackend(
+        "http://127.0.0.1:11434/api/generate",
+        "llama3.1:8b",
+        pool_max_connections=4,
+        pool_keepalive_expiry_seconds=5.0,
+    )
+    monkeypatch.setattr(backend, "candidate_urls", lambda: ["a", "b"])
+
+    await backend.startup()
+
+    assert sorted(backend._clients) == ["a", "b"]
+    assert backend._pool_limits().max_connections == 4
+    assert backend._pool_limits().keepalive_expiry == 5.0
+
+    await backend.aclose()
+
+
+@pytest.mark.anyio
+async def test_generate_stream_yields_tokens_and_falls_back_before_first_token(monkeypatch):
+    local_url = "http://127.0.0.1:11434/api/generate"
+    fallback_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(local_url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [local_url, fallback_url])
+
+    calls = []
+    responses_by_url = {
+        local_url: httpx.ConnectError("refused", request=httpx.Request("POST", local_url)),
+        fallback_url: _FakeStreamResponse(
+            [
+                {"response": "Build ", "done": False},
+                {"response": "walls.", "done": False},
+                {"response": "", "done": True},
+            ]
+        ),
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+
+    chunks = [chunk async for chunk in backend.generate_stream("hello", Subsystem.AEGIS)]
+
+    assert [chunk.text for chunk in chunks if not chunk.done] == ["Build ", "walls."]
+    assert chunks[-1].done is True
+    assert chunks[-1].attempt_summary.fallback_hops == 1
+    assert calls == [local_url, fallback_url]
+
+
+@pytest.mark.anyio
+async def test_generate_stream_raises_on_empty_stream(monkeypatch):
+    local_url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(local_url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [local_url])
+    responses_by_url = {local_url: _FakeStreamResponse([{"response": "", "done": True}])}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, []))
+
+    with pytest.raises(BackendUnavailableError) as exc_info:
+        async for _ in backend.generate_stream("hello", Subsystem.AEGIS):
+            pass
+
+    assert "returned an empty response" in str(exc_info.value)
+
+
+class _SlowAsyncClient(_FakeAsyncClient):
+    def __init__(self, responses_by_url, calls, delays_by_url):
+        super().__init__(responses_by_url, calls)
+        self.delays_by_url = delays_by_url
+
+    async def post(self, url, content, headers=None):
+        await asyncio.sleep(self.delays_by_url.get(url, 0.0))
+        return await super().post(url, content, headers)
+
+
+@pytest.mark.anyio
+async def test_generate_gives_each_hop_only_the_remaining_deadline(monkeypatch):
+    slow_url = "http://127.0.0.1:11434/api/generate"
+    fallback_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(slow_url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [slow_url, fallback_url])
+    calls = []
+    responses_by_url = {slow_url: _FakeResponse({"response": "slow"}), fallback_url: _FakeResponse({"response": "ok"})}
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda *args, **kwargs: _SlowAsyncClient(responses_by_url, calls, {slow_url: 5.0})
+    )
+
+    started = asyncio.get_running_loop().time()
+    with deadline_scope(0.05), pytest.raises(BackendDeadlineExceededError):
+        await backend.generate("hello", Subsystem.AEGIS)
+
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert fallback_url not in calls
+    assert backend.circuit_breaker_states().get(slow_url, "closed") == "closed"
+    assert backend._url_backoff_until.get(slow_url, 0.0) == 0.0
+
+
+@pytest.mark.anyio
+async def test_embed_is_bounded_by_the_remaining_deadline(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    embed_url = "http://127.0.0.1:11434/api/embed"
+    backend = OllamaBackend(url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    responses_by_url = {embed_url: _FakeResponse({"embeddings": [[0.1]]})}
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda *args, **kwargs: _SlowAsyncClient(responses_by_url, calls, {embed_url: 5.0})
+    )
+
+    started = asyncio.get_running_loop().time()
+    with deadline_scope(0.05), pytest.raises(BackendDeadlineExceededError):
+        await backend.embed("hello")
+
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert backend.circuit_breaker_states().get(url, "closed") == "closed"
+
+
+class _HangingStream:
+    async def __aenter__(self):
+        await asyncio.sleep(5.0)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _SilentStreamResponse(_FakeStreamResponse):
+    async def aiter_lines(self):
+        await asyncio.sleep(5.0)
+        yield json_module.dumps({"response": "late"})
+
+
+@pytest.mark.anyio
+async def test_generate_stream_bounds_connect_and_first_line_by_the_deadline(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+
+    class HangingConnectClient(_FakeAsyncClient):
+        def stream(self, method, url, content, headers=None):
+            self.calls.append(url)
+            return _HangingStream()
+
+    for client in (HangingConnectClient({}, []), _FakeAsyncClient({url: _SilentStreamResponse([])}, [])):
+        backend._clients.clear()
+        monkeypatch.setattr(httpx, "AsyncClient", lambda *args, client=client, **kwargs: client)
+        started = asyncio.get_running_loop().time()
+        with deadline_scope(0.05), pytest.raises(BackendDeadlineExceededError):
+            async for _ in backend.generate_stream("hello", Subsystem.AEGIS):
+                pass
+
+        assert asyncio.get_running_loop().time() - started < 1.0
+    assert backend.circuit_breaker_states().get(url, "closed") == "closed"
+
+
+@pytest.mark.anyio
+async def test_generate_does_not_start_a_hop_once_the_deadline_is_spent(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient({url: _FakeResponse({"response": "ok"})}, calls)
+    )
+    monkeypatch.setattr("aether_sidecar.backends.remaining_seconds", lambda: 0.0)
+
+    with pytest.raises(BackendDeadlineExceededError):
+        await backend.generate("hello", Subsystem.AEGIS)
+    with pytest.raises(BackendDeadlineExceededError):
+        async for _ in backend.generate_stream("hello", Subsystem.AEGIS):
+            pass
+
+    assert calls == []
+
+
+class _SequenceAsyncClient(_FakeAsyncClient):
+    """Answer successive calls to a URL with the next response queued for it."""
+
+    async def post(self, url, content, headers=None):
+        self.calls.append(url)
+        action = self.responses_by_url[url].pop(0)
+        if isinstance(action, Exception):
+            raise action
+        return action
+
+    def stream(self, method, url, content, headers=None):
+        self.calls.append(url)
+        return _FakeStream(self.responses_by_url[url].pop(0))
+
+
+def _fast_retries(backend):
+    backend.retry_policy = RetryPolicy(base_delay_seconds=0.001, max_delay_seconds=0.001)
+
+
+@pytest.mark.anyio
+async def test_generate_fails_over_on_retryable_status(monkeypatch):
+    loading_url = "http://127.0.0.1:11434/api/generate"
+    healthy_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(loading_url, "llama3.1:8b")
+    _fast_retries(backend)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [loading_url, healthy_url])
+    calls = []
+    responses_by_url = {loading_url: [_FakeResponse({}, status_code=503)], healthy_url: [_FakeResponse({"response": "ok"})]}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SequenceAsyncClient(responses_by_url, calls))
+
+    text, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "ok"
+    assert calls == [loading_url, healthy_url]
+    assert summary.failed_attempts == 1
+    assert summary.fallback_hops == 1
+
+
+@pytest.mark.anyio
+async def test_generate_retries_last_candidate_after_backoff_until_model_loads(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b")
+    _fast_retries(backend)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    responses_by_url = {
+        url: [_FakeResponse({}, status_code=500), _FakeResponse({}, status_code=503), _FakeResponse({"response": "ok"})]
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SequenceAsyncClient(responses_by_url, calls))
+
+    text, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "ok"
+    assert calls == [url, url, url]
+    assert summary.attempts == 3
+
+
+@pytest.mark.anyio
+async def test_generate_raises_on_fatal_status_and_when_retries_run_out(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    other_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b")
+    _fast_retries(backend)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url, other_url])
+    calls = []
+    responses_by_url = {
+        url: [_FakeResponse({}, status_code=404), _FakeResponse({}, status_code=503)],
+        other_url: [_FakeResponse({}, status_code=503)] * 3,
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SequenceAsyncClient(responses_by_url, calls))
+
+    with pytest.raises(BackendUnavailableError, match="returned 404"):
+        await backend.generate("hello", Subsystem.AEGIS)
+    assert calls == [url]
+
+    with pytest.raises(BackendUnavailableError, match="returned 503"):
+        await backend.generate("hello", Subsystem.AEGIS)
+    assert calls == [url, url, other_url, other_url, other_url]
+
+
+@pytest.mark.anyio
+async def test_retry_budget_stops_retry_amplification(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", retry_budget=RetryBudget(ratio=0.0, capacity=1))
+    _fast_retries(backend)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    responses_by_url = {url: [_FakeResponse({}, status_code=503)] * 4}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SequenceAsyncClient(responses_by_url, calls))
+
+    with pytest.raises(BackendUnavailableError):
+        await backend.generate("hello", Subsystem.AEGIS)
+    with pytest.raises(BackendUnavailableError):
+        await backend.generate("hello", Subsystem.AEGIS)
+
+    assert calls == [url, url, url]
+
+
+@pytest.mark.anyio
+async def test_status_attempts_are_labelled_retry_only_when_another_attempt_follows(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", retry_policy=RetryPolicy(max_retries=1, base_delay_seconds=0.001))
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    responses_by_url = {url: [_FakeResponse({}, status_code=503)] * 2 + [_FakeStreamResponse([], status_code=503)]}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SequenceAsyncClient(responses_by_url, calls))
+
+    def attempts(operation, outcome):
+        labels = {"operation": operation, "url": url, "outcome": outcome}
+        return registry.get_sample_value("aether_backend_attempts_total", labels) or 0.0
+
+    keys = [(operation, outcome) for operation in ("generate", "generate_stream") for outcome in ("retry", "http_error")]
+    before = {key: attempts(*key) for key in keys}
+
+    with pytest.raises(BackendUnavailableError, match="returned 503"):
+        await backend.generate("hello", Subsystem.AEGIS)
+    with pytest.raises(BackendUnavailableError, match="returned 503"):
+        async for _ in backend.generate_stream("hello", Subsystem.AEGIS):
+            pass
+
+    assert attempts("generate", "retry") == before["generate", "retry"] + 1
+    assert attempts("generate", "http_error") == before["generate", "http_error"] + 1
+    assert attempts("generate_stream", "retry") == before["generate_stream", "retry"]
+    assert attempts("generate_stream", "http_error") == before["generate_stream", "http_error"] + 1
+
+
+@pytest.mark.anyio
+async def test_warmup_and_stream_fail_over_on_retryable_status(monkeypatch):
+    loading_url = "http://127.0.0.1:11434/api/generate"
+    healthy_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(loading_url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [loading_url, healthy_url])
+    calls = []
+    responses_by_url = {
+        loading_url: [_FakeResponse({}, status_code=503), _FakeStreamResponse([], status_code=503)],
+        healthy_url: [_FakeResponse({"response": "ready"}), _FakeStreamResponse([{"response": "hi", "done": True}])],
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SequenceAsyncClient(responses_by_url, calls))
+
+    assert await backend.warmup(Subsystem.AEGIS) == "llama3.1:8b"
+    stream_backend = OllamaBackend(loading_url, "llama3.1:8b")
+    monkeypatch.setattr(stream_backend, "candidate_urls", lambda: [loading_url, healthy_url])
+    chunks = [chunk async for chunk in stream_backend.generate_stream("hello", Subsystem.AEGIS)]
+
+    assert [chunk.text for chunk in chunks if not chunk.done] == ["hi"]
+    assert calls == [loading_url, healthy_url, loading_url, healthy_url]
+
+
+@pytest.mark.anyio
+async def test_hedged_generate_sends_duplicate_and_fast_fallback_wins(monkeypatch):
+    slow_url = "http://127.0.0.1:11434/api/generate"
+    fast_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(
+        slow_url, "llama3.1:8b", fallback_urls=[fast_url], hedge_enabled=True, hedge_delay_seconds=0.01
+    )
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [slow_url, fast_url])
+
+    calls = []
+    responses_by_url = {slow_url: _FakeResponse({"response": "slow"}), fast_url: _FakeResponse({"response": "fast"})}
+    delays_by_url = {slow_url: 5.0}
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda *args, **kwargs: _SlowAsyncClient(responses_by_url, calls, delays_by_url)
+    )
+
+    text, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "fast"
+    assert calls == [fast_url]
+    assert summary.attempts == 2
+    assert summary.fallback_hops == 1
+    assert backend._in_flight == {slow_url: 0, fast_url: 0}
+
+
+@pytest.mark.anyio
+async def test_hedged_generate_skips_duplicate_when_primary_is_fast(monkeypatch):
+    local_url = "http://127.0.0.1:11434/api/generate"
+    fallback_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(local_url, "llama3.1:8b", hedge_enabled=True, hedge_delay_seconds=1.0)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [local_url, fallback_url])
+
+    calls = []
+    responses_by_url = {local_url: _FakeResponse({"response": "primary"})}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+
+    text, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "primary"
+    assert calls == [local_url]
+    assert summary.attempts == 1
+
+
+@pytest.mark.anyio
+async def test_hedged_generate_never_duplicates_onto_an_alias_of_the_slow_host(monkeypatch):
+    slow_url = "http://127.0.0.1:11434/api/generate"
+    alias_url = "http://localhost:11434/api/generate"
+    backend = OllamaBackend(slow_url, "llama3.1:8b", hedge_enabled=True, hedge_delay_seconds=0.01)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [slow_url, alias_url])
+    calls = []
+    responses_by_url = {slow_url: _FakeResponse({"response": "slow"}), alias_url: _FakeResponse({"response": "alias"})}
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda *args, **kwargs: _SlowAsyncClient(responses_by_url, calls, {slow_url: 0.05})
+    )
+    before = registry.get_sample_value("aether_backend_hedges_total", {"operation": "generate"}) or 0.0
+
+    text, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "slow"
+    assert summary.attempts == 1
+    assert (registry.get_sample_value("aether_backend_hedges_total", {"operation": "generate"}) or 0.0) == before
+    assert backend._hedge_target([slow_url, alias_url], {0}, [slow_url]) is None
+
+
+def test_hedge_delay_uses_observed_p95_when_not_configured():
+    backend = OllamaBackend("http://127.0.0.1:11434/api/generate", "llama3.1:8b", hedge_enabled=True)
+
+    assert backend.hedge_delay() == OllamaBackend.HEDGE_DEFAULT_DELAY_SECONDS
+
+    for latency in range(1, 101):
+        backend._observe_generate_latency(latency / 100)
+
+    assert backend.hedge_delay() == pytest.approx(0.95)
+
+
+def test_eligible_candidate_urls_are_cached_between_requests(monkeypatch):
+    backend = OllamaBackend("http://127.0.0.1:11434/api/generate", "llama3.1:8b")
+    discoveries = []
+
+    def fake_candidate_urls():
+        discoveries.append(1)
+        return ["a", "b"]
+
+    monkeypatch.setattr(backend, "candidate_urls", fake_candidate_urls)
+
+    assert backend._eligible_candidate_urls() == ["a", "b"]
+    backend._preferred_url = "b"
+    assert backend._eligible_candidate_urls() == ["b", "a"]
+    assert len(discoveries) == 1
+
+
+def test_connect_error_invalidates_candidate_cache(monkeypatch):
+    backend = OllamaBackend("http://127.0.0.1:11434/api/generate", "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: ["a"])
+    backend._eligible_candidate_urls()
+    assert backend._candidate_resolver.is_stale() is False
+
+    backend._mark_url_failure("a", httpx.ConnectError("name not known", request=httpx.Request("POST", "http://a")))
+
+    assert backend._candidate_resolver.is_stale() is True
+
+
+@pytest.mark.anyio
+async def test_repeated_probe_failures_open_breaker_and_remove_url_from_attempt_chain(monkeypatch):
+    down_url = "http://127.0.0.1:11434/api/generate"
+    up_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(down_url, "llama3.1:8b", breaker_policy=BreakerPolicy(min_requests=2))
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [down_url, up_url])
+
+    calls = []
+    responses_by_url = {
+        "http://127.0.0.1:11434/api/ps": httpx.ConnectError("refused", request=httpx.Request("GET", down_url)),
+        "http://10.0.2.2:11434/api/ps": _FakeResponse({"models": []}),
+        up_url: _FakeResponse({"response": "ok"}),
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+
+    results = await backend.probe_candidates()
+
+    assert results == {down_url: None, up_url: {"models": []}}
+    assert backend.circuit_breaker_states() == {down_url: "closed", up_url: "closed"}
+
+    await backend.probe_candidates()
+
+    assert backend.circuit_breaker_states() == {down_url: "open", up_url: "closed"}
+    assert backend.connection_attempt_chain() == [up_url]
+
+    calls.clear()
+    _, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert calls == [up_url]
+    assert summary.fallback_hops == 0
+
+
+@pytest.mark.anyio
+async def test_successful_probe_half_opens_breaker_so_one_request_decides(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", retry_policy=RetryPolicy(max_retries=0))
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    backend._breaker_for(url).trip()
+    backend._url_backoff_until[url] = float("inf")
+
+    responses_by_url = {"http://127.0.0.1:11434/api/ps": _FakeResponse({"models": []}), url: _FakeResponse({}, 503)}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, []))
+
+    await backend.probe_candidates()
+
+    assert backend.circuit_breaker_states() == {url: "half_open"}
+    assert url not in backend._url_backoff_until
+
+    with pytest.raises(BackendUnavailableError, match="returned 503"):
+        await backend.generate("hello", Subsystem.AEGIS)
+    assert backend.circuit_breaker_states() == {url: "open"}
+
+    await backend.probe_candidates()
+    responses_by_url[url] = _FakeResponse({"response": "ok"})
+    await backend.generate("hello", Subsystem.AEGIS)
+
+    assert backend.circuit_breaker_states() == {url: "closed"}
+
+
+@pytest.mark.anyio
+async def test_half_open_trial_is_claimed_only_when_a_request_is_sent(monkeypatch):
+    recovering_url = "http://127.0.0.1:11434/api/generate"
+    other_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(recovering_url, "llama3.1:8b", fallback_urls=[other_url])
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [recovering_url, other_url])
+    breaker = backend._breaker_for(recovering_url)
+    breaker.trip()
+    breaker._opened_at -= breaker.policy.open_seconds
+
+    assert backend.connection_attempt_chain() == [recovering_url, other_url]
+    assert backend.connection_attempt_chain() == [recovering_url, other_url]
+
+    async with backend._track_in_flight(recovering_url):
+        assert backend.connection_attempt_chain() == [other_url]
+
+
+@pytest.mark.anyio
+async def test_embed_posts_to_api_embed_on_the_candidate_host(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", embedding_model="nomic-embed-text")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    responses_by_url = {"http://127.0.0.1:11434/api/embed": _FakeResponse({"embeddings": [[0.1, 0.2]]})}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+
+    assert await backend.embed("hello") == [0.1, 0.2]
+    assert calls == ["http://127.0.0.1:11434/api/embed"]
+
+
+def _balanced_backend(monkeypatch, mode, **kwargs):
+    backend = OllamaBackend("http://a/api/generate", "llama3.1:8b", fallback_urls=["http://b/api/generate"], routing_mode=mode, **kwargs)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: ["http://a/api/generate", "http://b/api/generate", "http://alias/api/generate"])
+    return backend
+
+
+def test_least_outstanding_routing_prefers_less_loaded_configured_host(monkeypatch):
+    backend = _balanced_backend(monkeypatch, "least_outstanding")
+    backend._in_flight = {"http://a/api/generate": 3, "http://b/api/generate": 1}
+
+    assert backend._eligible_candidate_urls() == ["http://b/api/generate", "http://a/api/generate", "http://alias/api/generate"]
+
+
+def test_least_outstanding_routing_scales_load_by_weight(monkeypatch):
+    backend = _balanced_backend(monkeypatch, "least_outstanding", routing_weights={"http://a/api/generate": 4.0})
+    backend._in_flight = {"http://a/api/generate": 3, "http://b/api/generate": 1}
+
+    assert backend._eligible_candidate_urls()[0] == "http://a/api/generate"
+
+
+def test_ewma_routing_prefers_faster_host(monkeypatch):
+    backend = _balanced_backend(monkeypatch, "ewma")
+    backend._observe_url_latency("http://a/api/generate", 2.0)
+    backend._observe_url_latency("http://b/api/generate", 0.5)
+
+    assert backend._eligible_candidate_urls()[0] == "http://b/api/generate"
+
+
+def test_balanced_routing_honors_backoff(monkeypatch):
+    backend = _balanced_backend(monkeypatch, "least_outstanding")
+    backend._in_flight = {"http://a/api/generate": 0, "http://b/api/generate": 5}
+    backend._url_backoff_until = {"http://a/api/generate": 200.0}
+    monkeypatch.setattr("aether_sidecar.backends.time.monotonic", lambda: 100.0)
+
+    assert backend._eligible_candidate_urls() == ["http://b/api/generate", "http://alias/api/generate"]
+
+
+@pytest.mark.anyio
+async def test_chat_mode_posts_messages_to_api_chat_and_reports_prefill(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    chat_url = "http://127.0.0.1:11434/api/chat"
+    backend = OllamaBackend(url, "llama3.1:8b", api_mode="chat")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls, payloads = [], []
+    responses_by_url = {
+        chat_url: _FakeResponse({"message": {"role": "assistant", "content": "ready"}, "prompt_eval_duration": 42_000_000})
+    }
+
+    class _RecordingClient(_FakeAsyncClient):
+        async def post(self, url, content, headers=None):
+            payloads.append(json_module.loads(content))
+            return await super().post(url, content, headers)
+
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _RecordingClient(responses_by_url, calls))
+
+    messages = [{"role": "system", "content": "profile"}, {"role": "user", "content": "hello"}]
+    text, _, summary = await backend.generate("ignored", Subsystem.TERRA, messages=messages)
+
+    assert text == "ready"
+    assert calls == [chat_url]
+    assert summary.prefill_ms == 42
+    assert payloads[0]["messages"][0]["role"] == "system"
+    assert payloads[0]["messages"][0]["content"].startswith("You are Terra")
+    assert payloads[0]["messages"][0]["content"].endswith("profile")
+    assert payloads[0]["messages"][1:] == [{"role": "user", "content": "hello"}]
+
+
+@pytest.mark.anyio
+async def test_health_snapshot_reports_loaded_models_and_is_reused_while_fresh(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b", probe_interval_seconds=10.0)
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls = []
+    responses_by_url = {"http://127.0.0.1:11434/api/ps": _FakeResponse({"models": [{"name": "llama3.1:8b"}]})}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+
+    first = await backend.health_snapshot()
+    second = await backend.health_snapshot()
+
+    assert first.online is True
+    assert first.loaded_models == ["llama3.1:8b"]
+    assert first.reachable_urls == [url]
+    assert second is first
+    assert calls == ["http://127.0.0.1:11434/api/ps"]
+
+
+@pytest.mark.anyio
+async def test_generate_prefers_host_where_model_is_already_loaded(monkeypatch):
+    cold_url = "http://127.0.0.1:11434/api/generate"
+    warm_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(cold_url, "llama3.1:8b", subsystem_models={Subsystem.ECLIPSE: "qwen2.5-coder"})
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [cold_url, warm_url])
+    calls = []
+    responses_by_url = {
+        "http://127.0.0.1:11434/api/ps": _FakeResponse({"models": [{"name": "llama3.1:8b"}]}),
+        "http://10.0.2.2:11434/api/ps": _FakeResponse({"models": [{"name": "qwen2.5-coder:latest"}]}),
+        cold_url: _FakeResponse({"response": "cold"}),
+        warm_url: _FakeResponse({"response": "warm"}),
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+    await backend.probe_candidates()
+    calls.clear()
+
+    eclipse_text, eclipse_model, _ = await backend.generate("hello", Subsystem.ECLIPSE)
+    aegis_text, _, _ = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert (eclipse_text, eclipse_model) == ("warm", "qwen2.5-coder")
+    assert aegis_text == "cold"
+    assert calls == [warm_url, cold_url]
+    assert backend.model_placement() == {cold_url: ["llama3.1:8b"], warm_url: ["qwen2.5-coder:latest"]}
+
+
+@pytest.mark.anyio
+async def test_generate_falls_back_to_cold_host_and_records_cold_load(monkeypatch):
+    warm_url = "http://127.0.0.1:11434/api/generate"
+    cold_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(warm_url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [warm_url, cold_url])
+    backend._placement = {warm_url: {"llama3.1:8b"}, cold_url: set()}
+    calls = []
+    responses_by_url = {
+        warm_url: httpx.ConnectError("down"),
+        cold_url: _FakeResponse({"response": "ok", "load_duration": 12_000_000_000}),
+    }
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, calls))
+    before = registry.get_sample_value("aether_backend_cold_loads_total", {"url": cold_url, "model": "llama3.1:8b"}) or 0.0
+
+    text, _, summary = await backend.generate("hello", Subsystem.AEGIS)
+
+    assert text == "ok"
+    assert calls == [warm_url, cold_url]
+    assert summary.fallback_hops == 1
+    assert "llama3.1:8b" in backend.model_placement()[cold_url]
+    assert registry.get_sample_value("aether_backend_cold_loads_total", {"url": cold_url, "model": "llama3.1:8b"}) == before + 1
+
+
+def test_placement_order_is_unchanged_without_a_warm_host():
+    first_url = "http://127.0.0.1:11434/api/generate"
+    second_url = "http://10.0.2.2:11434/api/generate"
+    backend = OllamaBackend(first_url, "llama3.1:8b")
+    backend._placement = {first_url: {"qwen2.5-coder:7b"}}
+
+    assert backend._placement_order([first_url, second_url], "llama3.1:8b") == [first_url, second_url]
+    assert backend._placement_order([first_url, second_url], "qwen2.5-coder:7b") == [first_url, second_url]
+    assert backend._placement_order([second_url, first_url], "qwen2.5-coder:7b") == [first_url, second_url]
+
+
+@pytest.mark.anyio
+async def test_health_snapshot_is_offline_when_no_candidate_answers(monkeypatch):
+    url = "http://127.0.0.1:11434/api/generate"
+    backend = OllamaBackend(url, "llama3.1:8b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    ps_url = "http://127.0.0.1:11434/api/ps"
+    responses_by_url = {ps_url: httpx.ConnectError("refused", request=httpx.Request("GET", ps_url))}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, []))
+
+    snapshot = await backend.health_snapshot()
+
+    assert snapshot.online is False
+    assert url in snapshot.detail
+
+
+def test_openai_backend_ignores_ollama_discovery_variables_and_service_names(monkeypatch):
+    from aether_sidecar.openai_backend import OpenAICompatibleBackend
+
+    monkeypatch.setenv("OLLAMA_HOST", "http://127.0.0.1:11434")
+    monkeypatch.setenv("AETHER_OLLAMA_URL", "http://ollama:11434/api/generate")
+    monkeypatch.setenv("AETHER_OLLAMA_FALLBACK_URLS", "http://gpu2:11434/api/generate")
+    monkeypatch.setattr(socket, "getaddrinfo", lambda *args, **kwargs: [("ok",)])
+    monkeypatch.setattr(OpenAICompatibleBackend, "_detect_linux_docker_gateway", staticmethod(lambda: None))
+    monkeypatch.setattr(OpenAICompatibleBackend, "_detect_resolv_conf_nameserver", staticmethod(lambda: None))
+    backend = OpenAICompatibleBackend(
+        "http://127.0.0.1:8080/v1/chat/completions", "qwen", fallback_urls=["http://cpu:8080/v1/chat/completions"]
+    )
+
+    candidates = backend.candidate_urls()
+
+    assert candidates[:2] == ["http://127.0.0.1:8080/v1/chat/completions", "http://cpu:8080/v1/chat/completions"]
+    assert "http://host.docker.internal:8080/v1/chat/completions" in candidates
+    assert all(url.endswith(":8080/v1/chat/completions") for url in candidates)
+    assert not any("//ollama" in url or "aether-ollama" in url for url in candidates)
+
+
+@pytest.mark.anyio
+async def test_openai_backend_posts_chat_completions_and_reads_choices(monkeypatch):
+    from aether_sidecar.openai_backend import OpenAICompatibleBackend
+
+    url = "http://127.0.0.1:8080/v1/chat/completions"
+    backend = OpenAICompatibleBackend(url, "qwen2.5-7b", api_key="secret")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    calls, payloads, client_kwargs = [], [], {}
+    responses_by_url = {
+        url: _FakeResponse({"choices": [{"message": {"content": "ready"}}], "timings": {"prompt_ms": 12.5}})
+    }
+
+    class _RecordingClient(_FakeAsyncClient):
+        async def post(self, url, content, headers=None):
+            payloads.append(json_module.loads(content))
+            return await super().post(url, content, headers)
+
+    def factory(*args, **kwargs):
+        client_kwargs.update(kwargs)
+        return _RecordingClient(responses_by_url, calls)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+
+    text, model_name, summary = await backend.generate("hello", Subsystem.HELIOS)
+
+    assert (text, model_name, summary.prefill_ms) == ("ready", "qwen2.5-7b", 12)
+    assert calls == [url]
+    assert client_kwargs["headers"] == {"Authorization": "Bearer secret"}
+    assert payloads[0]["messages"][0]["content"].startswith("You are Helios")
+    assert payloads[0]["messages"][1] == {"role": "user", "content": "hello"}
+
+
+@pytest.mark.anyio
+async def test_openai_backend_streams_server_sent_events(monkeypatch):
+    from aether_sidecar.openai_backend import OpenAICompatibleBackend
+
+    url = "http://127.0.0.1:8080/v1/chat/completions"
+    backend = OpenAICompatibleBackend(url, "qwen2.5-7b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+
+    class _SSEResponse(_FakeStreamResponse):
+        async def aiter_lines(self):
+            for line in self._lines:
+                yield line
+
+    lines = [
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        "",
+        'data: {"choices": [{"delta": {"content": "Stay "}}]}',
+        'data: {"choices": [{"delta": {"content": "lit."}, "finish_reason": "stop"}]}',
+        "data: [DONE]",
+    ]
+    responses_by_url = {url: _SSEResponse(lines)}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, []))
+
+    chunks = [chunk async for chunk in backend.generate_stream("hello", Subsystem.AEGIS)]
+
+    assert [chunk.text for chunk in chunks if not chunk.done] == ["Stay ", "lit."]
+    assert chunks[-1].done is True
+
+
+@pytest.mark.anyio
+async def test_openai_backend_health_snapshot_lists_served_models(monkeypatch):
+    from aether_sidecar.openai_backend import OpenAICompatibleBackend
+
+    url = "http://127.0.0.1:8080/v1/chat/completions"
+    backend = OpenAICompatibleBackend(url, "qwen2.5-7b")
+    monkeypatch.setattr(backend, "candidate_urls", lambda: [url])
+    responses_by_url = {"http://127.0.0.1:8080/v1/models": _FakeResponse({"data": [{"id": "qwen2.5-7b"}]})}
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _FakeAsyncClient(responses_by_url, []))
+
+    snapshot = await backend.health_snapshot()
+
+    assert snapshot.online is True
+    assert snapshot.loaded_models == ["qwen2.5-7b"]
+
+
+@pytest.mark.anyio
+async def test_echo_backend_is_deterministic():
+    from aether_sidecar.backends import EchoBackend
+
+    backend = EchoBackend("echo-model")
+    prompt = "Subsystem: Terra\nHistory:\n\nSession: s\nPlayer: where is iron\nAssistant guidance: ..."
+
+    text, model_name, summary = await backend.generate(prompt, Subsystem.TERRA)
+
+    assert text == "[Terra] echo: where is iron"
+    assert model_name == "echo-model"
+    assert summary.attempts == 1
+    assert await backend.embed("iron ore") == await backend.embed("iron ore")
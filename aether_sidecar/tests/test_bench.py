@@ -0,0 +1,129 @@
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from aether_sidecar import app as app_module
+from aether_sidecar.backends import BackendAttemptSummary
+from aether_sidecar.bench.fake_ollama import FakeOllamaProfile, LatencyDistribution, create_fake_ollama_app
+from aether_sidecar.bench.loadgen import LoadReport, RequestSample, parse_server_timing, percentiles
+from aether_sidecar.bench.micro import BENCHMARKS, compare
+from aether_sidecar.bench.micro import main as micro_main
+
+
+def test_fake_ollama_generate_returns_tokens_and_prefill_duration():
+    client = TestClient(create_fake_ollama_app(FakeOllamaProfile(latency=LatencyDistribution("fixed", 0.0), tokens=3)))
+
+    body = client.post("/api/generate", json={"model": "m", "prompt": "hi", "stream": False}).json()
+
+    assert body["response"] == "tok0 tok1 tok2"
+    assert body["done"] is True
+    assert body["prompt_eval_duration"] == 0
+
+
+def test_fake_ollama_streams_chat_ndjson():
+    client = TestClient(create_fake_ollama_app(FakeOllamaProfile(latency=LatencyDistribution("fixed", 0.0), tokens=2)))
+
+    resp = client.post("/api/chat", json={"model": "m", "messages": [], "stream": True})
+    lines = [json.loads(line) for line in resp.text.splitlines() if line]
+
+    assert [line["message"]["content"] for line in lines] == ["tok0 ", "tok1 ", ""]
+    assert lines[-1]["done"] is True
+
+
+def test_fake_ollama_error_rate_injects_server_errors():
+    client = TestClient(create_fake_ollama_app(FakeOllamaProfile(error_rate=1.0)))
+
+    resp = client.post("/api/generate", json={"model": "m", "prompt": "hi", "stream": False})
+
+    assert resp.status_code == 500
+
+
+def test_latency_distribution_parse_and_sample():
+    assert LatencyDistribution.parse("lognormal:0.2:0.5") == LatencyDistribution("lognormal", 0.2, 0.5)
+    assert LatencyDistribution.parse("fixed:0.1").sample(random.Random(1)) == 0.1
+    sample = LatencyDistribution.parse("uniform:1:0.5").sample(random.Random(1))
+    assert 0.5 <= sample <= 1.5
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("gaussian:1")
+
+
+def test_percentiles_use_nearest_rank():
+    assert percentiles([float(value) for value in range(1, 101)]) == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+    assert percentiles([]) == {"p50": None, "p95": None, "p99": None}
+
+
+def test_parse_server_timing_reads_named_duration():
+    header = 'backend;dur=120.5, total;dur=130.0, cache;desc="hit"'
+
+    assert parse_server_timing(header) == 120.5
+    assert parse_server_timing(header, "total") == 130.0
+    assert parse_server_timing(header, "missing") is None
+    assert parse_server_timing(None) is None
+
+
+def test_load_report_splits_sidecar_and_backend_time():
+    report = LoadReport(
+        duration_seconds=2.0,
+        samples=[RequestSample(100.0, 80.0, 200), RequestSample(50.0, 45.0, 200), RequestSample(5.0, None, 503)],
+    )
+
+    summary = report.summary()
+
+    assert summary["succeeded"] == 2
+    assert summary["throughput_rps"] == 1.0
+    assert summary["status_codes"] == {"200": 2, "503": 1}
+    assert summary["sidecar_ms"]["p99"] == 20.0
+
+
+def test_generate_reports_server_timing_header(monkeypatch):
+    class TimedBackend:
+        async def generate(self, prompt, subsystem):
+            return "ok", "fake", BackendAttemptSummary()
+
+    monkeypatch.setattr(app_module, "backend", TimedBackend())
+    monkeypatch.setattr(app_module, "model_cascade", None)
+    monkeypatch.setattr(app_module, "semantic_cache", None)
+    monkeypatch.setattr(app_module.settings, "response_cache_enabled", False)
+    app_module.activation_registry.activate("bench")
+    try:
+        resp = TestClient(app_module.app).post(
+            "/generate", json={"message": "hello there", "subsystem": "Aegis", "session_id": "bench-timing"}
+        )
+    finally:
+        app_module.activation_registry.deactivate("bench")
+
+    assert resp.status_code == 200
+    assert parse_server_timing(resp.headers["server-timing"]) is not None
+    assert parse_server_timing(resp.headers["server-timing"], "total") >= parse_server_timing(
+        resp.headers["server-timing"]
+    )
+
+
+def test_microbenchmark_compare_flags_slowdowns_over_threshold():
+    baseline = {"results": {"a": {"median_ns": 100.0}, "b": {"median_ns": 100.0}, "gone": {"median_ns": 1.0}}}
+    current = {"results": {"a": {"median_ns": 119.0}, "b": {"median_ns": 150.0}, "new": {"median_ns": 5.0}}}
+
+    regressions = compare(current, baseline, threshold=0.2)
+
+    assert [regression["name"] for regression in regressions] == ["b"]
+    assert regressions[0]["ratio"] == 1.5
+
+
+def test_microbenchmark_cli_saves_and_checks_baseline(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    argv = ["--filter", "safety.evaluate_message/long", "--repeat", "1", "--min-time", "0.001"]
+
+    assert micro_main([*argv, "--save", str(baseline_path)]) == 0
+    saved = json.loads(baseline_path.read_text())
+    assert list(saved["results"]) == ["safety.evaluate_message/long"]
+
+    saved["results"]["safety.evaluate_message/long"]["median_ns"] = 0.001
+    baseline_path.write_text(json.dumps(saved))
+    assert micro_main([*argv, "--baseline", str(baseline_path)]) == 1
+
+
+def test_microbenchmarks_all_run_once():
+    for benchmark in BENCHMARKS:
+        benchmark.setup()()
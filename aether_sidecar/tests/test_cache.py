@@ -0,0 +1,44 @@
+from aether_sidecar.cache import ResponseCache
+from aether_sidecar.models import Subsystem
+
+
+def test_cache_returns_hits_and_evicts_least_recently_used_entry():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", Subsystem.AEGIS, "answer a", "model")
+    cache.put("b", Subsystem.AEGIS, "answer b", "model")
+
+    assert cache.get("a", Subsystem.AEGIS).text == "answer a"
+
+    cache.put("c", Subsystem.AEGIS, "answer c", "model")
+
+    assert cache.get("b", Subsystem.AEGIS) is None
+    assert cache.get("a", Subsystem.AEGIS).text == "answer a"
+    assert cache.get("c", Subsystem.AEGIS).text == "answer c"
+    assert len(cache) == 2
+
+
+def test_cache_evicts_to_stay_within_byte_budget():
+    cache = ResponseCache(max_entries=100, max_bytes=40)
+    cache.put("a", Subsystem.AEGIS, "x" * 20, "m")
+    cache.put("b", Subsystem.AEGIS, "y" * 20, "m")
+
+    assert cache.get("a", Subsystem.AEGIS) is None
+    assert cache.get("b", Subsystem.AEGIS) is not None
+    assert cache.size_bytes <= 40
+
+
+def test_cache_expires_entries_using_per_subsystem_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("aether_sidecar.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache(default_ttl_seconds=300.0, subsystem_ttls={Subsystem.AEGIS: 10.0, Subsystem.REQUIEM: 0})
+
+    cache.put("hazard", Subsystem.AEGIS, "stay lit", "m")
+    cache.put("lore", Subsystem.REQUIEM, "long ago", "m")
+    cache.put("terrain", Subsystem.TERRA, "go north", "m")
+
+    assert cache.get("lore", Subsystem.REQUIEM) is None
+
+    now[0] = 111.0
+    assert cache.get("hazard", Subsystem.AEGIS) is None
+    assert cache.get("terrain", Subsystem.TERRA).text == "go north"
+    assert len(cache) == 1
@@ -0,0 +1,88 @@
+import pytest
+
+from aether_sidecar.backends import BackendAttemptSummary, BackendDeadlineExceededError, BackendUnavailableError
+from aether_sidecar.cascade import ModelCascade, answer_confidence, estimate_complexity
+from aether_sidecar.models import Subsystem
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_estimate_complexity_grows_with_length_alerts_and_history():
+    simple = estimate_complexity("hi", {}, 0)
+    complex_ = estimate_complexity("x" * 400, {Subsystem.ECLIPSE: ["rift", "anomaly", "void"]}, 6)
+
+    assert simple < 0.1
+    assert complex_ == 1.0
+
+
+def test_estimate_complexity_honors_client_hint():
+    assert estimate_complexity("x" * 400, {}, 6, hint="low") == 0.0
+    assert estimate_complexity("hi", {}, 0, hint="high") == 1.0
+
+
+def test_answer_confidence_penalizes_hedging_and_empty_answers():
+    assert answer_confidence("") == 0.0
+    assert answer_confidence("I'm not sure, maybe try the nether?") < 0.5
+    assert answer_confidence("Place torches every seven blocks to stop mob spawns.") == 1.0
+
+
+def test_starting_tier_scales_with_complexity():
+    cascade = ModelCascade(["small", "medium", "large"])
+
+    assert cascade.starting_model(Subsystem.AEGIS, 0.0) == "small"
+    assert cascade.starting_model(Subsystem.AEGIS, 0.5) == "medium"
+    assert cascade.starting_model(Subsystem.AEGIS, 1.0) == "large"
+
+
+@pytest.mark.anyio
+async def test_cascade_escalates_low_confidence_and_failed_tiers():
+    cascade = ModelCascade(["small", "medium", "large"], {Subsystem.TERRA: ["tiny", "small", "large"]})
+    calls = []
+
+    async def call(model_name):
+        calls.append(model_name)
+        if model_name == "tiny":
+            return "I don't know", model_name, BackendAttemptSummary(attempts=1)
+        if model_name == "small":
+            raise BackendUnavailableError("empty response")
+        return "Dig down at y=-58 for diamonds.", model_name, BackendAttemptSummary(attempts=1)
+
+    text, model_used, summary = await cascade.generate(call, Subsystem.TERRA, 0.0)
+
+    assert calls == ["tiny", "small", "large"]
+    assert model_used == "large"
+    assert text.startswith("Dig down")
+    assert summary.attempts == 2
+
+
+@pytest.mark.anyio
+async def test_cascade_accepts_last_tier_even_when_unsure_and_raises_when_it_fails():
+    cascade = ModelCascade(["small", "large"])
+
+    async def unsure(model_name):
+        return "not sure", model_name, BackendAttemptSummary()
+
+    async def broken(model_name):
+        raise BackendUnavailableError("down")
+
+    assert (await cascade.generate(unsure, Subsystem.AEGIS, 1.0))[1] == "large"
+    with pytest.raises(BackendUnavailableError):
+        await cascade.generate(broken, Subsystem.AEGIS, 1.0)
+
+
+@pytest.mark.anyio
+async def test_cascade_stops_instead_of_escalating_when_the_deadline_expires():
+    cascade = ModelCascade(["small", "medium", "large"])
+    calls = []
+
+    async def expired(model_name):
+        calls.append(model_name)
+        raise BackendDeadlineExceededError("Deadline expired before trying model backend")
+
+    with pytest.raises(BackendDeadlineExceededError):
+        await cascade.generate(expired, Subsystem.AEGIS, 0.0)
+
+    assert calls == ["small"]
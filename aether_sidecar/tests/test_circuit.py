@@ -0,0 +1,86 @@
+from aether_sidecar.circuit import BreakerPolicy, CircuitBreaker, CircuitState
+
+
+def test_breaker_opens_when_failure_rate_crosses_threshold():
+    breaker = CircuitBreaker("http://a", BreakerPolicy(window_size=4, min_requests=4, failure_rate_threshold=0.5))
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allows_requests() is False
+
+
+def test_breaker_half_opens_after_cooldown_and_closes_on_success(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("aether_sidecar.circuit.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("http://b", BreakerPolicy(min_requests=1, open_seconds=10.0))
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    now[0] = 111.0
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allows_requests() is True
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failure_rate() == 0.0
+
+
+def test_breaker_reopens_when_half_open_trial_fails(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("aether_sidecar.circuit.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("http://c", BreakerPolicy(min_requests=1, open_seconds=10.0))
+    breaker.record_failure()
+    now[0] = 111.0
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_trip_and_reset_force_transitions():
+    breaker = CircuitBreaker("http://d")
+
+    breaker.trip()
+    assert breaker.state == CircuitState.OPEN
+
+    breaker.reset()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_breaker_admits_a_single_trial(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("aether_sidecar.circuit.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("http://e", BreakerPolicy(min_requests=1, open_seconds=10.0))
+    breaker.record_failure()
+    now[0] = 111.0
+
+    assert breaker.allows_requests() is True
+    assert breaker.allows_requests() is True
+
+    breaker.record_attempt()
+    assert breaker.allows_requests() is False
+
+    now[0] = 122.0
+    assert breaker.allows_requests() is True
+
+    breaker.record_attempt()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allows_requests() is True
+
+
+def test_successful_probe_half_opens_an_open_breaker():
+    breaker = CircuitBreaker("http://f")
+    breaker.trip()
+
+    breaker.probe_succeeded()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
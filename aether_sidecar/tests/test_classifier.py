@@ -0,0 +1,79 @@
+import pytest
+
+from aether_sidecar.models import Subsystem
+
+pytest.importorskip("numpy")
+
+from aether_sidecar.classifier import SubsystemClassifier, hashed_features
+
+TEXTS = [
+    "I keep taking damage outside my shelter",
+    "how do I stay safe from lava tonight",
+    "there is a rift anomaly near my base",
+    "the portal corruption keeps spreading",
+    "my generator lost power again",
+    "the machines need more energy",
+    "zombies are attacking my wall",
+    "which weapon should I bring to the fight",
+]
+LABELS = [
+    Subsystem.AEGIS,
+    Subsystem.AEGIS,
+    Subsystem.ECLIPSE,
+    Subsystem.ECLIPSE,
+    Subsystem.HELIOS,
+    Subsystem.HELIOS,
+    Subsystem.ENFORCER,
+    Subsystem.ENFORCER,
+]
+
+
+def test_hashed_features_are_stable_distinct_and_case_insensitive():
+    features = hashed_features("Rift rift anomaly", dimensions=1024)
+
+    assert features == hashed_features("rift RIFT Anomaly", dimensions=1024)
+    assert features == sorted(set(features))
+    assert all(0 <= index < 1024 for index in features)
+    assert hashed_features("", dimensions=1024) == []
+
+
+def test_classifier_learns_subsystems_from_examples():
+    classifier = SubsystemClassifier.train(TEXTS, LABELS, dimensions=4096)
+
+    predictions = classifier.predict(["the rift anomaly grew", "zombies broke my wall", "no power in the generator"])
+
+    assert [subsystem for subsystem, _ in predictions] == [Subsystem.ECLIPSE, Subsystem.ENFORCER, Subsystem.HELIOS]
+    assert all(0.0 < confidence <= 1.0 for _, confidence in predictions)
+    assert classifier.labels == [Subsystem.AEGIS, Subsystem.ECLIPSE, Subsystem.HELIOS, Subsystem.ENFORCER]
+
+
+def test_batched_prediction_matches_single_messages():
+    classifier = SubsystemClassifier.train(TEXTS, LABELS, dimensions=4096)
+    messages = ["lava everywhere", "", "portal corruption", "bring a weapon"]
+
+    batched = classifier.predict(messages)
+
+    assert [subsystem for subsystem, _ in batched] == [classifier.classify(message)[0] for message in messages]
+    assert [confidence for _, confidence in batched] == pytest.approx([classifier.classify(message)[1] for message in messages])
+    assert classifier.predict([]) == []
+
+
+def test_classifier_round_trips_through_artifact(tmp_path):
+    classifier = SubsystemClassifier.train(TEXTS, LABELS, dimensions=4096)
+    artifact = tmp_path / "router_classifier"
+
+    classifier.save(artifact)
+    loaded = SubsystemClassifier.load(artifact)
+
+    assert artifact.exists()
+    assert loaded.labels == classifier.labels
+    assert loaded.dimensions == 4096
+    assert loaded.classify("the portal is unstable") == pytest.approx(classifier.classify("the portal is unstable"))
+
+
+def test_train_rejects_empty_or_mismatched_examples():
+    with pytest.raises(ValueError):
+        SubsystemClassifier.train([], [])
+
+    with pytest.raises(ValueError):
+        SubsystemClassifier.train(TEXTS, LABELS[:-1])
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from aether_sidecar.coalescing import SingleFlight, normalize_message, request_fingerprint
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_one_call_between_concurrent_callers():
+    flights = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def call():
+        calls.append(1)
+        await release.wait()
+        return "answer"
+
+    first = asyncio.create_task(flights.run("key", call))
+    second = asyncio.create_task(flights.run("key", call))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == ("answer", True)
+    assert await second == ("answer", False)
+    assert calls == [1]
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.anyio
+async def test_cancelled_leader_does_not_cancel_call_for_followers():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return "answer"
+
+    leader = asyncio.create_task(flights.run("key", call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.run("key", call))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    release.set()
+
+    assert await follower == ("answer", False)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.anyio
+async def test_last_waiter_cancelling_cancels_shared_call():
+    flights = SingleFlight()
+    started = asyncio.Event()
+    cancelled = []
+
+    async def call():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    waiter = asyncio.create_task(flights.run("key", call))
+    await started.wait()
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert cancelled == [1]
+
+
+def test_request_fingerprint_is_order_independent_and_normalizes_message():
+    first = request_fingerprint(message=normalize_message("How do I  stop DAMAGE?"), context={"a": 1, "b": 2})
+    second = request_fingerprint(message=normalize_message("how do i stop damage?"), context={"b": 2, "a": 1})
+
+    assert first == second
+    assert first != request_fingerprint(message="how do i stop damage?", context={"a": 2})
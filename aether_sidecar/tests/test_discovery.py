@@ -0,0 +1,64 @@
+import pytest
+
+from aether_sidecar.discovery import CandidateResolver
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_get_computes_once_and_serves_cache_until_ttl_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("aether_sidecar.discovery.time.monotonic", lambda: now[0])
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [f"url-{len(calls)}"]
+
+    resolver = CandidateResolver(compute, ttl_seconds=30.0)
+
+    assert resolver.get() == ["url-1"]
+    assert resolver.get() == ["url-1"]
+    assert len(calls) == 1
+
+    now[0] = 131.0
+    assert resolver.is_stale() is True
+    assert resolver.get() == ["url-2"]
+
+
+@pytest.mark.anyio
+async def test_stale_cache_is_refreshed_in_background():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [f"url-{len(calls)}"]
+
+    resolver = CandidateResolver(compute, ttl_seconds=60.0)
+    assert await resolver.refresh() == ["url-1"]
+
+    resolver.invalidate()
+    assert resolver.get() == ["url-1"]
+    await resolver._refresh_task
+
+    assert resolver.get() == ["url-2"]
+    assert resolver.is_stale() is False
+    await resolver.aclose()
+
+
+@pytest.mark.anyio
+async def test_failed_refresh_keeps_previous_urls():
+    results = [["url-1"], RuntimeError("dns exploded")]
+
+    def compute():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    resolver = CandidateResolver(compute, ttl_seconds=60.0)
+    await resolver.refresh()
+
+    assert await resolver.refresh() == ["url-1"]
@@ -0,0 +1,102 @@
+from aether_sidecar.models import Subsystem
+from aether_sidecar.prompting import build_prompt
+
+
+def _build(**overrides):
+    arguments = {
+        "session_id": "session-1",
+        "message": "where should I build",
+        "subsystem": Subsystem.TERRA,
+        "alerts": {},
+        "learned_context": ["Player prefers short answers"],
+        "player_context": {"health": 20},
+        "world_context": {"biome": "taiga"},
+        "history": [{"role": "player", "text": "hi"}, {"role": "assistant", "text": "hello"}],
+        "general_conversation": False,
+    }
+    arguments.update(overrides)
+    return build_prompt(**arguments)
+
+
+def test_prompt_keeps_session_stable_sections_before_per_turn_data():
+    first = _build().text()
+    second = _build(message="is it raining", player_context={"health": 4}, world_context={"weather": "rain"}).text()
+    stable_prefix = first.split("Session:")[0]
+
+    assert second.startswith(stable_prefix)
+    assert "Learned preferences/facts:\n- Player prefers short answers" in stable_prefix
+    assert "History:\nplayer: hi\nassistant: hello" in stable_prefix
+    assert "Player context" not in stable_prefix
+    assert "Request scope: minecraft-subsystem" in first
+
+
+def test_chat_messages_map_history_roles_and_end_with_the_current_turn():
+    messages = _build(general_conversation=True).chat_messages()
+
+    assert messages[0]["role"] == "system"
+    assert "Subsystem teaching profile" in messages[0]["content"]
+    assert [message["role"] for message in messages[1:]] == ["user", "assistant", "user"]
+    assert "Request scope: general-conversation" in messages[-1]["content"]
+    assert messages[-1]["content"].rstrip().endswith("without refusing.")
+
+
+def test_budget_trims_history_before_lessons_before_context():
+    history = [{"role": "player", "text": "x" * 400}, {"role": "assistant", "text": "y" * 400}]
+    untrimmed = _build(history=history, learned_context=["lesson " * 50])
+    budget = untrimmed.token_count - 150
+
+    trimmed = _build(history=history, learned_context=["lesson " * 50], token_budget=budget)
+
+    assert trimmed.token_count <= budget
+    assert trimmed.trimmed == {"history": 2}
+    assert "lesson" in trimmed.stable
+    assert "taiga" in trimmed.turn
+
+
+def test_budget_drops_context_keys_once_history_and_lessons_are_gone():
+    layout = _build(
+        history=[],
+        learned_context=[],
+        world_context={"biome": "taiga", "notes": "z" * 800},
+        token_budget=200,
+    )
+
+    assert layout.trimmed == {"context": 1}
+    assert "notes" not in layout.turn
+    assert "Player: where should I build" in layout.turn
+
+
+def test_budget_counts_tokens_with_a_pluggable_counter():
+    layout = _build(token_budget=10_000, count_tokens=lambda text: len(text.split()))
+
+    assert layout.token_count == len(layout.text().split())
+    assert layout.trimmed == {}
+
+
+def test_budget_trims_a_large_context_without_recounting_the_prompt_per_key():
+    calls = []
+
+    def counting(text):
+        calls.append(len(text))
+        return len(text) // 4
+
+    layout = _build(
+        history=[],
+        learned_context=[],
+        player_context={f"key{index}": "value" for index in range(5000)},
+        token_budget=200,
+        count_tokens=counting,
+    )
+
+    assert layout.token_count <= 200
+    assert layout.trimmed["context"] > 4000
+    assert len(calls) < 5000 + 10
+    assert sum(1 for length in calls if length > 1000) <= 2
+
+
+def test_context_is_capped_to_max_keys_before_the_budget_applies():
+    layout = _build(player_context={f"key{index}": index for index in range(10)}, context_max_keys=3)
+
+    assert "'key2': 2" in layout.turn
+    assert "key3" not in layout.turn
+    assert layout.trimmed == {"context": 7}
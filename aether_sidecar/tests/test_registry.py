@@ -0,0 +1,50 @@
+import pytest
+
+from aether_sidecar.backends import EchoBackend, OllamaBackend
+from aether_sidecar.config import Settings
+from aether_sidecar import registry
+from aether_sidecar.openai_backend import OpenAICompatibleBackend
+from aether_sidecar.registry import available_backends, create_backend, register_backend
+
+
+def test_create_backend_builds_each_registered_backend():
+    assert isinstance(create_backend(Settings(model_backend="ollama"), "llama3.1:8b"), OllamaBackend)
+    assert isinstance(create_backend(Settings(model_backend="OpenAI"), "qwen"), OpenAICompatibleBackend)
+    assert isinstance(create_backend(Settings(model_backend="echo"), "echo"), EchoBackend)
+
+
+def test_openai_backend_uses_its_own_urls_and_transport_settings():
+    settings = Settings(
+        model_backend="openai",
+        openai_url="http://gpu:8080/v1/chat/completions",
+        openai_fallback_urls="http://cpu:8080/v1/chat/completions",
+        openai_pool_max_connections=7,
+        ollama_pool_max_connections=3,
+        openai_routing_mode="least_outstanding",
+    )
+
+    backend = create_backend(settings, "qwen")
+
+    assert backend.configured_urls() == ["http://gpu:8080/v1/chat/completions", "http://cpu:8080/v1/chat/completions"]
+    assert backend.pool_max_connections == 7
+    assert backend.routing_mode == "least_outstanding"
+
+
+def test_admission_per_url_cap_reaches_the_backend_only_when_admission_is_enabled():
+    assert create_backend(Settings(model_backend="ollama"), "m").max_in_flight_per_url == 0
+
+    enabled = Settings(model_backend="ollama", admission_enabled=True, admission_max_in_flight_per_url=3)
+    assert create_backend(enabled, "m").max_in_flight_per_url == 3
+
+
+def test_create_backend_rejects_unknown_names():
+    with pytest.raises(RuntimeError, match="Unsupported model backend 'mystery'"):
+        create_backend(Settings(model_backend="mystery"), "x")
+
+
+def test_register_backend_adds_a_factory(monkeypatch):
+    monkeypatch.setattr(registry, "_FACTORIES", dict(registry._FACTORIES))
+    register_backend("test-echo")(lambda settings, model_name: EchoBackend(model_name))
+
+    assert "test-echo" in available_backends()
+    assert create_backend(Settings(model_backend="test-echo"), "m").model_name == "m"
@@ -0,0 +1,46 @@
+import random
+
+import httpx
+
+from aether_sidecar.retry import RetryBudget, RetryPolicy
+
+
+def _status_error(status_code: int, text: str = "error") -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://example.com")
+    response = httpx.Response(status_code, request=request, text=text)
+    return httpx.HTTPStatusError("status error", request=request, response=response)
+
+
+def test_retry_policy_classifies_transient_and_fatal_statuses():
+    policy = RetryPolicy()
+
+    assert policy.is_retryable(_status_error(503))
+    assert policy.is_retryable(_status_error(500))
+    assert not policy.is_retryable(_status_error(404))
+    assert not policy.is_retryable(_status_error(400))
+    assert policy.is_retryable(_status_error(400, '{"error":"model is loading"}'))
+
+
+def test_retry_backoff_uses_full_jitter_capped_exponential_delays():
+    policy = RetryPolicy(base_delay_seconds=0.1, max_delay_seconds=0.3)
+    rng = random.Random(7)
+
+    delays = [[policy.backoff_seconds(retry, rng) for _ in range(200)] for retry in (1, 2, 3, 6)]
+
+    assert all(0.0 <= delay <= 0.1 for delay in delays[0])
+    assert all(0.0 <= delay <= 0.2 for delay in delays[1])
+    assert all(0.0 <= delay <= 0.3 for delay in delays[2] + delays[3])
+    assert max(delays[3]) > 0.2
+
+
+def test_retry_budget_caps_retries_to_a_share_of_requests():
+    budget = RetryBudget(ratio=0.5, capacity=2)
+
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    budget.record_request()
+    assert not budget.try_spend()
+    budget.record_request()
+    assert budget.try_spend()
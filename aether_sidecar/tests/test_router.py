@@ -1,5 +1,12 @@
 from aether_sidecar.models import Subsystem
-from aether_sidecar.router import detect_subsystem_alerts, is_minecraft_related, subsystem_teaching_context
+from aether_sidecar.router import (
+    KeywordMatcher,
+    analyze_message,
+    build_matcher,
+    detect_subsystem_alerts,
+    is_minecraft_related,
+    subsystem_teaching_context,
+)
 
 
 def test_subsystem_teaching_context_includes_purpose_and_keywords():
@@ -24,3 +31,40 @@ def test_is_minecraft_related_true_for_minecraft_context():
 
 def test_is_minecraft_related_false_for_smalltalk():
     assert not is_minecraft_related("How are you doing today?")
+
+
+def test_analyze_message_returns_alerts_pick_and_relevance_in_one_pass():
+    analysis = analyze_message("Combat with the enemy near the RIFT: is my weapon ready?")
+
+    assert analysis.alerts == {Subsystem.ECLIPSE: ["rift"], Subsystem.ENFORCER: ["combat", "enemy", "weapon"]}
+    assert analysis.subsystem == Subsystem.ENFORCER
+    assert analysis.minecraft_related
+
+
+def test_keywords_match_at_word_starts_including_overlapping_prefixes():
+    alerts = detect_subsystem_alerts("Healthy bitmap readings")
+
+    assert alerts == {Subsystem.AEGIS: ["health", "heal"]}
+
+
+def test_keyword_matcher_handles_multi_word_keywords_and_empty_vocabulary():
+    matcher = KeywordMatcher({Subsystem.ECLIPSE: ["nether portal", "portal"]}, ["nether"])
+
+    analysis = matcher.analyze("A nether portal flickered")
+
+    assert analysis.alerts == {Subsystem.ECLIPSE: ["nether portal", "portal"]}
+    assert not KeywordMatcher({}).analyze("anything").minecraft_related
+
+
+def test_build_matcher_extends_builtin_lexicon_from_vocabulary_file(tmp_path):
+    vocabulary = tmp_path / "routing.txt"
+    vocabulary.write_text(
+        "# extra routing terms\nTerra: cave, ravine\nminecraft: villager\nunknown: ignored\n\n",
+        encoding="utf-8",
+    )
+
+    matcher = build_matcher(vocabulary)
+
+    assert matcher.analyze("Scouting a ravine near the biome edge").alerts == {Subsystem.TERRA: ["biome", "ravine"]}
+    assert matcher.analyze("Trading with a villager").minecraft_related
+    assert not matcher.analyze("ignored").minecraft_related
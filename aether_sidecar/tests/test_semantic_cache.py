@@ -0,0 +1,86 @@
+import zlib
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from aether_sidecar.models import Subsystem
+from aether_sidecar.semantic_cache import SemanticCache, _SemanticTier
+
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embedding so paraphrases share dimensions."""
+
+    def __init__(self, dimensions: int = 64):
+        self.dimensions = dimensions
+
+    def __call__(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode("utf-8")) % self.dimensions] += 1.0
+        return vector
+
+
+embed = FakeEmbedder()
+
+
+def test_semantic_cache_serves_close_paraphrase_and_rejects_unrelated_question():
+    cache = SemanticCache(threshold=0.7)
+    cache.store(Subsystem.ENFORCER, "m", "", embed("mobs keep attacking my base at night"), "build walls", "m")
+
+    hit = cache.lookup(Subsystem.ENFORCER, "m", "", embed("mobs keep attacking my shelter at night"))
+    miss = cache.lookup(Subsystem.ENFORCER, "m", "", embed("where is the nearest village"))
+
+    assert hit is not None
+    assert hit.text == "build walls"
+    assert hit.score >= 0.7
+    assert miss is None
+
+
+def test_semantic_cache_tiers_are_isolated_by_subsystem_model_and_scope():
+    cache = SemanticCache(threshold=0.9)
+    cache.store(Subsystem.AEGIS, "m", "biome=taiga", embed("is it safe"), "yes", "m")
+
+    assert cache.lookup(Subsystem.AEGIS, "m", "biome=taiga", embed("is it safe")) is not None
+    assert cache.lookup(Subsystem.TERRA, "m", "biome=taiga", embed("is it safe")) is None
+    assert cache.lookup(Subsystem.AEGIS, "other", "biome=taiga", embed("is it safe")) is None
+    assert cache.lookup(Subsystem.AEGIS, "m", "biome=desert", embed("is it safe")) is None
+
+
+def test_semantic_cache_evicts_least_recently_used_entry_at_capacity():
+    cache = SemanticCache(threshold=0.99, capacity_per_tier=2)
+    cache.store(Subsystem.AEGIS, "m", "", embed("alpha question"), "a", "m")
+    cache.store(Subsystem.AEGIS, "m", "", embed("beta question"), "b", "m")
+    assert cache.lookup(Subsystem.AEGIS, "m", "", embed("alpha question")).text == "a"
+
+    cache.store(Subsystem.AEGIS, "m", "", embed("gamma question"), "c", "m")
+
+    assert len(cache) == 2
+    assert cache.lookup(Subsystem.AEGIS, "m", "", embed("beta question")) is None
+    assert cache.lookup(Subsystem.AEGIS, "m", "", embed("alpha question")).text == "a"
+    assert cache.lookup(Subsystem.AEGIS, "m", "", embed("gamma question")).text == "c"
+
+
+def test_semantic_cache_bounds_total_entries_across_many_scopes():
+    cache = SemanticCache(threshold=0.99, capacity_per_tier=512, max_entries=100)
+
+    for index in range(1000):
+        cache.store(Subsystem.AEGIS, "m", f"player={index}", embed(f"question {index}"), str(index), "m")
+
+    assert len(cache) == 100
+    assert cache.tier_count == 100
+    assert all(tier.matrix.shape[0] == _SemanticTier.INITIAL_ROWS for tier in cache._tiers.values())
+    assert cache.lookup(Subsystem.AEGIS, "m", "player=0", embed("question 0")) is None
+    assert cache.lookup(Subsystem.AEGIS, "m", "player=999", embed("question 999")).text == "999"
+
+
+def test_semantic_cache_tier_grows_to_capacity_as_entries_arrive():
+    cache = SemanticCache(threshold=0.99, capacity_per_tier=40)
+
+    for index in range(50):
+        cache.store(Subsystem.AEGIS, "m", "", embed(f"question number {index}"), str(index), "m")
+
+    tier = cache._tiers[(Subsystem.AEGIS, "m", "")]
+    assert len(cache) == 40
+    assert tier.matrix.shape[0] == 40
+    assert cache.lookup(Subsystem.AEGIS, "m", "", embed("question number 49")).text == "49"
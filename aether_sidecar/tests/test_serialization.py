@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from aether_sidecar import serialization
+from aether_sidecar.models import Subsystem
+from aether_sidecar.serialization import FastJSONResponse, FastJSONRoute, dumps, loads, use_json_library
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def json_library(request):
+    if request.param == "orjson" and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    previous = "orjson" if serialization._use_orjson else "stdlib"
+    use_json_library(request.param)
+    yield request.param
+    use_json_library(previous)
+
+
+def test_dumps_is_compact_utf8_and_round_trips(json_library):
+    payload = {"b": Subsystem.ECLIPSE, "a": "rift ✦", "n": [1, 2.5, None, True]}
+
+    encoded = dumps(payload, sort_keys=True)
+
+    assert encoded == '{"a":"rift ✦","b":"Eclipse","n":[1,2.5,null,true]}'.encode("utf-8")
+    assert loads(encoded) == {"a": "rift ✦", "b": "Eclipse", "n": [1, 2.5, None, True]}
+
+
+def test_loads_raises_value_error_on_malformed_input(json_library):
+    with pytest.raises(ValueError):
+        loads(b"{not json")
+
+
+def test_use_json_library_rejects_unknown_names():
+    with pytest.raises(RuntimeError):
+        use_json_library("simdjson")
+
+
+def test_use_json_library_requires_orjson_when_forced(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    monkeypatch.setattr(serialization, "_use_orjson", False)
+
+    assert use_json_library("auto") == "stdlib"
+    with pytest.raises(RuntimeError, match="fast-json"):
+        use_json_library("orjson")
+
+
+def test_fast_json_route_parses_bodies_and_rejects_malformed_json(json_library):
+    class Echo(BaseModel):
+        message: str
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.router.route_class = FastJSONRoute
+
+    @app.post("/echo")
+    async def echo(payload: Echo) -> FastJSONResponse:
+        return FastJSONResponse({"message": payload.message, "subsystem": Subsystem.AEGIS})
+
+    client = TestClient(app)
+
+    assert client.post("/echo", json={"message": "hi"}).json() == {"message": "hi", "subsystem": "Aegis"}
+    assert client.post("/echo", content=b"{bad", headers={"Content-Type": "application/json"}).status_code == 422
+    assert json.loads(client.post("/echo", json={"message": "✦"}).content) == {"message": "✦", "subsystem": "Aegis"}
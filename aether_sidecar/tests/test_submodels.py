@@ -1,7 +1,12 @@
 from aether_sidecar.config import (
+    parse_cache_context_fields,
+    parse_model_cascade,
     parse_model_auto_candidates,
     parse_ollama_fallback_urls,
+    parse_subsystem_cascades,
     parse_subsystem_models,
+    parse_subsystem_ttls,
+    parse_url_weights,
     resolve_model_name,
 )
 from aether_sidecar.models import Subsystem
@@ -67,3 +72,28 @@ def test_resolve_model_name_returns_default_when_auto_disabled():
     settings.model_auto_select = False
 
     assert resolve_model_name(settings, memory_gb=64.0) == "llama3.1:8b"
+
+
+def test_parse_subsystem_ttls_skips_invalid_entries():
+    parsed = parse_subsystem_ttls("Aegis:60, requiem:3600, Terra:soon, Auto:5, invalid")
+
+    assert parsed == {Subsystem.AEGIS: 60.0, Subsystem.REQUIEM: 3600.0}
+
+
+def test_parse_cache_context_fields_groups_by_scope():
+    parsed = parse_cache_context_fields("world.biome, player.health, world.weather, other.x, world.biome, nodot")
+
+    assert parsed == {"player": ["health"], "world": ["biome", "weather"]}
+
+
+def test_parse_url_weights_splits_on_last_equals_sign():
+    parsed = parse_url_weights("http://a:11434/api/generate=3, http://b:11434/api/generate=0.5, bad, http://c=x")
+
+    assert parsed == {"http://a:11434/api/generate": 3.0, "http://b:11434/api/generate": 0.5}
+
+
+def test_parse_subsystem_cascades_keeps_model_tags_and_order():
+    parsed = parse_subsystem_cascades("Aegis:llama3.2:3b|llama3.1:8b, requiem:qwen2.5:14b, Auto:x, Terra:")
+
+    assert parsed == {Subsystem.AEGIS: ["llama3.2:3b", "llama3.1:8b"], Subsystem.REQUIEM: ["qwen2.5:14b"]}
+    assert parse_model_cascade(" a | b |a") == ["a", "b"]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Train the sidecar's Subsystem.AUTO routing classifier from A.E.T.H.E.R JSONL datasets."""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+for path in (PROJECT_ROOT, PROJECT_ROOT / "aether_sidecar"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from aether_sidecar.classifier import DEFAULT_DIMENSIONS, SubsystemClassifier
+from aether_sidecar.models import Subsystem
+from aether_sidecar.router import pick_subsystem
+from training_pipeline.src.data_utils import load_jsonl, validate_rows
+
+
+def labelled_examples(rows: list[dict]) -> list[tuple[str, Subsystem]]:
+    by_name = {subsystem.value.lower(): subsystem for subsystem in Subsystem if subsystem != Subsystem.AUTO}
+    examples = []
+    for row in rows:
+        subsystem = by_name.get(str(row["subsystem"]).strip().lower())
+        prompt = str(row["prompt"]).strip()
+        if subsystem and prompt:
+            examples.append((prompt, subsystem))
+    return examples
+
+
+def accuracy(predictions: list[Subsystem], examples: list[tuple[str, Subsystem]]) -> float:
+    return sum(predicted == label for predicted, (_, label) in zip(predictions, examples)) / len(examples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the A.E.T.H.E.R subsystem routing classifier")
+    parser.add_argument("datasets", nargs="+", help="Paths to JSONL datasets with subsystem and prompt fields")
+    parser.add_argument("--output", default="training_pipeline/artifacts/router_classifier.npz")
+    parser.add_argument("--dimensions", type=int, default=DEFAULT_DIMENSIONS, help="hashed feature space size")
+    parser.add_argument("--alpha", type=float, default=1.0, help="additive smoothing")
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction held out to report accuracy")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    rows = []
+    for dataset in args.datasets:
+        dataset_rows = load_jsonl(dataset)
+        validate_rows(dataset_rows)
+        rows.extend(dataset_rows)
+
+    examples = labelled_examples(rows)
+    if not examples:
+        raise SystemExit("No rows with a known subsystem and a prompt")
+
+    random.Random(args.seed).shuffle(examples)
+    held_out = int(len(examples) * args.holdout)
+    if held_out:
+        train, test = examples[held_out:], examples[:held_out]
+        classifier = SubsystemClassifier.train(
+            [text for text, _ in train], [label for _, label in train], args.dimensions, args.alpha
+        )
+        classifier_accuracy = accuracy([subsystem for subsystem, _ in classifier.predict([text for text, _ in test])], test)
+        keyword_accuracy = accuracy([pick_subsystem(text) for text, _ in test], test)
+        print(f"Holdout accuracy on {len(test)} rows: classifier {classifier_accuracy:.3f}, keyword router {keyword_accuracy:.3f}")
+
+    classifier = SubsystemClassifier.train(
+        [text for text, _ in examples], [label for _, label in examples], args.dimensions, args.alpha
+    )
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    classifier.save(output)
+    print(f"Saved classifier trained on {len(examples)} rows to {output}")
+
+
+if __name__ == "__main__":
+    main()